@@ -16,19 +16,185 @@ import urllib.request
 import urllib.error
 import re
 import json
+import io
+import queue
+import contextlib
+import errno
+import itertools
+import functools
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
+import traceback
 from pathlib import Path
 import time
 import signal
+import select
 import shlex
+
+# Optional: httpx lets downloads share one keep-alive (HTTP/2 when h2 is installed)
+# connection; urllib is used when it is not available
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': '*/*',
+}
+
+# Manual .NET SDK install command per distro (package version appended) and an optional caveat
+_APT_DOTNET_HINT = ("sudo apt install dotnet-sdk-", "May require Microsoft's .NET repository")
+DOTNET_INSTALL_HINTS = {
+    "arch": ("sudo pacman -S dotnet-sdk-", None),
+    "cachyos": ("sudo pacman -S dotnet-sdk-", None),
+    "endeavouros": ("sudo pacman -S dotnet-sdk-", None),
+    "xerolinux": ("sudo pacman -S dotnet-sdk-", None),
+    "fedora": ("sudo dnf install dotnet-sdk-", None),
+    "nobara": ("sudo dnf install dotnet-sdk-", None),
+    "pikaos": _APT_DOTNET_HINT,
+    "pop": _APT_DOTNET_HINT,
+    "debian": _APT_DOTNET_HINT,
+    "ubuntu": _APT_DOTNET_HINT,
+    "linuxmint": _APT_DOTNET_HINT,
+    "zorin": _APT_DOTNET_HINT,
+    "opensuse-tumbleweed": ("sudo zypper install dotnet-sdk-", None),
+    "opensuse-leap": ("sudo zypper install dotnet-sdk-", None),
+}
+
+# The host OS cannot change while we run; resolve it once at import
+IS_LINUX = platform.system() == "Linux"
+
+# Horizontal rule framing section headers in the log, plus the variants with the blank line outside
+LOG_RULE = "━" * 76
+LOG_RULE_OPEN = "\n" + LOG_RULE
+LOG_RULE_CLOSE = LOG_RULE + "\n"
+
+# Overrides that keep package managers and other tools non-interactive under run_command
+NONINTERACTIVE_ENV = {
+    'DEBIAN_FRONTEND': 'noninteractive',
+    'NEEDRESTART_MODE': 'a',  # Auto-restart services without asking
+    'DEBIAN_PRIORITY': 'critical',
+    'APT_LISTCHANGES_FRONTEND': 'none',
+    'LANG': 'C',  # Use C locale to avoid encoding issues
+    'LC_ALL': 'C',
+}
+
+# Affinity v3 executable, relative to drive_c and as Wine sees it
+AFFINITY_V3_EXE_PARTS = ("Program Files", "Affinity", "Affinity", "Affinity.exe")
+AFFINITY_V3_WINE_PATH = "C:/Program Files/Affinity/Affinity/Affinity.exe"
+# Launch arguments after the wine binary, pre-encoded for posix_spawn
+AFFINITY_V3_START_ARGS_B = (b"start", AFFINITY_V3_WINE_PATH.encode())
+
+# Environment applied when launching Affinity v3: always, then per renderer
+AFFINITY_LAUNCH_ENV = {
+    "WINEDEBUG": "-all,fixme-all",
+    "WINEDLLOVERRIDES": "opencl=",
+}
+AFFINITY_VULKAN_ENV = {
+    "DXVK_ASYNC": "0",
+    "DXVK_CONFIG": "d3d9.deferSurfaceCreation = True; d3d9.shaderModel = 1",
+    "DXVK_FRAME_RATE": "60",
+    "DXVK_LOG_LEVEL": "none",
+    "VKD3D_DEBUG": "none",
+    "VKD3D_DISABLE_EXTENSIONS": "VK_KHR_present_id",
+    "VKD3D_FEATURE_LEVEL": "12_1",
+    "VKD3D_FRAME_RATE": "60",
+    "VKD3D_SHADER_DEBUG": "none",
+    "VKD3D_SHADER_MODEL": "6_5",
+}
+AFFINITY_NON_VULKAN_ENV = {
+    "DXVK_STATE_CACHE": "0",
+    "DXVK_HUD": "0",
+}
+# Pre-encoded copies for the launcher's bytes environment (Popen then skips re-encoding)
+AFFINITY_LAUNCH_ENVB = {k.encode(): v.encode() for k, v in AFFINITY_LAUNCH_ENV.items()}
+AFFINITY_VULKAN_ENVB = {k.encode(): v.encode() for k, v in AFFINITY_VULKAN_ENV.items()}
+AFFINITY_NON_VULKAN_ENVB = {k.encode(): v.encode() for k, v in AFFINITY_NON_VULKAN_ENV.items()}
+
+# Read size for streamed downloads, and the minimum gap between progress bar updates (~30 Hz)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+PROGRESS_EMIT_INTERVAL = 1 / 30
+
+# Seconds a pinned wineserver outlives its last client (bridges the gaps between back-to-back
+# wine calls, yet lets `wineserver -w` return shortly after an installer exits)
+WINESERVER_PIN_SECONDS = 5
+
+# Seconds closeEvent waits for cancelled background tasks to finish (and log) before the last flush
+CLOSE_WORKER_GRACE = 3.0
+
+# Edge Update services off + msedgewebview2.exe forced to win7, imported with one regedit run
+WEBVIEW2_CONFIG_REG = (
+    "Windows Registry Editor Version 5.00\n\n"
+    "[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdate]\n"
+    "\"Start\"=dword:00000004\n\n"
+    "[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdatem]\n"
+    "\"Start\"=dword:00000004\n\n"
+    "[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults]\n\n"
+    "[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults\\msedgewebview2.exe]\n"
+    "\"Version\"=\"win7\"\n"
+)
+
+# ioctl request number for a btrfs/XFS reflink (FICLONE from linux/fs.h)
+FICLONE = 0x40049409
+
+# d3d12/d3d12core native overrides for vkd3d-proton (used by OpenCL support)
+D3D12_OVERRIDES = {"d3d12": "native", "d3d12core": "native"}
+D3D12_OVERRIDES_REG = (
+    "REGEDIT4\n"
+    "[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n"
+    + "".join(f'"{dll}"="{mode}"\n' for dll, mode in D3D12_OVERRIDES.items())
+)
+
+# Wine-generated desktop entries (wine/Programs) to drop after updating an app,
+# keyed by the token found in its display name (checked in this order)
+DESKTOP_ENTRY_MAP = {
+    "Suite": ["Affinity.desktop"],
+    "Photo": ["Affinity Photo 2.desktop", "Affinity Photo.desktop"],
+    "Designer": ["Affinity Designer 2.desktop", "Affinity Designer.desktop"],
+    "Publisher": ["Affinity Publisher 2.desktop", "Affinity Publisher.desktop"],
+}
+
+# Profile directories under drive_c/users that are not real Windows users
+WINE_BUILTIN_USERS = frozenset({"Public", "Default", "All Users", "Default User"})
+
+# Hex value of a REG_DWORD in `wine reg query` output
+HEX_DWORD_RE = re.compile(r'0x([0-9a-fA-F]+)')
+# Decimal value some Wine versions print after it, e.g. "0x000000c0 (192)"
+DEC_DWORD_RE = re.compile(r'\((\d+)\)')
+
+# Returned by _read_reg_dword(busy=REG_HIVE_BUSY) when a running wineserver makes the hive file untrustworthy
+REG_HIVE_BUSY = object()
+
+# Runs of spaces, brackets and dashes in installer file names (collapsed to one "-")
+FILENAME_SEPARATOR_RE = re.compile(r'[ ()\[\]-]+')
+
+# Version in `wine --version` output, e.g. "wine-10.10"
+WINE_VERSION_RE = re.compile(r'wine-(\d+\.\d+)')
+# Progress percentage in streamed tool output
+PERCENT_RE = re.compile(r'(\d+)\s*%', re.IGNORECASE)
+# Percentage in an aria2c progress readout, e.g. "[#2089b0 12MiB/100MiB(12%) CN:8 DL:5.0MiB]"
+ARIA2_PROGRESS_RE = re.compile(r'\[#\w+ [^\]]*?\((\d+)%\)')
+# Executable in a desktop entry's Exec line: quoted after wine, unquoted after wine, or any .exe
+DESKTOP_EXEC_QUOTED_RE = re.compile(r'wine\s+"([^"]+)"')
+DESKTOP_EXEC_WINE_EXE_RE = re.compile(r'wine\s+([^\s]+\.exe[^\s]*)')
+DESKTOP_EXEC_ANY_EXE_RE = re.compile(r'([^\s]+\.exe[^\s]*)')
+# Major/minor version in a dotnet-sdk package name, e.g. "dotnet-sdk-8.0"
+DOTNET_SDK_VERSION_RE = re.compile(r'dotnet-sdk-(\d+)\.(\d+)')
+
+@functools.lru_cache(maxsize=1)
 def detect_distro_for_install():
-    """Detect distribution for package installation"""
+    """Detect distribution for package installation (os-release is read once per run)"""
     try:
         with open("/etc/os-release", "r") as f:
             content = f.read()
-        for line in content.split("\n"):
-            if line.startswith("ID="):
-                distro = line.split("=", 1)[1].strip().strip('"').lower()
+        for line in content.splitlines():
+            key, _, value = line.partition("=")
+            if key == "ID":
+                distro = value.strip().strip('"').lower()
                 if distro == "pika":
                     distro = "pikaos"
                 return distro
@@ -36,43 +202,60 @@ def detect_distro_for_install():
         pass
     return None
 
-def install_package(package_name, import_name=None):
-    """Install a Python package if not available"""
-    if import_name is None:
-        import_name = package_name
-    
+def _module_importable(import_name):
+    """Return True if import_name can be found, without importing (and initializing) it"""
     try:
-        __import__(import_name)
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def install_packages(packages):
+    """Install the missing Python packages among (package_name, import_name) pairs with one pip run.
+    
+    Returns True if every package is importable afterwards.
+    """
+    missing = [(package_name, import_name or package_name) for package_name, import_name in packages
+               if not _module_importable(import_name or package_name)]
+    if not missing:
         return True
-    except ImportError:
-        print(f"Installing {package_name}...")
-        
-        distro = detect_distro_for_install()
-        pip_flags = ["--user"]
-        if distro in ["arch", "cachyos", "manjaro", "endeavouros", "xerolinux"]:
-            pip_flags.append("--break-system-packages")
-        if not sys.stdout.isatty():
-            pip_flags.insert(0, "--quiet")
-        
-        try:
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install", package_name] + pip_flags,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            try:
-                __import__(import_name)
-                print(f"✓ {package_name} installed successfully")
-                return True
-            except ImportError:
-                print(f"✗ Failed to import {package_name} after installation")
-                return False
-        except subprocess.CalledProcessError:
-            print(f"✗ Failed to install {package_name} via pip")
-            return False
-        except Exception as e:
-            print(f"✗ Error installing {package_name}: {e}")
-            return False
+    
+    names = [package_name for package_name, _ in missing]
+    print(f"Installing {', '.join(names)}...")
+    
+    distro = detect_distro_for_install()
+    pip_flags = ["--user"]
+    if distro in ["arch", "cachyos", "manjaro", "endeavouros", "xerolinux"]:
+        pip_flags.append("--break-system-packages")
+    if not sys.stdout.isatty():
+        pip_flags.insert(0, "--quiet")
+    
+    try:
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "install", *names] + pip_flags,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    except subprocess.CalledProcessError:
+        print(f"✗ Failed to install {', '.join(names)} via pip")
+        return False
+    except Exception as e:
+        print(f"✗ Error installing {', '.join(names)}: {e}")
+        return False
+    
+    # Let the import system see the directories pip just populated
+    importlib.invalidate_caches()
+    success = True
+    for package_name, import_name in missing:
+        if _module_importable(import_name):
+            print(f"✓ {package_name} installed successfully")
+        else:
+            print(f"✗ Failed to import {package_name} after installation")
+            success = False
+    return success
+
+def install_package(package_name, import_name=None):
+    """Install a Python package if not available"""
+    return install_packages([(package_name, import_name)])
 
 PYQT6_AVAILABLE = False
 try:
@@ -83,19 +266,8 @@ try:
         QButtonGroup, QRadioButton, QInputDialog, QSlider, QLineEdit, QSizePolicy
     )
     from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
-    from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QPixmap, QShortcut, QKeySequence, QWheelEvent, QPainter, QPen
-
-    # Try to import SVG widget (may not be available on all distributions)
-    try:
-        from PyQt6.QtSvgWidgets import QSvgWidget
-        SVG_WIDGET_AVAILABLE = True
-    except ImportError:
-        print("⚠️  QSvgWidget not available - some icons may not display correctly")
-        SVG_WIDGET_AVAILABLE = False
-        # Create a dummy QSvgWidget class to prevent import errors
-        class QSvgWidget(QWidget):
-            def load(self, content): pass
-            def setFixedSize(self, size): super().setFixedSize(size)
+    from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QPixmap, QShortcut, QKeySequence, QPainter, QPen
+    # QtSvgWidgets is imported where the top bar icon is built (it may not be installed)
 
     PYQT6_AVAILABLE = True
 except ImportError:
@@ -109,19 +281,7 @@ except ImportError:
                 QButtonGroup, QRadioButton, QInputDialog, QSlider, QLineEdit, QSizePolicy
             )
             from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
-            from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QPixmap, QShortcut, QKeySequence, QWheelEvent, QPainter, QPen
-
-            # Try to import SVG widget after installation
-            try:
-                from PyQt6.QtSvgWidgets import QSvgWidget
-                SVG_WIDGET_AVAILABLE = True
-            except ImportError:
-                print("⚠️  QSvgWidget not available after installation - some icons may not display correctly")
-                SVG_WIDGET_AVAILABLE = False
-                # Create a dummy QSvgWidget class to prevent import errors
-                class QSvgWidget(QWidget):
-                    def load(self, content): pass
-                    def setFixedSize(self, size): super().setFixedSize(size)
+            from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QPixmap, QShortcut, QKeySequence, QPainter, QPen
 
             PYQT6_AVAILABLE = True
             print("✓ PyQt6 installed and imported successfully")
@@ -211,8 +371,55 @@ class ProgressSpinner(QWidget):
         painter.drawArc(rect, start_angle, span_angle)
         painter.end()
 
+
+class QueueReader(io.RawIOBase):
+    """Read-only file object fed with byte chunks from a queue (None marks EOF)"""
+    def __init__(self, chunk_queue):
+        super().__init__()
+        self._queue = chunk_queue
+        self._chunk = memoryview(b"")
+        self._pos = 0
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._pos >= len(self._chunk):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, BaseException):
+                raise item
+            self._chunk = memoryview(item)
+            self._pos = 0
+        size = min(len(buffer), len(self._chunk) - self._pos)
+        buffer[:size] = self._chunk[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+
+def gui_guarded(title, action):
+    """Decorate an AffinityInstallerGUI method so an unexpected exception is logged and shown.
+
+    The error reads "Failed to <action>: <error>" in both the log and a message box titled `title`.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                self.log(f"✗ Failed to {action}: {e}", "error")
+                self.show_message(title, f"Failed to {action}:\n\n{e}", "error")
+        return wrapper
+    return decorator
+
 class AffinityInstallerGUI(QMainWindow):
-    log_signal = pyqtSignal(str, str)
+    log_signal = pyqtSignal()
     progress_signal = pyqtSignal(float)
     progress_text_signal = pyqtSignal(str)
     show_message_signal = pyqtSignal(str, str, str)
@@ -255,6 +462,7 @@ class AffinityInstallerGUI(QMainWindow):
         self.distro = None
         self.distro_version = None
         self.directory = str(Path.home() / ".AffinityLinux")
+        self._refresh_prefix_paths()
         self.setup_complete = False
         self.installer_file = None
         self.update_buttons = {}
@@ -277,6 +485,34 @@ class AffinityInstallerGUI(QMainWindow):
         self.cancel_event = threading.Event()
         self._process_lock = threading.Lock()
         self._active_processes = set()
+        self._http_client = None
+        self._http_client_lock = threading.Lock()
+        self._webview2_cache = None
+        self._wine_verified = False  # Wine binary seen by a previous launch; reset when Wine is removed
+        self._devnull_fd = os.open(os.devnull, os.O_RDWR)  # Shared stdio for detached launches (not inheritable)
+        self._cmd_cache = {}
+        self._path_index = None  # (PATH value, {command name: first path on PATH}) built on first lookup
+        self._winetricks_log_cache = None  # (mtime, verbs) of <prefix>/winetricks.log
+        self._dotnet_probe = None  # Memoized check_dotnet_sdk() hit
+        self._dotnet_path = None  # Absolute dotnet binary found by the probe
+        self._patcher_build = None  # (source mtimes, built patcher path) from build_affinity_patcher
+        # Shared worker pool for parallel file I/O and background steps (threads start lazily)
+        self._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="affinity-io")
+        # Single long-lived worker for install/update operations (only one runs at a time anyway).
+        # Submit a no-op so the thread is already spawned and parked when the first operation starts.
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="affinity-op")
+        self._worker.submit(lambda: None)
+        self._open_dlg = None  # Reused installer picker, created on first use
+        self._cached_dpi = None  # LogPixels last read or written by set_dpi_scaling
+        self._desktop_dirty = False  # A .desktop entry was written during the current operation
+        self._icon_index = None  # {file name: path} of ~/.local/share/icons, built on first use
+        # Log lines waiting for the GUI thread; one queued flush drains them all
+        self._log_lock = threading.Lock()
+        self._log_queue = []
+        self._log_flush_pending = False
+        # Per-thread: while .lines is a list, that thread's log lines go there and its progress
+        # updates are dropped (see _run_deferred)
+        self._deferred_output = threading.local()
         self._button_spinner_map = {}
         self._last_clicked_button = None
         self._operation_button = None
@@ -286,7 +522,8 @@ class AffinityInstallerGUI(QMainWindow):
         self._init_log_file()
         step_start = log_timing("Log file init", step_start)
         
-        self.log_signal.connect(self._log_safe)
+        # Queued even for GUI-thread callers, so a burst of log() calls is rendered in one go
+        self.log_signal.connect(self._flush_logs, Qt.ConnectionType.QueuedConnection)
         self.progress_signal.connect(self._update_progress_safe)
         self.progress_text_signal.connect(self._update_progress_text_safe)
         self.show_message_signal.connect(self._show_message_safe)
@@ -309,32 +546,32 @@ class AffinityInstallerGUI(QMainWindow):
         self.center_window()
         step_start = log_timing("Center window", step_start)
         
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE)
         self.log("Affinity Linux Installer - Ready", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         step_start = log_timing("Defer slow operations", step_start)
         
         total_time = time.time() - startup_start
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+        self.log(LOG_RULE, "info")
         self.log("Startup Performance:", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+        self.log(LOG_RULE, "info")
         for step_name, elapsed in timing_log:
             percentage = (elapsed / total_time * 100) if total_time > 0 else 0
             self.log(f"  {step_name:.<30} {elapsed:>6.3f}s ({percentage:>5.1f}%)", "info")
         self.log(f"  {'TOTAL STARTUP TIME':.<30} {total_time:>6.3f}s", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+        self.log(LOG_RULE, "info")
         
         self.log("Welcome! Please use the buttons on the right to get started.", "info")
         
         system_specs = self._get_system_specs()
         if system_specs:
             self.log("", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+            self.log(LOG_RULE, "info")
             self.log("System Specifications:", "info")
             for spec in system_specs:
                 self.log(f"  {spec}", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+            self.log(LOG_RULE, "info")
             
             if self.log_file:
                 try:
@@ -404,12 +641,12 @@ class AffinityInstallerGUI(QMainWindow):
                     try:
                         success, stdout, _ = self.run_command([str(wine_bin), "--version"], check=False, capture=True)
                         if success and stdout:
-                            version_match = re.search(r'wine-(\d+\.\d+)', stdout)
+                            version_match = WINE_VERSION_RE.search(stdout)
                             if version_match:
                                 wine_version_display = f"Wine {version_match.group(1)}"
                                 break  # Found a working wine binary, no need to check further
                             else:
-                                wine_dir = Path(self.directory) / "ElementalWarriorWine"
+                                wine_dir = self.get_wine_dir()
                                 if (wine_dir / "bin" / "wine").exists():
                                     wine_version_display = "Wine (patched)"
                                     break
@@ -451,10 +688,57 @@ class AffinityInstallerGUI(QMainWindow):
             "Publisher": ("Publisher 2", "Publisher.exe")
         }
         
+        # The slow probes (dotnet, and the wine reg queries below) are independent of each
+        # other: start them all on the pool now, then log their results in the usual order
+        dotnet_future = self._pool.submit(self.check_dotnet_sdk)
+        if wine_exists:
+            # Each probe gets its own env dict: they run concurrently and the
+            # subprocess helpers must never share one mutable mapping
+            wine = self.get_wine_path("wine")
+            
+            winetricks_components = [
+                ("dotnet35sp1", ".NET Framework 3.5 SP1"),
+                ("dotnet48", ".NET Framework 4.8"),
+                ("corefonts", "Windows Core Fonts"),
+                ("vcrun2022", "Visual C++ Redistributables 2022"),
+                ("msxml3", "MSXML 3.0"),
+                ("msxml6", "MSXML 6.0"),
+                ("crypt32", "Cryptographic API 32"),
+            ]
+            component_futures = [
+                (description, self._pool.submit(self._check_winetricks_component, component, wine, self._wine_env()))
+                for component, description in winetricks_components
+            ]
+            
+            def vulkan_renderer_status():
+                """Return True (vulkan), False (other renderer) or None (no Direct3D key)"""
+                # One query lists every value under the key, renderer included
+                success, stdout, _ = self.run_command(
+                    [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D"],
+                    check=False,
+                    env=self._wine_env(),
+                    capture=True
+                )
+                if not success:
+                    return None
+                for line in stdout.lower().splitlines():
+                    fields = line.split()
+                    if fields and fields[0] == "renderer":
+                        return fields[-1] == "vulkan"
+                return False
+            
+            renderer_future = self._pool.submit(vulkan_renderer_status)
+            webview2_future = self._pool.submit(self.check_webview2_installed)
+        
         self.log("Affinity Applications:", "info")
+        # One directory read tells which app folders exist; only those get an exe stat
+        try:
+            with os.scandir(self._affinity_root) as entries:
+                present_dirs = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
+            present_dirs = set()
         for app_name, (dir_name, exe_name) in app_dirs.items():
-            app_path = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / dir_name / exe_name
-            is_installed = app_path.exists()
+            is_installed = dir_name in present_dirs and os.path.isfile(self._affinity_root / dir_name / exe_name)
             app_status[app_name] = is_installed
             
             display_name = app_names_display.get(app_name, app_name)
@@ -491,65 +775,32 @@ class AffinityInstallerGUI(QMainWindow):
         else:
             self.log(f"  xz: ✗ Not installed (optional - Python lzma will be used)", "warning")
         
-        if self.check_dotnet_sdk():
+        if dotnet_future.result():
             self.log(f"  .NET SDK: ✓ Installed", "success")
         else:
             self.log(f"  .NET SDK: ✗ Not installed", "error")
         
         if wine_exists:
             self.log("Winetricks Dependencies:", "info")
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
-            wine = self.get_wine_path("wine")
-            
-            winetricks_components = [
-                ("dotnet35sp1", ".NET Framework 3.5 SP1"),
-                ("dotnet48", ".NET Framework 4.8"),
-                ("corefonts", "Windows Core Fonts"),
-                ("vcrun2022", "Visual C++ Redistributables 2022"),
-                ("msxml3", "MSXML 3.0"),
-                ("msxml6", "MSXML 6.0"),
-                ("crypt32", "Cryptographic API 32"),
-            ]
-            
-            for component, description in winetricks_components:
-                if self._check_winetricks_component(component, wine, env):
+            for description, future in component_futures:
+                if future.result():
                     self.log(f"  {description}: ✓ Installed", "success")
                 else:
                     self.log(f"  {description}: ✗ Not installed", "error")
             
             try:
-                success, stdout, _ = self.run_command(
-                    [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D"],
-                    check=False,
-                    env=env,
-                    capture=True
-                )
-                if success:
-                    vulkan_set = False
-                    try:
-                        renderer_success, renderer_stdout, _ = self.run_command(
-                            [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
-                            check=False,
-                            env=env,
-                            capture=True
-                        )
-                        if renderer_success and "vulkan" in renderer_stdout.lower():
-                            vulkan_set = True
-                    except Exception:
-                        pass
-                    
-                    if vulkan_set:
-                        self.log(f"  Vulkan Renderer: ✓ Configured", "success")
-                    else:
-                        self.log(f"  Vulkan Renderer: ⚠ Not configured", "warning")
-                else:
+                vulkan_set = renderer_future.result()
+                if vulkan_set is None:
                     self.log(f"  Vulkan Renderer: ✗ Not configured", "error")
+                elif vulkan_set:
+                    self.log(f"  Vulkan Renderer: ✓ Configured", "success")
+                else:
+                    self.log(f"  Vulkan Renderer: ⚠ Not configured", "warning")
             except Exception:
                 self.log(f"  Vulkan Renderer: ✗ Not configured", "error")
             
             self.log("WebView2 Runtime:", "info")
-            if self.check_webview2_installed():
+            if webview2_future.result():
                 self.log(f"  Microsoft Edge WebView2 Runtime: ✓ Installed", "success")
             else:
                 self.log(f"  Microsoft Edge WebView2 Runtime: ✗ Not installed", "error")
@@ -1743,6 +1994,9 @@ class AffinityInstallerGUI(QMainWindow):
                 self.setWindowIcon(icon)
                 
                 try:
+                    # Loaded on demand: QtSvgWidgets is optional on some distributions and
+                    # only needed here; a missing module falls back to the pixmap below
+                    from PyQt6.QtSvgWidgets import QSvgWidget
                     svg_widget = QSvgWidget(self.affinity_icon_path)
                     svg_widget.setFixedSize(icon_size, icon_size)
                     svg_widget.setStyleSheet("background: transparent;")
@@ -2274,6 +2528,7 @@ class AffinityInstallerGUI(QMainWindow):
                     icon_url = "https://raw.githubusercontent.com/seapear/AffinityOnLinux/main/Assets/Icons/Affinity-Canva.svg"
                     urllib.request.urlretrieve(icon_url, str(icon_path))
                     self.affinity_icon_path = str(icon_path)
+                    self._icon_index = None  # Pick up the new icon in desktop entries
                     from PyQt6.QtCore import QTimer
                     QTimer.singleShot(0, lambda: self.setWindowIcon(QIcon(str(icon_path))))
                 except Exception:
@@ -2284,7 +2539,21 @@ class AffinityInstallerGUI(QMainWindow):
         threading.Thread(target=check_and_load_icon, daemon=True).start()
     
     def closeEvent(self, event):
-        """Handle window close event - close log file"""
+        """Handle window close event - stop background work, then close log file"""
+        # Stop background work first so the lines it logs while winding down are
+        # still in the queue for the final flush; the wait is bounded so a stuck
+        # task cannot hang the window
+        self.cancel_event.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._worker.shutdown(wait=False, cancel_futures=True)
+        waiter = threading.Thread(
+            target=lambda: (self._pool.shutdown(wait=True), self._worker.shutdown(wait=True)),
+            daemon=True
+        )
+        waiter.start()
+        waiter.join(timeout=CLOSE_WORKER_GRACE)
+        
+        self._flush_logs()
         if self.log_file:
             try:
                 log_footer = f"{'='*80}\n"
@@ -2294,20 +2563,48 @@ class AffinityInstallerGUI(QMainWindow):
                 self.log_file.close()
             except Exception:
                 pass
+            self.log_file = None
+        if self._http_client is not None:
+            try:
+                self._http_client.close()
+            except Exception:
+                pass
+        # _devnull_fd is deliberately left open: pool tasks and launch threads may still be
+        # spawning children with it, and process exit closes it anyway
         event.accept()
     
+    def _select_installer_file(self, title):
+        """Ask for an installer .exe with one reused dialog; returns the path or "" if cancelled.
+        
+        Keeping the QFileDialog around avoids rebuilding it (and the portal round-trip)
+        on every install/update, and it remembers the last directory used.
+        """
+        if self._open_dlg is None:
+            self._open_dlg = QFileDialog(self)
+            self._open_dlg.setFileMode(QFileDialog.FileMode.ExistingFile)
+            self._open_dlg.setNameFilters(["Executable files (*.exe)", "All files (*.*)"])
+        self._open_dlg.setWindowTitle(title)
+        if not self._open_dlg.exec():
+            return ""
+        selected = self._open_dlg.selectedFiles()
+        return selected[0] if selected else ""
+    
     def sanitize_filename(self, filename):
         """Sanitize filename by replacing spaces and other problematic characters"""
-        sanitized = filename.replace(" ", "-")
-        sanitized = sanitized.replace("(", "-").replace(")", "-")
-        sanitized = sanitized.replace("[", "-").replace("]", "-")
-        while "--" in sanitized:
-            sanitized = sanitized.replace("--", "-")
-        return sanitized
+        return FILENAME_SEPARATOR_RE.sub("-", filename)
     
     def log(self, message, level="info"):
-        """Add message to log (thread-safe via signal)"""
-        self.log_signal.emit(message, level)
+        """Add message to log (thread-safe; lines are queued and flushed in batches via signal)"""
+        deferred = getattr(self._deferred_output, "lines", None)
+        if deferred is not None:
+            deferred.append((message, level))
+            return
+        with self._log_lock:
+            self._log_queue.append((time.strftime("%H:%M:%S"), message, level))
+            if self._log_flush_pending:
+                return
+            self._log_flush_pending = True
+        self.log_signal.emit()
     
     def _get_system_specs(self):
         """Gather system specifications"""
@@ -2413,10 +2710,37 @@ class AffinityInstallerGUI(QMainWindow):
         except Exception as e:
             self.log_file = None
     
-    def _log_safe(self, message, level="info"):
-        """Thread-safe log handler (called from main thread)"""
-        timestamp = time.strftime("%H:%M:%S")
+    def _flush_logs(self):
+        """Append all queued log lines to the log view and log file (called from main thread)"""
+        with self._log_lock:
+            entries = self._log_queue
+            self._log_queue = []
+            self._log_flush_pending = False
+        if not entries:
+            return
+        
+        html_parts = []
+        plain_lines = []
+        for timestamp, message, level in entries:
+            html, plain = self._format_log_entry(timestamp, message, level)
+            html_parts.append(html)
+            plain_lines.append(plain)
         
+        # One append and one scroll per batch instead of per line
+        self.log_text.append("".join(html_parts))
+        self.log_text.verticalScrollBar().setValue(
+            self.log_text.verticalScrollBar().maximum()
+        )
+        
+        if self.log_file:
+            try:
+                self.log_file.write("\n".join(plain_lines) + "\n")
+                self.log_file.flush()
+            except Exception:
+                pass
+    
+    def _format_log_entry(self, timestamp, message, level="info"):
+        """Return the (HTML, plain text) forms of one log line"""
         if level == "error":
             icon = "❌"
             color = "#ff7b72"
@@ -2448,21 +2772,12 @@ class AffinityInstallerGUI(QMainWindow):
         else:
             full_message = f'<div style="padding: 2px 4px; margin: 1px 0;">{timestamp_html} {icon_html} <span style="color: {color};">{message}</span></div>'
         
-        self.log_text.append(full_message)
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
-        
-        if self.log_file:
-            try:
-                plain_message = f"[{timestamp}] [{level.upper()}] {message}"
-                self.log_file.write(plain_message + "\n")
-                self.log_file.flush()
-            except Exception:
-                pass
+        return full_message, f"[{timestamp}] [{level.upper()}] {message}"
     
     def update_progress(self, value):
         """Update progress bar (thread-safe via signal)"""
+        if getattr(self._deferred_output, "lines", None) is not None:
+            return
         self.progress_signal.emit(value)
     
     def _update_progress_safe(self, value):
@@ -2475,8 +2790,24 @@ class AffinityInstallerGUI(QMainWindow):
     
     def update_progress_text(self, text):
         """Update progress label text (thread-safe via signal)"""
+        if getattr(self._deferred_output, "lines", None) is not None:
+            return
         self.progress_text_signal.emit(text)
     
+    def _run_deferred(self, fn, *args):
+        """Run fn quietly on this thread: its log lines are held back and its progress
+        updates dropped. Returns (result, [(message, level), ...]) so a background step
+        can be reported after the foreground step that owns the progress bar."""
+        lines = []
+        self._deferred_output.lines = lines
+        try:
+            return fn(*args), lines
+        except Exception as e:
+            lines.append((f"Error: {e}", "error"))
+            return None, lines
+        finally:
+            self._deferred_output.lines = None
+    
     def cancel_operation(self):
         """Cancel the current operation with confirmation"""
         reply = QMessageBox.question(
@@ -2497,9 +2828,9 @@ class AffinityInstallerGUI(QMainWindow):
                 self.terminate_active_processes()
             except Exception:
                 pass
-            self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "warning")
+            self.log(LOG_RULE_OPEN, "warning")
             self.log("⚠ Operation cancelled by user", "warning")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n", "warning")
+            self.log(LOG_RULE_CLOSE, "warning")
             self.update_progress_text("Operation cancelled")
             self.update_progress(0.0)
             self.cancel_btn.setVisible(False)
@@ -2510,6 +2841,17 @@ class AffinityInstallerGUI(QMainWindow):
             except Exception:
                 pass
     
+    def _submit_operation(self, fn, *args):
+        """Run an install/update operation on the warm operation worker, logging any uncaught error"""
+        def report(future):
+            if not future.cancelled() and future.exception() is not None:
+                error = future.exception()
+                self.log(f"Operation failed with an unexpected error: {error}", "error")
+                self.log("".join(traceback.format_exception(type(error), error, error.__traceback__)), "error")
+        future = self._worker.submit(fn, *args)
+        future.add_done_callback(report)
+        return future
+    
     def start_operation(self, operation_name):
         """Mark the start of an operation and show cancel button"""
         self.operation_cancelled = False
@@ -2534,6 +2876,35 @@ class AffinityInstallerGUI(QMainWindow):
             self._last_clicked_button = None
         self.update_progress(0.0)
         self.update_progress_text("Ready")
+        if self._desktop_dirty:
+            self._refresh_desktop_database()
+    
+    def _refresh_desktop_database(self):
+        """Rebuild the applications MIME cache once for all entries written by the operation"""
+        self._desktop_dirty = False
+        update_db = self.which_command("update-desktop-database")
+        if not update_db:
+            return
+        
+        def run_update_db():
+            try:
+                # subprocess.run waits, so the child is reaped instead of left as a zombie
+                subprocess.run(
+                    [update_db, str(Path.home() / ".local" / "share" / "applications")],
+                    stdout=self._devnull_fd,
+                    stderr=self._devnull_fd,
+                    start_new_session=True,
+                    check=False
+                )
+            except OSError as e:
+                self.log(f"Could not refresh desktop database: {e}", "warning")
+        
+        try:
+            # Runs on the pool: the menu refresh does not need to block the caller
+            self._pool.submit(run_update_db)
+        except RuntimeError:
+            # Pool already shut down (window closing); the refresh is not worth blocking for
+            pass
     
     def check_cancelled(self):
         """Check if operation was cancelled"""
@@ -3408,13 +3779,49 @@ class AffinityInstallerGUI(QMainWindow):
             self.log(f"Error detecting CPU generation: {e}", "warning")
             return "Unknown", False
     
+    def _refresh_prefix_paths(self):
+        """Build the commonly used prefix paths once; call again whenever self.directory changes"""
+        self._prefix = Path(self.directory)
+        self._wine_dir = self._prefix / "ElementalWarriorWine"
+        self._wine_bin_dir = self._wine_dir / "bin"
+        self._wine = self._wine_bin_dir / "wine"
+        self._winecfg = self._wine_bin_dir / "winecfg"
+        self._regedit = self._wine_bin_dir / "regedit"
+        self._drive_c = self._prefix / "drive_c"
+        self._users_dir = self._drive_c / "users"
+        self._system32 = self._drive_c / "windows" / "system32"
+        self._syswow64 = self._drive_c / "windows" / "syswow64"
+        self._affinity_root = self._drive_c / "Program Files" / "Affinity"
+        self._wine_paths = {}
+        # String forms used when writing desktop entries (no trailing slash)
+        self._directory_str = str(self.directory).rstrip("/")
+        self._wine_str = str(self._wine)
+        self._affinity_v3_exe_str = os.path.join(self._directory_str, "drive_c", *AFFINITY_V3_EXE_PARTS)
+        # Snapshot of the process environment with the prefix set; copied per call by _wine_env()
+        self._wine_env_base = {**os.environ, "WINEPREFIX": self.directory}
+        # Same snapshot already encoded, for launches that pass a bytes environment
+        self._wine_environb_base = {**os.environb, b"WINEPREFIX": os.fsencode(self.directory)}
+    
+    def _wine_env(self, **overrides):
+        """Return a fresh environment dict for running Wine tools against this prefix.
+        
+        Copying the prebuilt plain dict is much cheaper than os.environ.copy(), which
+        decodes every variable again. Callers (and run_command) may modify the result.
+        """
+        env = dict(self._wine_env_base)
+        env.update(overrides)
+        return env
+    
     def get_wine_dir(self):
         """Get the Wine directory path"""
-        return Path(self.directory) / "ElementalWarriorWine"
+        return self._wine_dir
     
     def get_wine_path(self, binary="wine"):
         """Get the path to a Wine binary"""
-        return self.get_wine_dir() / "bin" / binary
+        path = self._wine_paths.get(binary)
+        if path is None:
+            path = self._wine_paths[binary] = self._wine_bin_dir / binary
+        return path
     
     def get_current_wine_version(self):
         """Get the current ElementalWarrior Wine version (9.14, 10.10, or 11.0)"""
@@ -3428,7 +3835,7 @@ class AffinityInstallerGUI(QMainWindow):
                 try:
                     success, stdout, _ = self.run_command([str(wine_bin), "--version"], check=False, capture=True)
                     if success and stdout:
-                        version_match = re.search(r'wine-(\d+\.\d+)', stdout)
+                        version_match = WINE_VERSION_RE.search(stdout)
                         if version_match:
                             version = version_match.group(1)
                             # Map actual Wine version to ElementalWarrior version
@@ -3567,9 +3974,9 @@ class AffinityInstallerGUI(QMainWindow):
         sys.stderr.write("="*80 + "\n")
         sys.stderr.flush()
         
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+        self.log(LOG_RULE, "info")
         self.log("DEBUG: Starting wine-tkg setup process", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", "info")
+        self.log(LOG_RULE, "info")
         
         # Step 1: Get directory paths
         self._debug_log("Step 1 - Getting directory paths")
@@ -3610,7 +4017,6 @@ class AffinityInstallerGUI(QMainWindow):
             error_msg = f"Failed to create wine-tkg directory: {e}"
             sys.stderr.write(f"ERROR: {error_msg}\n")
             sys.stderr.write(f"Error type: {type(e).__name__}\n")
-            import traceback
             sys.stderr.write(f"Traceback:\n{traceback.format_exc()}\n")
             sys.stderr.flush()
             self.log(f"DEBUG: ✗ ERROR: {error_msg}", "error")
@@ -3642,14 +4048,13 @@ class AffinityInstallerGUI(QMainWindow):
         sys.stderr.write(f"[WINE-TKG] Saving to: {wine_tkg_file}\n")
         sys.stderr.flush()
         try:
-            download_result = self.download_file(wine_tkg_url, str(wine_tkg_file), "wine-tkg")
+            download_result = self.download_file(wine_tkg_url, str(wine_tkg_file), "wine-tkg", large=True)
             sys.stderr.write(f"[WINE-TKG] Download result: {download_result}\n")
             sys.stderr.flush()
             self.log(f"DEBUG: Download result: {download_result}", "info")
         except Exception as e:
             error_msg = f"Exception during download: {e}"
             sys.stderr.write(f"[WINE-TKG] ERROR: {error_msg}\n")
-            import traceback
             sys.stderr.write(f"[WINE-TKG] Traceback:\n{traceback.format_exc()}\n")
             sys.stderr.flush()
             self.log(f"DEBUG: ✗ ERROR: {error_msg}", "error")
@@ -3749,7 +4154,6 @@ class AffinityInstallerGUI(QMainWindow):
                 error_msg = f"Error during extraction with lzma: {e}"
                 self.log(f"DEBUG: ✗ ERROR: {error_msg}", "error")
                 self.log(f"DEBUG: Error type: {type(e).__name__}", "error")
-                import traceback
                 self.log(f"DEBUG: Traceback:\n{traceback.format_exc()}", "error")
                 
         except ImportError:
@@ -3827,7 +4231,6 @@ class AffinityInstallerGUI(QMainWindow):
                 error_msg = f"Error extracting tar file: {e}"
                 self.log(f"DEBUG: ✗ ERROR: {error_msg}", "error")
                 self.log(f"DEBUG: Error type: {type(e).__name__}", "error")
-                import traceback
                 self.log(f"DEBUG: Traceback:\n{traceback.format_exc()}", "error")
                 return False
             
@@ -3962,15 +4365,18 @@ class AffinityInstallerGUI(QMainWindow):
         return False
     
     def get_winetricks_env_with_tkg(self, base_env=None):
-        """Get environment for winetricks with wine-tkg in PATH"""
+        """Get environment for winetricks with wine-tkg in PATH.
+        
+        A base_env is updated in place and returned; callers hand in a fresh
+        _wine_env() dict, so copying it again would only repeat that work."""
         self.log("DEBUG: get_winetricks_env_with_tkg() called", "info")
         
         if base_env is None:
-            env = os.environ.copy()
-            self.log("DEBUG: Created new environment from os.environ", "info")
+            env = self._wine_env()
+            self.log("DEBUG: Created new environment for the prefix", "info")
         else:
-            env = base_env.copy()
-            self.log("DEBUG: Created environment copy from base_env", "info")
+            env = base_env
+            self.log("DEBUG: Using the caller's environment", "info")
         
         self.log("DEBUG: Searching for wine-tkg binary...", "info")
         wine_tkg_bin = self.get_wine_tkg_path("wine")
@@ -4048,7 +4454,10 @@ class AffinityInstallerGUI(QMainWindow):
             pass
     
     def run_command(self, command, check=True, shell=False, capture=True, env=None):
-        """Execute shell command with GUI sudo password support and cancellation."""
+        """Execute shell command with GUI sudo password support and cancellation.
+        
+        With capture=False the output is discarded (DEVNULL) rather than inherited, so
+        callers that only need the exit status skip the pipe reads and decoding."""
         try:
             # Convert command to list if it's a string
             if isinstance(command, str) and not shell:
@@ -4057,17 +4466,9 @@ class AffinityInstallerGUI(QMainWindow):
             if not isinstance(command, list):
                 command = list(command)
             
-            # Set up environment for non-interactive operation
-            if env is None:
-                env = os.environ.copy()
-            
-            # Force non-interactive mode for various tools
-            env['DEBIAN_FRONTEND'] = 'noninteractive'
-            env['NEEDRESTART_MODE'] = 'a'  # Auto-restart services without asking
-            env['DEBIAN_PRIORITY'] = 'critical'
-            env['APT_LISTCHANGES_FRONTEND'] = 'none'
-            env['LANG'] = 'C'  # Use C locale to avoid encoding issues
-            env['LC_ALL'] = 'C'
+            # Non-interactive environment, merged into a new dict: the caller's env may be
+            # shared with other threads and must not be modified
+            env = {**(os.environ if env is None else env), **NONINTERACTIVE_ENV}
             
             # Check if this is a sudo command
             is_sudo = isinstance(command, list) and len(command) > 0 and command[0] == "sudo"
@@ -4119,8 +4520,8 @@ class AffinityInstallerGUI(QMainWindow):
                 proc = subprocess.Popen(
                     command,
                     stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE if capture else None,
-                    stderr=subprocess.PIPE if capture else None,
+                    stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                    stderr=subprocess.PIPE if capture else subprocess.DEVNULL,
                     text=True,
                     env=env,  # Use the modified env that has SUDO_ASKPASS removed
                     preexec_fn=os.setsid
@@ -4247,10 +4648,10 @@ class AffinityInstallerGUI(QMainWindow):
                 proc = subprocess.Popen(
                     command if not shell else (command if isinstance(command, str) else " ".join(command)),
                     shell=shell,
-                    stdout=subprocess.PIPE if capture else None,
-                    stderr=subprocess.PIPE if capture else None,
+                    stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                    stderr=subprocess.PIPE if capture else subprocess.DEVNULL,
                     text=capture,
-                    env=env if env else os.environ.copy(),
+                    env=env,
                     preexec_fn=os.setsid
                 )
                 self._register_process(proc)
@@ -4293,74 +4694,83 @@ class AffinityInstallerGUI(QMainWindow):
             if isinstance(command, str):
                 command = command.split()
             
-            # Set up environment for non-interactive operation
-            if env is None:
-                env = os.environ.copy()
-            
-            # Force non-interactive mode for various tools
-            env['DEBIAN_FRONTEND'] = 'noninteractive'
-            env['NEEDRESTART_MODE'] = 'a'  # Auto-restart services without asking
-            env['DEBIAN_PRIORITY'] = 'critical'
-            env['APT_LISTCHANGES_FRONTEND'] = 'none'
-            env['LANG'] = 'C'  # Use C locale to avoid encoding issues
-            env['LC_ALL'] = 'C'
+            env = {**(os.environ if env is None else env), **NONINTERACTIVE_ENV}
             
             # Unset SUDO_ASKPASS if this is a sudo command
             is_sudo = isinstance(command, list) and len(command) > 0 and command[0] == "sudo"
             if is_sudo:
                 env.pop('SUDO_ASKPASS', None)
             
+            # Unbuffered binary pipe: output is read in large chunks and split into lines here
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
+                bufsize=0,
                 env=env,
                 preexec_fn=os.setsid
             )
             self._register_process(process)
             
-            # Stream output line by line
             buffer = []
-            for line in iter(process.stdout.readline, ''):
+            
+            def handle_line(raw):
+                # Clean up the line and log it
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                if not line:
+                    return
+                buffer.append(line + "\n")
+                # Show important progress messages
+                line_lower = line.lower()
+                # Always show progress-related messages
+                if any(keyword in line_lower for keyword in [
+                    'progress', 'downloading', 'installing', 'extracting', 
+                    'configuring', 'executing', 'running', 'done', 'complete',
+                    'success', 'error', 'failed', 'warning', '%', 'mb', 'kb'
+                ]):
+                    self.log(f"  {line}", "info")
+                    
+                    # Try to extract progress percentage if callback provided
+                    if progress_callback:
+                        percent_match = PERCENT_RE.search(line)
+                        if percent_match:
+                            try:
+                                percent = int(percent_match.group(1))
+                                progress_callback(percent / 100.0)
+                            except (ValueError, TypeError):
+                                pass
+                # Filter out very verbose Wine debug messages but keep important ones
+                elif not any(skip in line_lower for skip in [
+                    'fixme:', 'trace:', 'debug:'
+                ]):
+                    # Show other non-debug messages
+                    self.log(f"  {line}", "info")
+            
+            # Read up to 256 KiB per syscall; select() timeout lets cancellation be noticed
+            # even while the process is silent
+            fd = process.stdout.fileno()
+            pending = bytearray()
+            while True:
                 if self.cancel_event.is_set():
                     self._terminate_process(process)
                     self._last_stream_output_text = "".join(buffer)
                     return False
-                if line:
-                    # Clean up the line and log it
-                    line = line.rstrip()
-                    if line:
-                        buffer.append(line + "\n")
-                        # Show important progress messages
-                        line_lower = line.lower()
-                        # Always show progress-related messages
-                        if any(keyword in line_lower for keyword in [
-                            'progress', 'downloading', 'installing', 'extracting', 
-                            'configuring', 'executing', 'running', 'done', 'complete',
-                            'success', 'error', 'failed', 'warning', '%', 'mb', 'kb'
-                        ]):
-                            self.log(f"  {line}", "info")
-                            
-                            # Try to extract progress percentage if callback provided
-                            if progress_callback:
-                                import re
-                                percent_match = re.search(r'(\d+)\s*%', line, re.IGNORECASE)
-                                if percent_match:
-                                    try:
-                                        percent = int(percent_match.group(1))
-                                        progress_callback(percent / 100.0)
-                                    except (ValueError, TypeError):
-                                        pass
-                        # Filter out very verbose Wine debug messages but keep important ones
-                        elif not any(skip in line_lower for skip in [
-                            'fixme:', 'trace:', 'debug:'
-                        ]):
-                            # Show other non-debug messages
-                            self.log(f"  {line}", "info")
-            
+                ready, _, _ = select.select([fd], [], [], 0.1)
+                if not ready:
+                    continue
+                data = os.read(fd, 262144)
+                if not data:
+                    break
+                # Treat carriage returns (progress redraws) as line breaks, like universal newlines did
+                pending += data.replace(b"\r", b"\n")
+                lines = pending.split(b"\n")
+                pending = bytearray(lines.pop())
+                for raw in lines:
+                    handle_line(raw)
+            if pending:
+                handle_line(pending)
+            
+            process.stdout.close()
             process.wait()
             self._last_stream_output_text = "".join(buffer)
             return process.returncode == 0
@@ -4406,7 +4816,7 @@ class AffinityInstallerGUI(QMainWindow):
                 if ("wine" in text or "wineserver" in text) and any(pat in text for pat in patterns):
                     return True
             # Window-based heuristic (wmctrl)
-            wmctrl = shutil.which("wmctrl")
+            wmctrl = self.which_command("wmctrl")
             if wmctrl:
                 ok, wout, _ = self.run_command([wmctrl, "-lx"], check=False, capture=True)
                 if ok and wout:
@@ -4535,8 +4945,8 @@ class AffinityInstallerGUI(QMainWindow):
                                 if not self._has_installer_activity(installer_file):
                                     # Also verify WebView2 was actually installed
                                     webview2_paths = [
-                                        Path(self.directory) / "drive_c" / "Program Files (x86)" / "Microsoft" / "EdgeWebView" / "Application",
-                                        Path(self.directory) / "drive_c" / "Program Files" / "Microsoft" / "EdgeWebView" / "Application",
+                                        self._drive_c / "Program Files (x86)" / "Microsoft" / "EdgeWebView" / "Application",
+                                        self._drive_c / "Program Files" / "Microsoft" / "EdgeWebView" / "Application",
                                     ]
                                     installed = any(
                                         (path / "msedgewebview2.exe").exists() 
@@ -4553,8 +4963,7 @@ class AffinityInstallerGUI(QMainWindow):
                             self.log("WebView2 installer timeout reached - proceeding anyway", "warning")
                         
                         # Final wineserver wait with short timeout
-                        env_wait = env.copy() if env else os.environ.copy()
-                        env_wait["WINEPREFIX"] = self.directory
+                        env_wait = {**env, "WINEPREFIX": self.directory} if env else self._wine_env()
                         try:
                             # Use timeout for wineserver wait (30 seconds max)
                             process = subprocess.Popen(
@@ -4572,8 +4981,7 @@ class AffinityInstallerGUI(QMainWindow):
                     else:
                         self.log("Waiting for Wine processes to finish (wineserver -w)...", "info")
                         # Extended wait; cancellable via run_command loop
-                        env_wait = env.copy() if env else os.environ.copy()
-                        env_wait["WINEPREFIX"] = self.directory
+                        env_wait = {**env, "WINEPREFIX": self.directory} if env else self._wine_env()
                         # Use system wineserver (always use system wineserver, not patched one)
                         self.run_command(["wineserver", "-w"], check=False, capture=False, env=env_wait)
                     return True
@@ -4590,17 +4998,7 @@ class AffinityInstallerGUI(QMainWindow):
             if isinstance(command, str):
                 command = command.split()
             
-            # Set up environment for non-interactive operation
-            if env is None:
-                env = os.environ.copy()
-            
-            # Force non-interactive mode for various tools
-            env['DEBIAN_FRONTEND'] = 'noninteractive'
-            env['NEEDRESTART_MODE'] = 'a'
-            env['DEBIAN_PRIORITY'] = 'critical'
-            env['APT_LISTCHANGES_FRONTEND'] = 'none'
-            env['LANG'] = 'C'
-            env['LC_ALL'] = 'C'
+            env = {**(os.environ if env is None else env), **NONINTERACTIVE_ENV}
             
             # Check if this is a sudo command
             is_sudo = isinstance(command, list) and len(command) > 0 and command[0] == "sudo"
@@ -4740,9 +5138,40 @@ class AffinityInstallerGUI(QMainWindow):
             except Exception:
                 pass
     
+    def _path_executables(self):
+        """Map command names to their first location on PATH, from one scan of the PATH directories"""
+        search_path = os.environ.get("PATH", os.defpath)
+        index = self._path_index
+        if index is not None and index[0] == search_path:
+            return index[1]
+        commands = {}
+        for directory in search_path.split(os.pathsep):
+            try:
+                with os.scandir(directory or ".") as it:
+                    for entry in it:
+                        commands.setdefault(entry.name, entry.path)
+            except OSError:
+                continue
+        self._path_index = (search_path, commands)
+        return commands
+    
+    def which_command(self, cmd):
+        """Return the full path of a command, or None (found paths are cached; misses are
+        re-checked since dependencies may get installed while the installer is running)"""
+        path = self._cmd_cache.get(cmd)
+        if path is None:
+            # The PATH index answers first-time lookups without walking PATH per command;
+            # anything it doesn't know (e.g. installed since the scan) goes to shutil.which
+            path = self._path_executables().get(cmd) if os.sep not in cmd else None
+            if path is None or not os.access(path, os.X_OK) or os.path.isdir(path):
+                path = shutil.which(cmd)
+            if path is not None:
+                self._cmd_cache[cmd] = path
+        return path
+    
     def check_command(self, cmd):
         """Check if command exists"""
-        return shutil.which(cmd) is not None
+        return self.which_command(cmd) is not None
     
     def detect_distro(self):
         """Detect Linux distribution"""
@@ -5672,9 +6101,9 @@ class AffinityInstallerGUI(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
         
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Switching to VKD3D", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         try:
             # 1. Install vkd3d-proton (full setup)
@@ -5705,7 +6134,7 @@ class AffinityInstallerGUI(QMainWindow):
             }
             
             for app_name, app_dir_name in app_dirs.items():
-                app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / app_dir_name
+                app_dir = self._drive_c / "Program Files" / "Affinity" / app_dir_name
                 if app_dir.exists():
                     for dll in ["d3d12.dll", "d3d12core.dll"]:
                         for source in [wine_lib_dir / dll, vkd3d_temp / dll]:
@@ -5747,15 +6176,15 @@ class AffinityInstallerGUI(QMainWindow):
                                 exec_content = line[5:].strip()
                                 
                                 # Extract app path
-                                quoted_path_match = re.search(r'wine\s+"([^"]+)"', exec_content)
+                                quoted_path_match = DESKTOP_EXEC_QUOTED_RE.search(exec_content)
                                 if quoted_path_match:
                                     app_path = quoted_path_match.group(1)
                                 else:
-                                    exe_match = re.search(r'wine\s+([^\s]+\.exe[^\s]*)', exec_content)
+                                    exe_match = DESKTOP_EXEC_WINE_EXE_RE.search(exec_content)
                                     if exe_match:
                                         app_path = exe_match.group(1)
                                     else:
-                                        exe_match = re.search(r'([^\s]+\.exe[^\s]*)', exec_content)
+                                        exe_match = DESKTOP_EXEC_ANY_EXE_RE.search(exec_content)
                                         if exe_match:
                                             app_path = exe_match.group(1).strip('"')
                                         else:
@@ -5773,7 +6202,7 @@ class AffinityInstallerGUI(QMainWindow):
                                 
                                 # Get GPU environment variables (but NOT DXVK)
                                 gpu_env = self.get_gpu_env_vars()
-                                directory_str = str(self.directory).rstrip("/")
+                                directory_str = self._directory_str
                                 
                                 # Rebuild Exec line WITHOUT DXVK env vars
                                 exec_line = f'Exec=env WINEPREFIX={directory_str}'
@@ -5847,16 +6276,15 @@ class AffinityInstallerGUI(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
         
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Switching to DXVK", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         try:
             # 0. Kill wineserver to avoid version mismatch issues
             self.log("Stopping wineserver to avoid version conflicts...", "info")
             wineserver = self.get_wine_path("wineserver")
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             self.run_command([str(wineserver), "-k"], check=False, env=env, capture=True)
             import time
             time.sleep(1)  # Brief pause to ensure wineserver has stopped
@@ -5901,7 +6329,7 @@ class AffinityInstallerGUI(QMainWindow):
             }
             
             for app_name, app_dir_name in app_dirs.items():
-                app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / app_dir_name
+                app_dir = self._drive_c / "Program Files" / "Affinity" / app_dir_name
                 if app_dir.exists():
                     for dll in ["d3d12.dll", "d3d12core.dll"]:
                         dll_path = app_dir / dll
@@ -5930,7 +6358,7 @@ class AffinityInstallerGUI(QMainWindow):
             vkd3d_temp = Path(self.directory) / "vkd3d_dlls"
             
             for app_name, app_dir_name in app_dirs.items():
-                app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / app_dir_name
+                app_dir = self._drive_c / "Program Files" / "Affinity" / app_dir_name
                 if app_dir.exists():
                     for dll in ["d3d12.dll", "d3d12core.dll"]:
                         # Try wine library first, then temp directory
@@ -5973,15 +6401,15 @@ class AffinityInstallerGUI(QMainWindow):
                                 exec_content = line[5:].strip()  # Remove "Exec=" prefix
                                 
                                 # Extract app path
-                                quoted_path_match = re.search(r'wine\s+"([^"]+)"', exec_content)
+                                quoted_path_match = DESKTOP_EXEC_QUOTED_RE.search(exec_content)
                                 if quoted_path_match:
                                     app_path = quoted_path_match.group(1)
                                 else:
-                                    exe_match = re.search(r'wine\s+([^\s]+\.exe[^\s]*)', exec_content)
+                                    exe_match = DESKTOP_EXEC_WINE_EXE_RE.search(exec_content)
                                     if exe_match:
                                         app_path = exe_match.group(1)
                                     else:
-                                        exe_match = re.search(r'([^\s]+\.exe[^\s]*)', exec_content)
+                                        exe_match = DESKTOP_EXEC_ANY_EXE_RE.search(exec_content)
                                         if exe_match:
                                             app_path = exe_match.group(1).strip('"')
                                         else:
@@ -6000,7 +6428,7 @@ class AffinityInstallerGUI(QMainWindow):
                                 # Get GPU and DXVK environment variables
                                 gpu_env = self.get_gpu_env_vars()
                                 dxvk_env = self.get_dxvk_env_vars()
-                                directory_str = str(self.directory).rstrip("/")
+                                directory_str = self._directory_str
                                 
                                 # Rebuild Exec line with DXVK env vars
                                 exec_line = f'Exec=env WINEPREFIX={directory_str}'
@@ -6066,7 +6494,7 @@ class AffinityInstallerGUI(QMainWindow):
         gpu_env = self.get_gpu_env_vars()
         # Get DXVK environment variables if AMD GPU is detected
         dxvk_env = self.get_dxvk_env_vars()
-        directory_str = str(self.directory).rstrip("/")
+        directory_str = self._directory_str
         
         # Find all Affinity desktop entries
         affinity_desktop_files = [
@@ -6097,17 +6525,17 @@ class AffinityInstallerGUI(QMainWindow):
                         
                         # Use regex to extract the app path (everything after wine, typically in quotes or ending with .exe)
                         # Pattern 1: Find app path in quotes after wine
-                        quoted_path_match = re.search(r'wine\s+"([^"]+)"', exec_content)
+                        quoted_path_match = DESKTOP_EXEC_QUOTED_RE.search(exec_content)
                         if quoted_path_match:
                             app_path = quoted_path_match.group(1)
                         else:
                             # Pattern 2: Find app path without quotes (look for .exe)
-                            exe_match = re.search(r'wine\s+([^\s]+\.exe[^\s]*)', exec_content)
+                            exe_match = DESKTOP_EXEC_WINE_EXE_RE.search(exec_content)
                             if exe_match:
                                 app_path = exe_match.group(1)
                             else:
                                 # Pattern 3: Find any path containing .exe
-                                exe_match = re.search(r'([^\s]+\.exe[^\s]*)', exec_content)
+                                exe_match = DESKTOP_EXEC_ANY_EXE_RE.search(exec_content)
                                 if exe_match:
                                     app_path = exe_match.group(1).strip('"')
                                 else:
@@ -6185,8 +6613,43 @@ class AffinityInstallerGUI(QMainWindow):
         
         return distro_names.get(distro.lower() if distro else "", distro.title() if distro else "Unknown")
     
-    def download_file(self, url, output_path, description=""):
-        """Download file with progress tracking"""
+    def _get_http_client(self):
+        """Return the shared httpx client (HTTP/2 if h2 is installed), or None to use urllib"""
+        if not HTTPX_AVAILABLE:
+            return None
+        with self._http_client_lock:
+            if self._http_client is None:
+                try:
+                    self._http_client = httpx.Client(http2=True, follow_redirects=True, headers=DOWNLOAD_HEADERS, timeout=60.0)
+                except ImportError:
+                    # http2=True needs the optional h2 package; keep-alive reuse still helps
+                    self._http_client = httpx.Client(follow_redirects=True, headers=DOWNLOAD_HEADERS, timeout=60.0)
+            return self._http_client
+    
+    @contextlib.contextmanager
+    def _open_download_stream(self, url, chunk_size):
+        """Open url for streaming, yielding (total_size, chunk iterator)"""
+        client = self._get_http_client()
+        if client is not None:
+            # iter_raw() hands back the bytes as sent, so ask for them uncompressed;
+            # otherwise gzip-served files land on disk compressed
+            with client.stream("GET", url, headers={"Accept-Encoding": "identity"}) as response:
+                if response.status_code >= 400:
+                    raise urllib.error.HTTPError(url, response.status_code, response.reason_phrase, response.headers, None)
+                yield int(response.headers.get('Content-Length', 0)), response.iter_raw(chunk_size)
+            return
+        
+        req = urllib.request.Request(url, headers=DOWNLOAD_HEADERS)
+        with urllib.request.urlopen(req) as response:
+            yield int(response.headers.get('Content-Length', 0)), iter(lambda: response.read(chunk_size), b"")
+    
+    def download_file(self, url, output_path, description="", large=False):
+        """Download file with progress tracking.
+        
+        Pass large=True for multi-megabyte archives and installers: only those go
+        through aria2c or the parallel range download, so small fetches skip the extra
+        process spawn and HEAD request and stream over the shared connection.
+        """
         try:
             # Check if cancelled before starting
             if self.check_cancelled():
@@ -6194,59 +6657,329 @@ class AffinityInstallerGUI(QMainWindow):
             
             self.log(f"Downloading {description}...", "info")
             
-            # Create request with proper headers
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-            req.add_header('Accept', '*/*')
-            
-            # Use urlopen for better header support and manual progress tracking
-            with urllib.request.urlopen(req) as response:
-                total_size = int(response.headers.get('Content-Length', 0))
-                downloaded = 0
-                block_size = 8192
-                
-                with open(output_path, 'wb') as out_file:
-                    while True:
-                        # Check for cancellation during download
-                        if self.check_cancelled():
-                            self.log(f"Download of {description} cancelled", "warning")
-                            return False
-                        
-                        chunk = response.read(block_size)
-                        if not chunk:
-                            break
-                        out_file.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if total_size > 0:
-                            percent = min(100, (downloaded * 100) // total_size)
-                            self.update_progress(percent / 100.0)
+            if large:
+                # Prefer aria2c's multi-connection range download when installed
+                if self.check_command("aria2c"):
+                    success, stderr = self._download_with_aria2c(url, output_path)
+                    if success:
+                        self.update_progress(1.0)
+                        return True
+                    # Don't leave aria2c's resume control file beside the output
+                    with contextlib.suppress(OSError):
+                        os.unlink(f"{output_path}.aria2")
+                    if self.check_cancelled():
+                        self.log(f"Download of {description} cancelled", "warning")
+                        return False
+                    self.log(f"aria2c download failed, retrying without it: {stderr.strip()[:200]}", "warning")
                 
-                self.update_progress(1.0)
-                return True
-        except urllib.error.HTTPError as e:
-            self.log(f"Download failed: HTTP {e.code} {e.reason}", "error")
-            if e.code == 404:
-                self.log(f"  URL may be expired or invalid: {url[:80]}...", "warning")
-            return False
+                # Otherwise (or if aria2c failed), several connections in parallel
+                # from servers that support ranges
+                if self._download_ranged(url, output_path, description):
+                    return True
+                if self.check_cancelled():
+                    return False
+            
+            with open(output_path, 'wb') as out_file:
+                return self._download_into(url, out_file, description)
         except Exception as e:
             self.log(f"Download failed: {e}", "error")
             return False
     
-    def start_initialization(self):
-        """Start initialization process"""
-        threading.Thread(target=self.initialize, daemon=True).start()
+    def _download_with_aria2c(self, url, output_path):
+        """Download url with aria2c, feeding its progress readout to the progress bar.
+        
+        Returns (success, output text other than the progress readouts).
+        """
+        output = Path(output_path)
+        try:
+            proc = subprocess.Popen(
+                [
+                    "aria2c", "-x", "8", "-s", "8", "-k", "4M",
+                    "--allow-overwrite=true", "--auto-file-renaming=false", "--console-log-level=warn",
+                    "--summary-interval=1",
+                    f"--user-agent={DOWNLOAD_HEADERS['User-Agent']}",
+                    "-d", str(output.parent), "-o", output.name, url
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                env={**os.environ, **NONINTERACTIVE_ENV},
+                preexec_fn=os.setsid
+            )
+        except OSError as e:
+            return False, str(e)
+        self._register_process(proc)
+        messages = []
+        try:
+            fd = proc.stdout.fileno()
+            pending = b""
+            last_emit = 0.0
+            while True:
+                if self.cancel_event.is_set():
+                    self._terminate_process(proc)
+                    return False, "Cancelled"
+                ready, _, _ = select.select([fd], [], [], 0.1)
+                if not ready:
+                    continue
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                # The readout is redrawn with carriage returns; treat them as line breaks
+                lines = (pending + data).replace(b"\r", b"\n").split(b"\n")
+                pending = lines.pop()
+                for raw in lines:
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    match = ARIA2_PROGRESS_RE.search(line)
+                    if match:
+                        now = time.monotonic()
+                        if now - last_emit >= PROGRESS_EMIT_INTERVAL:
+                            last_emit = now
+                            self.update_progress(min(100, int(match.group(1))) / 100.0)
+                    elif line:
+                        messages.append(line)
+            proc.stdout.close()
+            proc.wait()
+            return proc.returncode == 0, "\n".join(messages[-5:])
+        finally:
+            self._unregister_process(proc)
     
-    def initialize(self):
-        """Initialize installer"""
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        self.log("Affinity Linux Installer - Initialization", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+    def _download_ranged(self, url, output_path, description="", parts=8, min_size=32 * 1024 * 1024):
+        """Download url with `parts` concurrent HTTP range requests written in place with os.pwrite.
         
-        # Detect distribution
-        self.update_progress(0.1)
-        if not self.detect_distro():
-            self.log("Failed to detect distribution. Exiting.", "error")
+        Returns True on success. Returns False when the server does not advertise byte
+        ranges, the file is smaller than min_size, or any part fails; the caller then
+        falls back to a single stream.
+        """
+        try:
+            # The probe goes over the shared keep-alive client when httpx is available
+            client = self._get_http_client()
+            if client is not None:
+                response = client.head(url, headers={"Accept-Encoding": "identity"}, timeout=30)
+                if response.status_code >= 400:
+                    return False
+                final_url = str(response.url)
+                headers = response.headers
+            else:
+                head = urllib.request.Request(url, headers=DOWNLOAD_HEADERS, method="HEAD")
+                with urllib.request.urlopen(head, timeout=30) as response:
+                    final_url = response.geturl()
+                    headers = response.headers
+            total_size = int(headers.get('Content-Length', 0))
+            accepts_ranges = headers.get('Accept-Ranges', '').lower() == 'bytes'
+        except Exception:
+            return False
+        if not accepts_ranges or total_size < min_size:
+            return False
+        
+        self.log(f"Downloading {description} over {parts} connections ({total_size // (1024 * 1024)} MiB)...", "info")
+        part_size = -(-total_size // parts)
+        ranges = [(lo, min(lo + part_size, total_size) - 1) for lo in range(0, total_size, part_size)]
+        stop_event = threading.Event()
+        progress_lock = threading.Lock()
+        downloaded = [0]
+        errors = []
+        
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # Reserve the whole file up front so parts can be written at their offsets
+            try:
+                os.posix_fallocate(fd, 0, total_size)
+            except OSError:
+                os.ftruncate(fd, total_size)
+            
+            def fetch_range(lo, hi):
+                try:
+                    req = urllib.request.Request(final_url, headers={**DOWNLOAD_HEADERS, 'Range': f'bytes={lo}-{hi}'})
+                    with urllib.request.urlopen(req, timeout=60) as response:
+                        if response.status != 206:
+                            raise IOError(f"server ignored range request (HTTP {response.status})")
+                        offset = lo
+                        while not stop_event.is_set():
+                            chunk = response.read(1024 * 1024)
+                            if not chunk:
+                                break
+                            os.pwrite(fd, chunk, offset)
+                            offset += len(chunk)
+                            with progress_lock:
+                                downloaded[0] += len(chunk)
+                        if not stop_event.is_set() and offset != hi + 1:
+                            raise IOError(f"range {lo}-{hi} ended early at {offset}")
+                except Exception as e:
+                    errors.append(e)
+                    stop_event.set()
+            
+            threads = [
+                threading.Thread(target=fetch_range, args=(lo, hi), name=f"RangeDownload-{i}", daemon=True)
+                for i, (lo, hi) in enumerate(ranges)
+            ]
+            for thread in threads:
+                thread.start()
+            while any(thread.is_alive() for thread in threads):
+                if self.check_cancelled():
+                    stop_event.set()
+                self.update_progress(min(1.0, downloaded[0] / total_size))
+                time.sleep(0.25)
+            for thread in threads:
+                thread.join()
+        finally:
+            os.close(fd)
+        
+        if self.check_cancelled():
+            self.log(f"Download of {description} cancelled", "warning")
+            return False
+        if errors:
+            self.log(f"Parallel download failed ({errors[0]}), retrying with a single connection", "warning")
+            return False
+        self.update_progress(1.0)
+        return True
+    
+    def download_to_spool(self, url, description="", max_size=64 * 1024 * 1024):
+        """Download into a SpooledTemporaryFile that stays in memory up to max_size.
+
+        Returns the spool rewound to the start (caller closes it), or None on failure.
+        Useful for archives that are opened right away, e.g. by zipfile, which
+        needs random access but not a named file on disk.
+        """
+        if self.check_cancelled():
+            return None
+        
+        self.log(f"Downloading {description}...", "info")
+        spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+        if not self._download_into(url, spool, description):
+            spool.close()
+            return None
+        spool.seek(0)
+        return spool
+    
+    def _download_into(self, url, out_file, description=""):
+        """Stream url into an open binary file object with progress tracking"""
+        try:
+            # Reuses the shared connection when httpx is available
+            with self._open_download_stream(url, DOWNLOAD_CHUNK_SIZE) as (total_size, chunks):
+                downloaded = 0
+                last_emit = 0.0
+                for chunk in chunks:
+                    # Check for cancellation during download
+                    if self.check_cancelled():
+                        self.log(f"Download of {description} cancelled", "warning")
+                        return False
+                    
+                    out_file.write(chunk)
+                    downloaded += len(chunk)
+                    
+                    # Coalesce progress signals so the reader isn't slowed by per-chunk Qt emits
+                    now = time.monotonic()
+                    if total_size > 0 and now - last_emit >= PROGRESS_EMIT_INTERVAL:
+                        last_emit = now
+                        percent = min(100, (downloaded * 100) // total_size)
+                        self.update_progress(percent / 100.0)
+            
+            self.update_progress(1.0)
+            return True
+        except urllib.error.HTTPError as e:
+            self.log(f"Download failed: HTTP {e.code} {e.reason}", "error")
+            if e.code == 404:
+                self.log(f"  URL may be expired or invalid: {url[:80]}...", "warning")
+            return False
+        except Exception as e:
+            self.log(f"Download failed: {e}", "error")
+            return False
+    
+    def download_and_extract_tar(self, url, extract_to, description="", member_filter=None, contiguous=False, compression="gz"):
+        """Download a .tar.gz (or .tar.xz with compression="xz") archive and extract it while it is still downloading.
+
+        A downloader thread pushes 4 MiB chunks into a bounded queue which the
+        calling thread decompresses and untars as a stream, so network and CPU
+        work overlap instead of running back to back. If member_filter is given,
+        only members whose name it accepts are written out. With contiguous=True
+        the wanted members are known to form one run (as in git archive output),
+        so reading stops - and the download is abandoned - right after that run.
+        """
+        if self.check_cancelled():
+            return False
+        
+        self.log(f"Downloading {description}...", "info")
+        chunk_size = 4 * 1024 * 1024
+        chunk_queue = queue.Queue(maxsize=4)
+        stop_event = threading.Event()
+        
+        def put_chunk(item):
+            # Bounded put that gives up once the extractor has stopped reading
+            while not stop_event.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        # A deferred (quiet) caller stays quiet in the downloader thread too
+        deferred_lines = getattr(self._deferred_output, "lines", None)
+        
+        def downloader():
+            self._deferred_output.lines = deferred_lines
+            try:
+                with self._open_download_stream(url, chunk_size) as (total_size, chunks):
+                    downloaded = 0
+                    for chunk in chunks:
+                        if self.check_cancelled():
+                            put_chunk(InterruptedError(f"Download of {description} cancelled"))
+                            return
+                        if not put_chunk(chunk):
+                            return
+                        downloaded += len(chunk)
+                        if total_size > 0:
+                            percent = min(100, (downloaded * 100) // total_size)
+                            self.update_progress(percent / 100.0)
+                put_chunk(None)
+            except Exception as e:
+                put_chunk(e)
+        
+        download_thread = threading.Thread(target=downloader, name="DownloaderThread", daemon=True)
+        download_thread.start()
+        try:
+            extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+            with tarfile.open(fileobj=QueueReader(chunk_queue), mode=f"r|{compression}") as tar:
+                # Members are written one by one as they come off the stream
+                matched = False
+                for member in tar:
+                    if member_filter is None or member_filter(member.name):
+                        matched = True
+                        tar.extract(member, extract_to, **extract_kwargs)
+                    elif contiguous and matched:
+                        break
+            self.update_progress(1.0)
+            return True
+        except urllib.error.HTTPError as e:
+            self.log(f"Download failed: HTTP {e.code} {e.reason}", "error")
+            if e.code == 404:
+                self.log(f"  URL may be expired or invalid: {url[:80]}...", "warning")
+            return False
+        except InterruptedError as e:
+            self.log(str(e), "warning")
+            return False
+        except Exception as e:
+            self.log(f"Download/extraction of {description} failed: {e}", "error")
+            return False
+        finally:
+            stop_event.set()
+            download_thread.join(timeout=5)
+    
+    def start_initialization(self):
+        """Start initialization process"""
+        threading.Thread(target=self.initialize, daemon=True).start()
+    
+    def initialize(self):
+        """Initialize installer"""
+        self.log(LOG_RULE)
+        self.log("Affinity Linux Installer - Initialization", "info")
+        self.log(LOG_RULE_CLOSE)
+        
+        # Detect distribution
+        self.update_progress(0.1)
+        if not self.detect_distro():
+            self.log("Failed to detect distribution. Exiting.", "error")
             return
         
         self.log(f"Detected distribution: {self.format_distro_name()} {self.distro_version or ''}", "success")
@@ -6269,9 +7002,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def one_click_setup(self):
         """One-click full setup: detects distro, installs deps, sets up Wine, installs Winetricks deps"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("One-Click Full Setup", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         self.log("This will automatically:", "info")
         self.log("  1. Detect your Linux distribution", "info")
         self.log("  2. Check and install system dependencies", "info")
@@ -6772,9 +7505,9 @@ class AffinityInstallerGUI(QMainWindow):
             
             if checked_id == 0:  # Download
                 # Download the installer in background, then install
-                self.log(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log(f"Downloading {display_name} Installer", "info")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 
                 download_url = "https://downloads.affinity.studio/Affinity%20x64.exe"
                 # Download to .AffinityLinux/Installer/ directory
@@ -6784,26 +7517,17 @@ class AffinityInstallerGUI(QMainWindow):
                 self.log(f"Downloading to: {installer_path}", "info")
                 
                 self.start_operation(f"Install {display_name}")
-                threading.Thread(
-                    target=self._download_then_install,
-                    args=(app_code, display_name, download_url, str(installer_path)),
-                    daemon=True
-                ).start()
+                self._submit_operation(self._download_then_install, app_code, display_name, download_url, str(installer_path))
                 return
                 
             else:  # Provide own file
                 # Open file dialog to select .exe
-                self.log(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log(f"Custom Installer for {display_name}", "info")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 self.log("Please select the installer .exe file...", "info")
                 
-                installer_path, _ = QFileDialog.getOpenFileName(
-                    self,
-                    f"Select {display_name} Installer",
-                    "",
-                    "Executable files (*.exe);;All files (*.*)"
-                )
+                installer_path = self._select_installer_file(f"Select {display_name} Installer")
                 
                 if not installer_path:
                     self.log("Installation cancelled.", "warning")
@@ -6819,17 +7543,13 @@ class AffinityInstallerGUI(QMainWindow):
             
             # Start operation and installation in background thread
             self.start_operation(f"Install {display_name}")
-            threading.Thread(
-                target=self._run_installation_entry,
-                args=(app_code, installer_path_str),
-                daemon=True
-            ).start()
+            self._submit_operation(self._run_installation_entry, app_code, installer_path_str)
     
     def _download_then_install(self, app_code, display_name, download_url, installer_path_str):
         """Download installer then run installation (runs in background)."""
         try:
             self.log(f"Downloading from: {download_url}", "info")
-            if not self.download_file(download_url, installer_path_str, f"{display_name} installer"):
+            if not self.download_file(download_url, installer_path_str, f"{display_name} installer", large=True):
                 self.log("Download failed. Please try providing your own installer file.", "error")
                 self.show_message(
                     "Download Failed",
@@ -6848,9 +7568,9 @@ class AffinityInstallerGUI(QMainWindow):
 
     def check_dependencies(self):
         """Check and install dependencies"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Dependency Verification", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         self.update_progress_text("Checking dependencies...")
         self.update_progress(0.0)
@@ -6879,14 +7599,15 @@ class AffinityInstallerGUI(QMainWindow):
         self.update_progress(progress)
         self.update_progress_text("Checking archive tools...")
         
-        if not self.check_command("7z") and not self.check_command("unzip"):
+        # Resolve once: 7z is preferred, unzip is enough
+        archive_tool = next((tool for tool in ("7z", "unzip") if self.check_command(tool)), None)
+        if archive_tool is None:
             self.log("Neither 7z nor unzip is installed (at least one is required)", "error")
             missing.append("7z or unzip")
+        elif archive_tool == "7z":
+            self.log("7z is installed", "success")
         else:
-            if self.check_command("7z"):
-                self.log("7z is installed", "success")
-            else:
-                self.log("unzip is installed (will be used instead of 7z)", "success")
+            self.log("unzip is installed (will be used instead of 7z)", "success")
         
         # Check zstd
         progress = (len(deps) + 2) / total_checks * 0.5
@@ -7066,9 +7787,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def install_pikaos_dependencies(self):
         """Install PikaOS dependencies with WineHQ staging"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("PikaOS Special Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         self.log("PikaOS's built-in Wine has compatibility issues.", "warning")
         self.log("Setting up WineHQ staging from Debian...\n", "info")
 
@@ -7250,9 +7971,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def install_popos_dependencies(self):
         """Install Pop!_OS dependencies with WineHQ staging"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Pop!_OS Special Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         self.log("Pop!_OS's built-in Wine has compatibility issues.", "warning")
         self.log("Setting up WineHQ staging from Ubuntu...\n", "info")
         
@@ -7425,7 +8146,7 @@ class AffinityInstallerGUI(QMainWindow):
                 return False
             
             # First check that system Wine is available (needed for installation)
-            system_wine = shutil.which("wine")
+            system_wine = self.which_command("wine")
             if not system_wine:
                 self.log("System Wine not found. System Wine is required for installation:", "error")
                 self.log("  Ubuntu/Debian: sudo apt install wine", "info")
@@ -7434,9 +8155,9 @@ class AffinityInstallerGUI(QMainWindow):
                 self.update_progress_text("Ready")
                 return False
             
-            self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            self.log(LOG_RULE_OPEN)
             self.log("Wine Binary Setup", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+            self.log(LOG_RULE_CLOSE)
             
             # Get Wine version configuration
             config = self._get_wine_version_config(wine_version)
@@ -7473,7 +8194,7 @@ class AffinityInstallerGUI(QMainWindow):
             self.update_progress_text(f"Downloading {wine_display_name}...")
             self.update_progress(0.10)
             self.log(f"Downloading {wine_display_name}...", "info")
-            if not self.download_file(wine_url, str(wine_file), f"{wine_display_name} binaries"):
+            if not self.download_file(wine_url, str(wine_file), f"{wine_display_name} binaries", large=True):
                 self.log(f"Failed to download {wine_display_name}", "error")
                 self.update_progress_text("Ready")
                 return False
@@ -7573,6 +8294,8 @@ class AffinityInstallerGUI(QMainWindow):
                 self.update_progress(icon_progress)
                 if not self.download_file(url, str(path), desc):
                     self.log(f"Warning: {desc} download failed, but continuing...", "warning")
+            # New icons on disk: rebuild the index on the next desktop entry
+            self._icon_index = None
             
             if self.check_cancelled():
                 return False
@@ -7662,6 +8385,46 @@ class AffinityInstallerGUI(QMainWindow):
     
     def _download_and_extract_winmetadata(self, extract_to_dir):
         """Download WinMetadata.tar.xz and extract it to the specified directory"""
+        winmetadata_url = "https://github.com/ryzendew/AffinityOnLinux/releases/download/10.4-Wine-Affinity/WinMetadata.tar.xz"
+        
+        # Extract into a staging folder beside the destination and move the result into
+        # place only once it is complete, so a failed download leaves no half-written tree
+        try:
+            staging_dir = Path(tempfile.mkdtemp(prefix=".winmetadata-", dir=extract_to_dir))
+        except OSError as e:
+            self.log(f"Failed to create staging folder for WinMetadata: {e}", "error")
+            return False
+        try:
+            # tarfile's "r|xz" mode needs the lzma module, which some Python builds lack
+            if importlib.util.find_spec("lzma") is None:
+                if not self._download_and_extract_winmetadata_xz_cli(winmetadata_url, staging_dir):
+                    return False
+            else:
+                # Stream the archive straight through the xz decoder - no temp archive file
+                self.log("Downloading and extracting WinMetadata...", "info")
+                self.update_progress_text("Extracting Windows Metadata...")
+                if not self.download_and_extract_tar(winmetadata_url, staging_dir, "WinMetadata", compression="xz"):
+                    self.log("Failed to download WinMetadata", "error")
+                    return False
+            
+            for entry in staging_dir.iterdir():
+                dest = Path(extract_to_dir) / entry.name
+                if dest.is_dir() and not dest.is_symlink():
+                    self._fast_rmtree(dest)
+                elif dest.exists() or dest.is_symlink():
+                    dest.unlink()
+                os.replace(entry, dest)
+            
+            self.log("WinMetadata downloaded and extracted", "success")
+            return True
+        except Exception as e:
+            self.log(f"Failed to install WinMetadata: {e}", "error")
+            return False
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    def _download_and_extract_winmetadata_xz_cli(self, winmetadata_url, extract_to_dir):
+        """Fallback for Pythons built without lzma: download to disk and decompress with xz"""
         try:
             # Create temp directory for download
             temp_dir = Path(self.directory) / ".temp_winmetadata"
@@ -7669,37 +8432,28 @@ class AffinityInstallerGUI(QMainWindow):
                 shutil.rmtree(temp_dir)
             temp_dir.mkdir(exist_ok=True)
             
-            winmetadata_url = "https://github.com/ryzendew/AffinityOnLinux/releases/download/10.4-Wine-Affinity/WinMetadata.tar.xz"
             winmetadata_file = temp_dir / "WinMetadata.tar.xz"
             
             self.log("Downloading WinMetadata...", "info")
-            if not self.download_file(winmetadata_url, str(winmetadata_file), "WinMetadata"):
+            if not self.download_file(winmetadata_url, str(winmetadata_file), "WinMetadata", large=True):
                 self.log("Failed to download WinMetadata", "error")
                 return False
             
             self.log("Extracting WinMetadata...", "info")
             self.update_progress_text("Extracting Windows Metadata...")
             
-            # Extract tar.xz file
-            try:
-                import lzma
-                with lzma.open(winmetadata_file, 'rb') as xz_file:
-                    with tarfile.open(fileobj=xz_file, mode='r') as tar:
-                        tar.extractall(extract_to_dir, filter='data')
-            except ImportError:
-                # Fallback to using xz command if lzma module is not available
-                if not self.check_command("xz") and not self.check_command("unxz"):
-                    self.log("xz or unxz is required to extract WinMetadata. Please install xz.", "error")
-                    return False
-                tar_file = winmetadata_file.with_suffix('.tar')
-                xz_cmd = "xz" if self.check_command("xz") else "unxz"
-                success, _, _ = self.run_command([xz_cmd, "-d", "-k", str(winmetadata_file)], check=True)
-                if not success:
-                    self.log("Failed to decompress WinMetadata archive", "error")
-                    return False
-                with tarfile.open(tar_file, "r") as tar:
-                    tar.extractall(extract_to_dir, filter='data')
-                tar_file.unlink()
+            if not self.check_command("xz") and not self.check_command("unxz"):
+                self.log("xz or unxz is required to extract WinMetadata. Please install xz.", "error")
+                return False
+            tar_file = winmetadata_file.with_suffix('.tar')
+            xz_cmd = "xz" if self.check_command("xz") else "unxz"
+            success, _, _ = self.run_command([xz_cmd, "-d", "-k", str(winmetadata_file)], check=True)
+            if not success:
+                self.log("Failed to decompress WinMetadata archive", "error")
+                return False
+            with tarfile.open(tar_file, "r") as tar:
+                tar.extractall(extract_to_dir, filter='data')
+            tar_file.unlink()
             
             # Clean up temp directory
             try:
@@ -7707,7 +8461,6 @@ class AffinityInstallerGUI(QMainWindow):
             except Exception:
                 pass
             
-            self.log("WinMetadata downloaded and extracted", "success")
             return True
         except Exception as e:
             self.log(f"Failed to download and extract WinMetadata: {e}", "error")
@@ -7731,11 +8484,11 @@ class AffinityInstallerGUI(QMainWindow):
     
     def setup_winmetadata(self):
         """Download and install WinMetadata to system32"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Windows Metadata Installation", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
-        system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+        system32_dir = self._system32
         system32_dir.mkdir(parents=True, exist_ok=True)
         
         self.update_progress_text("Downloading Windows Metadata...")
@@ -7745,7 +8498,7 @@ class AffinityInstallerGUI(QMainWindow):
             
             # Remove existing WinMetadata if it exists
             if winmetadata_dest.exists():
-                shutil.rmtree(winmetadata_dest)
+                self._fast_rmtree(winmetadata_dest)
                 self.log("Removed existing WinMetadata folder", "info")
             
             # Download and extract WinMetadata
@@ -7764,9 +8517,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def reinstall_winmetadata(self):
         """Remove old WinMetadata folder and reinstall fresh"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Reinstall WinMetadata", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if Wine is set up
         wine_binary = self.get_wine_path("wine")
@@ -7794,17 +8547,16 @@ class AffinityInstallerGUI(QMainWindow):
         """Reinstall WinMetadata in background thread"""
         # Kill Wine processes
         self.log("Stopping Wine processes...", "info")
-        self.run_command(["wineserver", "-k"], check=False)
-        time.sleep(2)
+        self._stop_wineserver()
         
-        system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+        system32_dir = self._system32
         winmetadata_dir = system32_dir / "WinMetadata"
         
         # Remove existing WinMetadata folder
         if winmetadata_dir.exists():
             self.log("Removing existing WinMetadata folder...", "info")
             try:
-                shutil.rmtree(winmetadata_dir)
+                self._fast_rmtree(winmetadata_dir)
                 self.log("Old WinMetadata folder removed", "success")
             except Exception as e:
                 self.log(f"Warning: Could not fully remove old folder: {e}", "warning")
@@ -7930,8 +8682,7 @@ class AffinityInstallerGUI(QMainWindow):
         Returns:
             str: "winetricks" if installed, None if not found
         """
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         wine = self.get_wine_path("wine")
         
         dxvk_dlls = ["d3d8", "d3d9", "d3d11", "dxgi"]
@@ -7962,8 +8713,7 @@ class AffinityInstallerGUI(QMainWindow):
         """
         self.log("Installing DXVK via winetricks...", "info")
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         env["WINETRICKS_GUI"] = "0"
         env["DISPLAY"] = env.get("DISPLAY", ":0")
         env = self.get_winetricks_env_with_tkg(env)
@@ -7976,7 +8726,7 @@ class AffinityInstallerGUI(QMainWindow):
         
         # Always check for 64-bit DLLs regardless of winetricks success
         # (winetricks may fail but still install 32-bit DLLs, or may fail completely)
-        system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+        system32_dir = self._system32
         dxvk_dll_names = ["d3d8.dll", "d3d9.dll", "d3d10.dll", "d3d10_1.dll", "d3d10core.dll", "d3d11.dll", "dxgi.dll"]
         missing_64bit = [dll for dll in dxvk_dll_names if not (system32_dir / dll).exists()]
         
@@ -8040,11 +8790,8 @@ class AffinityInstallerGUI(QMainWindow):
         if override_count < len(dxvk_dlls):
             self.log("Setting up DLL overrides for DXVK...", "info")
             reg_file = Path(self.directory) / "dxvk_overrides.reg"
-            with open(reg_file, "w") as f:
-                f.write("REGEDIT4\n")
-                f.write("[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n")
-                for dll in dxvk_dlls:
-                    f.write(f'"{dll}"="native,builtin"\n')
+            overrides = "".join(f'"{dll}"="native,builtin"\n' for dll in dxvk_dlls)
+            reg_file.write_text(f"REGEDIT4\n[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n{overrides}")
             
             regedit = self.get_wine_path("regedit")
             reg_success, _, stderr = self.run_command([str(regedit), str(reg_file)], check=False, env=env, capture=True)
@@ -8167,20 +8914,149 @@ class AffinityInstallerGUI(QMainWindow):
         # Set up DLL overrides
         self.setup_d3d12_overrides()
     
+    def _wineserver_socket_paths(self):
+        """Candidate locations of the wineserver socket for this prefix.
+        
+        Wine names the server directory after the prefix's device and inode,
+        under /tmp/.wine-<uid> (and the runtime dir on some builds).
+        """
+        try:
+            st = os.stat(self._prefix)
+        except OSError:
+            return []
+        server_dir = f"server-{st.st_dev:x}-{st.st_ino:x}"
+        uid = os.getuid()
+        return [
+            Path(f"/tmp/.wine-{uid}") / server_dir / "socket",
+            Path(f"/run/user/{uid}/wine") / server_dir / "socket",
+        ]
+    
+    def _wineserver_running(self):
+        """Return True if a wineserver is currently serving this prefix"""
+        return any(path.exists() for path in self._wineserver_socket_paths())
+    
+    def _wait_wineserver_dead(self, timeout=2.0):
+        """Wait until this prefix's wineserver socket disappears (at most `timeout` seconds).
+        
+        wineserver -k returns before the server has exited; the socket normally goes
+        away within a few tens of milliseconds. Returns True if the server is gone.
+        """
+        deadline = time.monotonic() + timeout
+        while self._wineserver_running():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+    
+    def _stop_wineserver(self):
+        """Kill the wineserver for this prefix and wait for it to exit.
+        
+        Returns True once no server is left; skips spawning wineserver -k when
+        none is running in the first place.
+        """
+        if not self._wineserver_running():
+            return True
+        env = self._wine_env()
+        self.run_command(["wineserver", "-k"], check=False, env=env)
+        return self._wait_wineserver_dead()
+    
+    def _read_reg_dword(self, key, name, hive="user.reg", busy=None):
+        """Read a REG_DWORD straight from a prefix hive file: user.reg for HKCU keys,
+        system.reg for HKLM keys (key given relative to the hive root).
+        
+        Returns `busy` if the prefix is in use by a wineserver (the file may be stale),
+        so callers that must tell that apart from a missing value pass REG_HIVE_BUSY.
+        Returns None if the key/value is not present.
+        """
+        if self._wineserver_running():
+            return busy
+        try:
+            lines = (self._prefix / hive).read_text(encoding="utf-8").split("\n")
+        except (OSError, UnicodeDecodeError):
+            return None
+        # Registry key names are case-insensitive, and installers do not agree on case
+        header = "[" + key.replace("\\", "\\\\").lower() + "]"
+        prefix = f'"{name}"=dword:'
+        in_section = False
+        for line in lines:
+            if line.startswith("["):
+                lowered = line.lower()
+                in_section = lowered == header or lowered.startswith(header + " ")
+            elif in_section and line.startswith(prefix):
+                try:
+                    return int(line[len(prefix):].strip(), 16)
+                except ValueError:
+                    return None
+        return None
+    
+    def _patch_user_reg_direct(self, key, values):
+        """Set string values under an HKCU key by rewriting <prefix>/user.reg in place.
+        
+        Only safe while no wineserver owns the prefix (it would overwrite the file
+        with its in-memory copy on exit), so callers fall back to regedit otherwise.
+        Returns True if the file was updated.
+        """
+        user_reg = self._prefix / "user.reg"
+        if self._wineserver_running():
+            return False
+        try:
+            lines = user_reg.read_text(encoding="utf-8").split("\n")
+        except (OSError, UnicodeDecodeError):
+            return False
+        
+        # Keys are stored with doubled backslashes, followed by a modification timestamp
+        header = "[" + key.replace("\\", "\\\\") + "]"
+        new_lines = {f'"{name}"': f'"{name}"="{value}"' for name, value in values.items()}
+        
+        start = next((i for i, line in enumerate(lines) if line == header or line.startswith(header + " ")), None)
+        if start is None:
+            # Key missing - append a new section at the end of the file
+            while lines and lines[-1] == "":
+                lines.pop()
+            lines += ["", f"{header} {int(time.time())}", *new_lines.values(), ""]
+        else:
+            end = start + 1
+            while end < len(lines) and lines[end] != "":
+                end += 1
+            section = lines[start + 1:end]
+            for name, line in new_lines.items():
+                index = next((i for i, existing in enumerate(section) if existing.startswith(name + "=")), None)
+                if index is None:
+                    section.append(line)
+                else:
+                    section[index] = line
+            lines[start + 1:end] = section
+        
+        tmp_reg = user_reg.with_name(f"user.reg.{os.getpid()}.tmp")
+        try:
+            tmp_reg.write_text("\n".join(lines), encoding="utf-8")
+            shutil.copymode(user_reg, tmp_reg)
+            # A concurrent wine probe may have started a server while we were editing;
+            # then leave the file alone and let the caller go through regedit
+            if self._wineserver_running():
+                tmp_reg.unlink()
+                return False
+            os.replace(tmp_reg, user_reg)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_reg.unlink()
+            return False
+        return True
+    
     def setup_d3d12_overrides(self):
         """Set up DLL overrides for d3d12.dll and d3d12core.dll"""
         self.log("Setting up DLL overrides for d3d12...", "info")
         
+        # With no wineserver running, edit user.reg directly and skip the regedit start-up
+        if self._patch_user_reg_direct("Software\\Wine\\DllOverrides", D3D12_OVERRIDES):
+            self.log("DLL overrides configured for d3d12", "success")
+            return
+        
         reg_file = Path(self.directory) / "dll_overrides.reg"
-        with open(reg_file, "w") as f:
-            f.write("REGEDIT4\n")
-            f.write("[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n")
-            f.write('"d3d12"="native"\n')
-            f.write('"d3d12core"="native"\n')
+        reg_file.write_text(D3D12_OVERRIDES_REG)
         
         regedit = self.get_wine_path("regedit")
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         success, _, stderr = self.run_command([str(regedit), str(reg_file)], check=False, env=env, capture=True)
         reg_file.unlink()
@@ -8199,8 +9075,7 @@ class AffinityInstallerGUI(QMainWindow):
         """
         self.log("Verifying DXVK installation via winetricks...", "info")
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         env["WINETRICKS_GUI"] = "0"
         env["DISPLAY"] = env.get("DISPLAY", ":0")
         env = self.get_winetricks_env_with_tkg(env)
@@ -8231,8 +9106,7 @@ class AffinityInstallerGUI(QMainWindow):
         """Remove DXVK via winetricks and clean up DLL overrides"""
         self.log("Removing DXVK via winetricks...", "info")
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         env["WINETRICKS_GUI"] = "0"
         env["DISPLAY"] = env.get("DISPLAY", ":0")
         env = self.get_winetricks_env_with_tkg(env)
@@ -8271,7 +9145,7 @@ class AffinityInstallerGUI(QMainWindow):
         """Remove DXVK DLLs from system32 directory"""
         self.log("Removing DXVK DLLs from system32...", "info")
         
-        system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+        system32_dir = self._system32
         dxvk_dlls = ["d3d8.dll", "d3d9.dll", "d3d10core.dll", "d3d11.dll", "dxgi.dll"]
         removed_count = 0
         
@@ -8295,8 +9169,7 @@ class AffinityInstallerGUI(QMainWindow):
         self.log("Removing DLL overrides for vkd3d...", "info")
         
         wine = self.get_wine_path("wine")
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         vkd3d_dlls = ["d3d12", "d3d12core"]
         removed_count = 0
@@ -8327,9 +9200,9 @@ class AffinityInstallerGUI(QMainWindow):
                 self.install_d3d12_dlls()
                 return
         
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("OpenCL Support Setup", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Get latest version or use default
         latest_version = self.get_latest_vkd3d_version()
@@ -8397,9 +9270,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def configure_wine(self):
         """Configure Wine with winetricks"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Wine Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Ensure wine-tkg is available for winetricks
         self.log("Setting up wine-tkg for winetricks...", "info")
@@ -8414,8 +9287,7 @@ class AffinityInstallerGUI(QMainWindow):
             sys.stderr.flush()
             self.log(error_msg, "warning")
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         # Prevent winetricks from showing GUI dialogs
         env["WINETRICKS_GUI"] = "0"
         env["DISPLAY"] = env.get("DISPLAY", ":0")  # Ensure display is set but winetricks won't use GUI
@@ -8486,9 +9358,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def setup_wine_environment(self):
         """Setup Wine environment only"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Setup Wine Environment", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Ask user to choose Wine version
         wine_version = self.show_question_dialog(
@@ -8571,7 +9443,7 @@ class AffinityInstallerGUI(QMainWindow):
         
         # Download Wine binary
         self.log(f"Caching {config['wine_display_name']}...", "info")
-        if not self.download_file(config["wine_url"], str(wine_file), f"{config['wine_display_name']} binaries"):
+        if not self.download_file(config["wine_url"], str(wine_file), f"{config['wine_display_name']} binaries", large=True):
             self.log(f"Failed to cache {config['wine_display_name']}", "warning")
             return False
         
@@ -8638,9 +9510,9 @@ class AffinityInstallerGUI(QMainWindow):
         
         all_versions = ["9.14", "10.10"]
         
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Caching All Wine Versions", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         self.log("Downloading all Wine versions to cache for future switching...", "info")
         self.log("This helps users with capped internet by avoiding re-downloads.\n", "info")
         
@@ -8681,8 +9553,7 @@ class AffinityInstallerGUI(QMainWindow):
             self.log("Checking DXVK and vkd3d-proton status...", "info")
             
             # Check if DXVK is installed via winetricks
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             wine = self.get_wine_path("wine")
             
             dxvk_installed = False
@@ -8801,7 +9672,7 @@ class AffinityInstallerGUI(QMainWindow):
                 self.update_progress_text(f"Downloading {wine_display_name}...")
                 self.update_progress(0.4)
                 self.log(f"Downloading {wine_display_name}...", "info")
-                if not self.download_file(wine_url, str(wine_file), f"{wine_display_name} binaries"):
+                if not self.download_file(wine_url, str(wine_file), f"{wine_display_name} binaries", large=True):
                     self.log(f"Failed to download {wine_display_name}", "error")
                     return False
                 
@@ -8885,9 +9756,9 @@ class AffinityInstallerGUI(QMainWindow):
     
     def switch_wine_version(self):
         """Switch to a different Wine version - removes current and installs new one"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Switch Wine Version", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if Wine is installed
         wine_dir = self.get_wine_dir()
@@ -8950,9 +9821,9 @@ class AffinityInstallerGUI(QMainWindow):
             if self.check_cancelled():
                 return False
             
-            self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            self.log(LOG_RULE_OPEN)
             self.log("Switching Wine Version", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+            self.log(LOG_RULE_CLOSE)
             
             # Step 1: Stop Wine processes
             self.update_progress_text("Stopping Wine processes...")
@@ -8970,6 +9841,7 @@ class AffinityInstallerGUI(QMainWindow):
                 self.update_progress_text("Removing current Wine installation...")
                 self.update_progress(0.2)
                 self.log(f"Removing current Wine installation: {wine_dir}", "info")
+                self._wine_verified = False
                 try:
                     if wine_dir.is_symlink():
                         wine_dir.unlink()
@@ -9006,9 +9878,9 @@ class AffinityInstallerGUI(QMainWindow):
                 self.log(f"Failed to install Wine version: {wine_version}", "error")
             
             if success:
-                self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log("Wine version switched successfully!", "success")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 self.update_progress_text("Wine version switched")
                 self.update_progress(1.0)
                 
@@ -9016,9 +9888,9 @@ class AffinityInstallerGUI(QMainWindow):
                 from PyQt6.QtCore import QTimer
                 QTimer.singleShot(500, self.check_installation_status)
             else:
-                self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log("Failed to switch Wine version", "error")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 self.update_progress_text("Failed to switch Wine version")
             
             self.end_operation()
@@ -9036,14 +9908,14 @@ class AffinityInstallerGUI(QMainWindow):
     
     def install_system_dependencies(self):
         """Install system dependencies"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Installing System Dependencies", "info")
         
         # Start operation and check for cancellation
         self.start_operation("Installing System Dependencies")
         if self.check_cancelled():
             return
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         threading.Thread(target=self._install_system_deps, daemon=True).start()
     
@@ -9110,9 +9982,9 @@ Would you like to continue with {distro_name} anyway?"""
     
     def install_winetricks_dependencies(self):
         """Install winetricks dependencies"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Installing Winetricks Dependencies", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Start operation and check for cancellation
         self.start_operation("Installing Winetricks Dependencies")
@@ -9140,8 +10012,7 @@ Would you like to continue with {distro_name} anyway?"""
             if not self.ensure_wine_tkg():
                 self.log("Failed to setup wine-tkg, continuing with system wine", "warning")
                 
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             # Prevent winetricks from showing GUI dialogs
             env["WINETRICKS_GUI"] = "0"
             env["DISPLAY"] = env.get("DISPLAY", ":0")  # Ensure display is set but winetricks won't use GUI
@@ -9270,9 +10141,9 @@ Would you like to continue with {distro_name} anyway?"""
     
     def install_affinity_settings(self):
         """Install Affinity v3 (Unified) settings files to enable settings saving"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Fix Settings (Affinity v3 only)", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         self.log("Note: This fix applies only to Affinity v3 (Unified).", "info")
         
         # Check if Wine is set up
@@ -9291,277 +10162,42 @@ Would you like to continue with {distro_name} anyway?"""
         self.start_operation("Install Affinity v3 Settings")
         threading.Thread(target=self._install_affinity_settings_entry, daemon=True).start()
     
-    def _install_affinity_settings_thread(self):
-        """Install Affinity v3 (Unified) settings in background thread - downloads repo and copies Settings"""
-        # Determine Windows username
-        # Wine typically uses "Public" as the default username, but check for existing users
-        users_dir = Path(self.directory) / "drive_c" / "users"
-        username = "Public"  # Default Wine username
-        
-        # Check if users directory exists and has other users
-        if users_dir.exists():
-            # Look for existing user directories (excluding Public, Default, etc.)
-            existing_users = [d.name for d in users_dir.iterdir() if d.is_dir() and d.name not in ["Public", "Default", "All Users", "Default User"]]
-            if existing_users:
-                # Use the first existing user, or fall back to Public
-                username = existing_users[0]
-                self.log(f"Using existing Windows user: {username}", "info")
-            else:
-                self.log(f"Using default Windows user: {username}", "info")
-        else:
-            self.log(f"Creating users directory structure for: {username}", "info")
-            users_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create temp directory for cloning/downloading
-        temp_dir = Path(self.directory) / ".temp_settings"
-        if temp_dir.exists():
-            self.log("Cleaning up existing temp directory...", "info")
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                self.log(f"Warning: Could not remove existing temp dir: {e}", "warning")
-        temp_dir.mkdir(exist_ok=True)
-        
-        # Download the repository as a zip file
-        self.update_progress_text("Downloading Settings from repository...")
-        self.update_progress(0.1)
-        self.log("Downloading Settings from GitHub repository...", "info")
-        repo_zip = temp_dir / "AffinityOnLinux.zip"
-        repo_url = "https://github.com/seapear/AffinityOnLinux/archive/refs/heads/main.zip"
-        
-        if not self.download_file(repo_url, str(repo_zip), "Settings repository"):
-            self.log("Failed to download Settings repository", "error")
-            self.log(f"  URL: {repo_url}", "error")
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
-            return
-        
-        # Verify the zip file was downloaded
-        if not repo_zip.exists() or repo_zip.stat().st_size == 0:
-            self.log("Downloaded zip file is missing or empty", "error")
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
-            return
-        
-        self.log(f"Downloaded zip file size: {repo_zip.stat().st_size / 1024 / 1024:.2f} MB", "info")
-        
-        # Extract the zip file
-        self.update_progress_text("Extracting Settings repository...")
-        self.update_progress(0.3)
-        self.log("Extracting Settings repository...", "info")
+    def _winetricks_verbs(self):
+        """Verbs recorded in <prefix>/winetricks.log, re-read only when the log changes"""
+        log_path = self._prefix / "winetricks.log"
         try:
-            if self.check_command("7z"):
-                success, stdout, stderr = self.run_command([
-                    "7z", "x", str(repo_zip), f"-o{temp_dir}", "-y"
-                ])
-                if not success:
-                    self.log(f"7z extraction failed: {stderr}", "error")
-                    raise Exception("7z extraction failed")
-                self.log("Extraction completed with 7z", "success")
-            elif self.check_command("unzip"):
-                with zipfile.ZipFile(repo_zip, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                self.log("Extraction completed with unzip", "success")
-            else:
-                self.log("Neither 7z nor unzip available for extraction", "error")
-                self.log("Please install 7z or unzip to extract the repository", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            # Find the extracted directory (usually AffinityOnLinux-main)
-            extracted_dirs = list(temp_dir.glob("AffinityOnLinux-*"))
-            self.log(f"Found {len(extracted_dirs)} extracted director{'y' if len(extracted_dirs) == 1 else 'ies'}", "info")
-            
-            extracted_dir = extracted_dirs[0] if extracted_dirs else None
-            if not extracted_dir:
-                self.log("Could not find extracted repository directory", "error")
-                self.log(f"Contents of temp_dir: {[d.name for d in temp_dir.iterdir()]}", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            self.log(f"Using extracted directory: {extracted_dir.name}", "info")
-            
-            # Check if Auxiliary directory exists
-            auxiliary_dir = extracted_dir / "Auxiliary"
-            if not auxiliary_dir.exists():
-                self.log("Auxiliary directory not found in repository", "error")
-                self.log(f"Contents of extracted directory: {[d.name for d in extracted_dir.iterdir()]}", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            settings_dir = auxiliary_dir / "Settings"
-            if not settings_dir.exists():
-                self.log("Settings directory not found in Auxiliary", "error")
-                self.log(f"Contents of Auxiliary: {[d.name for d in auxiliary_dir.iterdir()]}", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            # List what's in the Settings directory
-            settings_contents = [d.name for d in settings_dir.iterdir() if d.is_dir()]
-            self.log(f"Found Settings folders: {settings_contents}", "info")
-            
-            # Source Settings directory path - For Affinity v3 (Unified), use 3.0
-            # $APP would be "Affinity" and version is 3.0
-            # So the source should be: Auxiliary/Settings/Affinity/3.0/Settings
-            self.update_progress_text("Locating Settings files...")
-            self.update_progress(0.5)
-            settings_source_dirs = [
-                settings_dir / "Affinity" / "3.0" / "Settings",  # Affinity v3 uses 3.0
-                settings_dir / "Affinity" / "Settings",
-                settings_dir / "Unified" / "3.0" / "Settings",
-                settings_dir / "Unified" / "Settings",
-            ]
-            
-            settings_source = None
-            for source_dir in settings_source_dirs:
-                if source_dir.exists():
-                    files = list(source_dir.iterdir())
-                    if files:
-                        settings_source = source_dir
-                        self.log(f"Found settings at: {source_dir.relative_to(extracted_dir)}", "success")
-                        self.log(f"  Contains {len(files)} file(s)/folder(s)", "info")
-                        break
-            
-            if not settings_source:
-                self.log("Settings directory not found in repository", "error")
-                self.log("Tried paths:", "error")
-                for path in settings_source_dirs:
-                    self.log(f"  - {path.relative_to(extracted_dir)}: {'exists' if path.exists() else 'not found'}", "error")
-                
-                # List what's actually in Settings/Affinity if it exists
-                affinity_settings = settings_dir / "Affinity"
-                if affinity_settings.exists():
-                    self.log(f"Contents of Settings/Affinity: {[d.name for d in affinity_settings.iterdir()]}", "info")
-                
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            # Target directory in Wine prefix
-            # Based on Settings.md: mv $APP/3.0/Settings drive_c/users/$USERNAME/AppData/Roaming/Affinity/
-            # For Affinity v3, this means: Affinity/3.0/Settings -> AppData/Roaming/Affinity/Affinity/3.0/Settings
-            affinity_appdata = users_dir / username / "AppData" / "Roaming" / "Affinity"
+            mtime = log_path.stat().st_mtime_ns
+        except OSError:
+            return frozenset()
+        cached = self._winetricks_log_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            verbs = frozenset(line.strip() for line in log_path.read_text(encoding="utf-8", errors="replace").splitlines())
+        except OSError:
+            return frozenset()
+        self._winetricks_log_cache = (mtime, verbs)
+        return verbs
+    
+    def _check_winetricks_component(self, component, wine, env):
+        """Check if a winetricks component is installed"""
+        try:
+            # Anything winetricks itself recorded as installed needs no further probing
+            if component in self._winetricks_verbs():
+                return True
             
-            # Check what version folder Affinity v3 actually uses by looking at existing structure
-            affinity_dir = affinity_appdata / "Affinity"
-            version_folder = None
-            if affinity_dir.exists():
-                existing_versions = [d.name for d in affinity_dir.iterdir() if d.is_dir()]
-                if existing_versions:
-                    # Prefer 3.0 for Affinity v3
-                    if "3.0" in existing_versions:
-                        version_folder = "3.0"
-                    elif "2.0" in existing_versions:
-                        version_folder = "2.0"
-                    else:
-                        # Use the first one found (sorted)
-                        version_folder = sorted(existing_versions)[0]
-                    self.log(f"Found existing Affinity version folder: {version_folder}", "info")
+            # The .NET registry checks read system.reg directly instead of spawning wine,
+            # unless a wineserver owns the prefix (then the file may be stale and the
+            # wine reg query below gives the real answer)
+            if component == "dotnet48":
+                release = self._read_reg_dword("Software\\Microsoft\\NET Framework Setup\\NDP\\v4\\Full", "Release", hive="system.reg", busy=REG_HIVE_BUSY)
+                if release is not REG_HIVE_BUSY:
+                    return release is not None and release >= 528040
+            elif component in ("dotnet35sp1", "dotnet35"):
+                install = self._read_reg_dword("Software\\Microsoft\\NET Framework Setup\\NDP\\v3.5", "Install", hive="system.reg", busy=REG_HIVE_BUSY)
+                if install is not REG_HIVE_BUSY:
+                    return install is not None
             
-            # If no existing version folder, use 3.0 for Affinity v3
-            if not version_folder:
-                # Try to detect from source path
-                source_parts = settings_source.parts
-                if "3.0" in source_parts:
-                    version_folder = "3.0"
-                elif "2.0" in source_parts:
-                    version_folder = "2.0"
-                else:
-                    version_folder = "3.0"  # Default to 3.0 for Affinity v3
-                self.log(f"Using version folder: {version_folder} (Affinity v3 uses 3.0)", "info")
-            
-            # Target path: AppData/Roaming/Affinity/Affinity/3.0/Settings (for v3)
-            target_dir = affinity_appdata / "Affinity" / version_folder / "Settings"
-            
-            # Remove existing settings if they exist (to force fresh copy)
-            if target_dir.exists():
-                self.log(f"Removing existing settings from: {target_dir}", "info")
-                try:
-                    shutil.rmtree(target_dir)
-                    self.log("Old settings removed", "success")
-                except Exception as e:
-                    self.log(f"Warning: Could not fully remove old settings: {e}", "warning")
-            
-            # Copy settings from source to target
-            self.update_progress_text("Copying Settings files...")
-            self.update_progress(0.7)
-            target_dir.parent.mkdir(parents=True, exist_ok=True)
-            self.log(f"Copying settings from repository to Wine prefix...", "info")
-            self.log(f"  From: {settings_source}", "info")
-            self.log(f"  To: {target_dir}", "info")
-            
-            # Copy with metadata preservation
-            shutil.copytree(settings_source, target_dir, dirs_exist_ok=True)
-            self.update_progress(0.9)
-            self.log(f"Settings copied successfully to: {target_dir}", "success")
-            
-            # Verify the copy
-            copied_files = list(target_dir.rglob("*"))
-            source_files = list(settings_source.rglob("*"))
-            self.log(f"Copied {len(copied_files)} file(s)/folder(s) (source had {len(source_files)})", "success")
-            
-            # List some of the copied files for verification
-            xml_files = list(target_dir.rglob("*.xml"))
-            if xml_files:
-                self.log(f"Found {len(xml_files)} XML file(s) in settings", "info")
-                for xml_file in xml_files[:5]:  # Show first 5
-                    self.log(f"  - {xml_file.relative_to(target_dir)}", "info")
-            
-            # Set permissions (make sure files are readable)
-            try:
-                for root, dirs, files in os.walk(target_dir):
-                    for d in dirs:
-                        os.chmod(os.path.join(root, d), 0o755)
-                    for f in files:
-                        os.chmod(os.path.join(root, f), 0o644)
-                self.log("File permissions set correctly", "success")
-            except Exception as e:
-                self.log(f"Note: Could not set permissions: {e}", "warning")
-            
-            # Clean up temp files
-            try:
-                shutil.rmtree(temp_dir)
-                self.log("Temp files cleaned up", "info")
-            except Exception as e:
-                self.log(f"Note: Could not clean up temp files: {e}", "warning")
-            
-            self.update_progress(1.0)
-            self.update_progress_text("Settings installation complete!")
-            self.log("\n✓ Affinity v3 settings installation completed!", "success")
-            self.log("Settings files have been installed for Affinity v3 (Unified).", "info")
-            
-        except Exception as e:
-            import traceback
-            self.log(f"Error installing settings: {e}", "error")
-            self.log(f"Traceback: {traceback.format_exc()}", "error")
-            # Clean up on error
-            try:
-                shutil.rmtree(temp_dir)
-                repo_zip.unlink(missing_ok=True)
-            except:
-                pass
-    
-    def _check_winetricks_component(self, component, wine, env):
-        """Check if a winetricks component is installed"""
-        try:
             # Different checks for different components
             if component == "dotnet35sp1" or component == "dotnet35":
                 # Check for .NET 3.5 in registry (dotnet35sp1 installs .NET 3.5 SP1)
@@ -9585,14 +10221,14 @@ Would you like to continue with {distro_name} anyway?"""
                 )
                 if success and stdout:
                     # .NET 4.8 has release number 528040 or higher
-                    match = re.search(r'0x([0-9a-fA-F]+)', stdout)
+                    match = HEX_DWORD_RE.search(stdout)
                     if match:
                         release = int(match.group(1), 16)
                         if release >= 528040:  # .NET 4.8
                             return True
             elif component == "corefonts":
                 # Check if core fonts directory exists
-                fonts_dir = Path(self.directory) / "drive_c" / "windows" / "Fonts"
+                fonts_dir = self._drive_c / "windows" / "Fonts"
                 if fonts_dir.exists():
                     # Check for some common core fonts
                     core_fonts = ["arial.ttf", "times.ttf", "courier.ttf", "tahoma.ttf"]
@@ -9602,27 +10238,27 @@ Would you like to continue with {distro_name} anyway?"""
             elif component == "vcrun2022":
                 # Check for Visual C++ 2022 redistributables
                 vcrun_paths = [
-                    Path(self.directory) / "drive_c" / "windows" / "system32" / "vcruntime140.dll",
-                    Path(self.directory) / "drive_c" / "windows" / "syswow64" / "vcruntime140.dll",
+                    self._system32 / "vcruntime140.dll",
+                    self._syswow64 / "vcruntime140.dll",
                 ]
                 for vcrun_path in vcrun_paths:
                     if vcrun_path.exists():
                         return True
             elif component == "msxml3":
                 # Check for MSXML3
-                msxml3_path = Path(self.directory) / "drive_c" / "windows" / "system32" / "msxml3.dll"
+                msxml3_path = self._system32 / "msxml3.dll"
                 if msxml3_path.exists():
                     return True
             elif component == "msxml6":
                 # Check for MSXML6
-                msxml6_path = Path(self.directory) / "drive_c" / "windows" / "system32" / "msxml6.dll"
+                msxml6_path = self._system32 / "msxml6.dll"
                 if msxml6_path.exists():
                     return True
             elif component == "crypt32":
                 # Check for Cryptographic API 32 (crypt32.dll)
                 crypt32_paths = [
-                    Path(self.directory) / "drive_c" / "windows" / "system32" / "crypt32.dll",
-                    Path(self.directory) / "drive_c" / "windows" / "syswow64" / "crypt32.dll",
+                    self._system32 / "crypt32.dll",
+                    self._syswow64 / "crypt32.dll",
                 ]
                 for crypt32_path in crypt32_paths:
                     if crypt32_path.exists():
@@ -9632,36 +10268,56 @@ Would you like to continue with {distro_name} anyway?"""
         
         return False
     
-    def check_webview2_installed(self):
-        """Check if WebView2 Runtime is already installed (fast check - file paths only)"""
-        # Fast check: only check file paths, skip slow registry query
+    def _webview2_present(self, env=None):
+        """Return where WebView2 Runtime was found (path or "registry"), or None.
+
+        The file check runs first; the slow `wine reg query` only runs when an
+        env is given and the files were not found. Results are cached in
+        self._webview2_cache until an install or uninstall invalidates them.
+        """
+        if self._webview2_cache is not None:
+            return self._webview2_cache or None
+        
         webview2_paths = [
-            Path(self.directory) / "drive_c" / "Program Files (x86)" / "Microsoft" / "EdgeWebView" / "Application",
-            Path(self.directory) / "drive_c" / "Program Files" / "Microsoft" / "EdgeWebView" / "Application",
+            self._drive_c / "Program Files (x86)" / "Microsoft" / "EdgeWebView" / "Application",
+            self._drive_c / "Program Files" / "Microsoft" / "EdgeWebView" / "Application",
         ]
-        
         for webview2_path in webview2_paths:
-            if webview2_path.exists():
-                # Check if msedgewebview2.exe exists
-                msedgewebview2_exe = webview2_path / "msedgewebview2.exe"
-                if msedgewebview2_exe.exists():
-                    return True
+            # msedgewebview2.exe existing implies the Application directory exists
+            if (webview2_path / "msedgewebview2.exe").exists():
+                self._webview2_cache = str(webview2_path)
+                return self._webview2_cache
         
-        # If file check fails, do a registry check (only if file check failed)
-        # Skip registry check to make it faster - file check is usually sufficient
-        # Registry check can be slow and may hang, so we skip it for speed
-        return False
+        # Fast callers skip the registry query - it can be slow and may hang
+        if env is None:
+            return None
         
-        return False
+        try:
+            # Only the exit status matters: skip capturing and decoding the key dump
+            success, _, _ = self.run_command(
+                ["wine", "reg", "query", "HKEY_LOCAL_MACHINE\\SOFTWARE\\WOW6432Node\\Microsoft\\EdgeUpdate\\Clients\\{F3017226-FE2A-4295-8BDF-00C3A9A7E4C5}"],
+                check=False,
+                env=env,
+                capture=False
+            )
+        except Exception:
+            return None
+        # Cache the negative answer too ("" is falsy but not None)
+        self._webview2_cache = "registry" if success else ""
+        return self._webview2_cache or None
+    
+    def check_webview2_installed(self):
+        """Check if WebView2 Runtime is already installed (fast check - file paths only)"""
+        return self._webview2_present() is not None
     
     def install_webview2_runtime(self):
         """Install Microsoft Edge WebView2 Runtime for Affinity v3 (Unified)"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Installing Microsoft Edge WebView2 Runtime (Affinity v3)", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if system Wine is available (WebView2 uses system wine, not patched wine)
-        if not shutil.which("wine"):
+        if not self.which_command("wine"):
             self.log("System Wine is not installed. Please install Wine first.", "error")
             QMessageBox.warning(
                 self,
@@ -9685,21 +10341,59 @@ Would you like to continue with {distro_name} anyway?"""
         finally:
             self.end_operation()
 
+    @contextlib.contextmanager
+    def _wineserver_pinned(self, env, wineserver="wineserver"):
+        """Keep one persistent wineserver running for the prefix while the block runs.
+
+        Consecutive wine/winecfg/regedit calls then attach to the live server
+        instead of each cold-starting one. The persistence is finite, so a
+        `wineserver -w` inside the block still returns once the clients are gone.
+        Only a server started here is killed on exit, so an already running
+        Affinity session is left alone.
+        """
+        started = False
+        if self.check_command(wineserver):
+            try:
+                # wineserver daemonizes; a non-zero exit means one is already running
+                started = subprocess.run(
+                    [wineserver, f"-p{WINESERVER_PIN_SECONDS}"], env=env, timeout=10,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                ).returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                started = False
+        try:
+            yield
+        finally:
+            if started:
+                try:
+                    subprocess.run([wineserver, "-k"], env=env, timeout=10,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+    
+    def _apply_webview2_registry_config(self, regedit, env):
+        """Disable Edge Update and set msedgewebview2.exe to win7 with a single regedit run"""
+        webview2_config_reg = self._prefix / "webview2-config.reg"
+        webview2_config_reg.write_text(WEBVIEW2_CONFIG_REG)
+        
+        try:
+            self.run_command([str(regedit), str(webview2_config_reg)], check=False, env=env)
+        finally:
+            webview2_config_reg.unlink(missing_ok=True)
+    
     def _install_webview2_runtime_thread(self):
         """Install Microsoft Edge WebView2 Runtime in background thread"""
         # Check if system Wine is available (WebView2 uses system wine, not patched wine)
-        if not shutil.which("wine"):
+        if not self.which_command("wine"):
             self.log("System Wine is not installed. Please install Wine first.", "error")
             self.log("You can install Wine using your distribution's package manager.", "info")
             return False
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         # Use system wine tools for WebView2 (not patched wine)
         wine_cfg = "winecfg"
         regedit = "regedit"
-        wine = "wine"
         
         self.log(f"Using system Wine for WebView2 installation (WINEPREFIX={self.directory})", "info")
         
@@ -9707,65 +10401,22 @@ Would you like to continue with {distro_name} anyway?"""
         self.log("Checking if WebView2 Runtime is already installed...", "info")
         webview2_installed = False
         
-        # Check for WebView2 installation directory
-        webview2_paths = [
-            Path(self.directory) / "drive_c" / "Program Files (x86)" / "Microsoft" / "EdgeWebView" / "Application",
-            Path(self.directory) / "drive_c" / "Program Files" / "Microsoft" / "EdgeWebView" / "Application",
-        ]
-        
-        for webview2_path in webview2_paths:
-            if webview2_path.exists():
-                # Check if msedgewebview2.exe exists
-                msedgewebview2_exe = webview2_path / "msedgewebview2.exe"
-                if msedgewebview2_exe.exists():
-                    webview2_installed = True
-                    self.log(f"WebView2 Runtime found at: {webview2_path}", "success")
-                    break
-        
-        # Also check registry for WebView2 installation
-        if not webview2_installed:
-            try:
-                success, stdout, _ = self.run_command(
-                    [str(wine), "reg", "query", "HKEY_LOCAL_MACHINE\\SOFTWARE\\WOW6432Node\\Microsoft\\EdgeUpdate\\Clients\\{F3017226-FE2A-4295-8BDF-00C3A9A7E4C5}"],
-                    check=False,
-                    env=env,
-                    capture=True
-                )
-                if success:
-                    webview2_installed = True
-                    self.log("WebView2 Runtime found in registry", "success")
-            except Exception:
-                pass
+        webview2_location = self._webview2_present(env)
+        if webview2_location == "registry":
+            webview2_installed = True
+            self.log("WebView2 Runtime found in registry", "success")
+        elif webview2_location:
+            webview2_installed = True
+            self.log(f"WebView2 Runtime found at: {webview2_location}", "success")
         
         if webview2_installed:
             self.log("WebView2 Runtime is already installed. Skipping installation.", "info")
             self.log("Verifying configuration...", "info")
             
             # Still configure the compatibility settings even if already installed
-            # Step 1: Disable Microsoft Edge Update services (if not already done)
-            self.log("Ensuring Edge Update services are disabled...", "info")
-            disable_edge_update_reg = Path(self.directory) / "disable-edge-update.reg"
-            with open(disable_edge_update_reg, "w") as f:
-                f.write("Windows Registry Editor Version 5.00\n\n")
-                f.write("[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdate]\n")
-                f.write("\"Start\"=dword:00000004\n\n")
-                f.write("[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdatem]\n")
-                f.write("\"Start\"=dword:00000004\n")
-            
-            self.run_command([str(regedit), str(disable_edge_update_reg)], check=False, env=env)
-            disable_edge_update_reg.unlink()
-            
-            # Step 2: Set msedgewebview2.exe to Windows 7 compatibility (if not already set)
-            self.log("Ensuring msedgewebview2.exe Windows 7 compatibility is set...", "info")
-            webview2_win7_reg = Path(self.directory) / "webview2-win7-cap.reg"
-            with open(webview2_win7_reg, "w") as f:
-                f.write("Windows Registry Editor Version 5.00\n\n")
-                f.write("[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults]\n\n")
-                f.write("[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults\\msedgewebview2.exe]\n")
-                f.write("\"Version\"=\"win7\"\n")
-            
-            self.run_command([str(regedit), str(webview2_win7_reg)], check=False, env=env)
-            webview2_win7_reg.unlink()
+            # Disable Edge Update services and set msedgewebview2.exe to Windows 7 (if not already done)
+            self.log("Ensuring Edge Update is disabled and msedgewebview2.exe Windows 7 compatibility is set...", "info")
+            self._apply_webview2_registry_config(regedit, env)
             
             self.log("\n✓ WebView2 Runtime configuration verified!", "success")
             self.log("WebView2 Runtime is installed and configured correctly.", "info")
@@ -9774,85 +10425,244 @@ Would you like to continue with {distro_name} anyway?"""
         # WebView2 not found, proceed with installation
         self.log("WebView2 Runtime not found. Proceeding with installation...", "info")
         
+        # One persistent wineserver for winecfg, the installer and regedit below
+        with self._wineserver_pinned(env):
+            # Only the WebView2 installer can move the prefix away from win11 after step 1,
+            # so failures before it need no restore
+            restore_winver = False
+            try:
+                # Step 1: Set Windows 11 compatibility mode
+                self.log("Setting Windows 11 compatibility mode...", "info")
+                self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
+                self.log("Windows 11 compatibility mode set", "success")
+                
+                # Step 2: Download Microsoft Edge WebView2 Runtime
+                self.log("Downloading Microsoft Edge WebView2 Runtime...", "info")
+                webview2_url = "https://github.com/ryzendew/AffinityOnLinux/releases/download/10.4-Wine-Affinity/MicrosoftEdgeWebView2RuntimeInstallerX64.exe"
+                webview2_file = self._prefix / "MicrosoftEdgeWebView2RuntimeInstallerX64.exe"
+                
+                if not self.download_file(webview2_url, str(webview2_file), "WebView2 Runtime", large=True):
+                    self.log("Failed to download WebView2 Runtime", "error")
+                    return False
+                
+                self.log("WebView2 Runtime downloaded", "success")
+                
+                # Step 3: Install WebView2 Runtime using system wine (like Affinity v3)
+                self.log("Installing Microsoft Edge WebView2 Runtime...", "info")
+                self.log("This may take a few minutes...", "info")
+                self.log("Using system Wine for WebView2 installation", "info")
+                env["WINEDEBUG"] = "-all"
+                
+                # Use system wine for WebView2 installer (like Affinity v3)
+                # Use the installer capture method which has better timeout handling
+                restore_winver = True
+                success = self._run_installer_and_capture(webview2_file, env, label="WebView2 installer")
+                self._webview2_cache = None
+                if not success:
+                    self.log("WebView2 installer may have completed despite non-zero exit code", "warning")
+                
+                # Wait a moment for files to be written
+                time.sleep(3)
+                self.log("WebView2 Runtime installation completed", "success")
+                
+                # Step 4: Disable Microsoft Edge Update services and set msedgewebview2.exe to Windows 7
+                self.log("Disabling Edge Update services and setting msedgewebview2.exe to Windows 7 compatibility...", "info")
+                self._apply_webview2_registry_config(regedit, env)
+                self.log("Edge Update services disabled", "success")
+                self.log("msedgewebview2.exe Windows 7 compatibility set", "success")
+                
+                # Clean up installer file
+                if webview2_file.exists():
+                    webview2_file.unlink()
+                    self.log("WebView2 installer file removed", "success")
+                
+                self.log("\n✓ Microsoft Edge WebView2 Runtime installation completed!", "success")
+                self.log("WebView2 Runtime has been installed for Affinity v3.", "info")
+                self.log("Help > View Help should now work in Affinity v3.", "info")
+                return True
+                
+            except Exception as e:
+                if not self.check_cancelled():
+                    self.log(f"Error installing WebView2 Runtime: {e}", "error")
+                # Try to restore Windows 11 compatibility even if something failed
+                if restore_winver:
+                    try:
+                        self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
+                    except:
+                        pass
+                return False
+    
+    def _fast_rmtree(self, path):
+        """Delete a large tree (e.g. WinMetadata) with `rm -rf`, falling back to shutil.rmtree"""
+        if self.check_command("rm"):
+            result = subprocess.run(["rm", "-rf", "--", str(path)], check=False,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode == 0:
+                return
+        # shutil.rmtree walks with dir fds and unlinkat on Linux, so it is the right fallback;
+        # it also raises a useful error if rm could not delete everything
+        shutil.rmtree(path)
+    
+    def _parallel_rmtree(self, path):
+        """Delete a whole tree (e.g. the prefix) by removing its top-level subtrees concurrently.
+        
+        Deletion is dominated by unlink/rmdir latency rather than CPU, so each child
+        directory goes to self._pool; plain files are unlinked inline. Raises
+        FileNotFoundError if `path` itself does not exist.
+        """
+        futures = []
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    futures.append(self._pool.submit(self._fast_rmtree, entry.path))
+                else:
+                    os.unlink(entry.path)
+        for future in futures:
+            future.result()
+        os.rmdir(path)
+    
+    def _fast_copy(self, src, dst):
+        """Copy a (large) file with an os.sendfile loop, keeping metadata like shutil.copy2"""
+        src_fd = os.open(src, os.O_RDONLY)
         try:
-            # Step 1: Set Windows 11 compatibility mode
-            self.log("Setting Windows 11 compatibility mode...", "info")
-            self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
-            self.log("Windows 11 compatibility mode set", "success")
-            
-            # Step 2: Download Microsoft Edge WebView2 Runtime
-            self.log("Downloading Microsoft Edge WebView2 Runtime...", "info")
-            webview2_url = "https://github.com/ryzendew/AffinityOnLinux/releases/download/10.4-Wine-Affinity/MicrosoftEdgeWebView2RuntimeInstallerX64.exe"
-            webview2_file = Path(self.directory) / "MicrosoftEdgeWebView2RuntimeInstallerX64.exe"
-            
-            if not self.download_file(webview2_url, str(webview2_file), "WebView2 Runtime"):
-                self.log("Failed to download WebView2 Runtime", "error")
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                try:
+                    offset = 0
+                    while True:
+                        sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except OSError as e:
+                    if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EXDEV, errno.ENOTSUP):
+                        raise
+                    # sendfile not usable for this pair of files: plain buffered copy
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+                    with open(src_fd, "rb", closefd=False) as fsrc, open(dst_fd, "wb", closefd=False) as fdst:
+                        shutil.copyfileobj(fsrc, fdst, 256 * 1024)
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        shutil.copystat(src, dst)
+    
+    def _install_file(self, src, dst):
+        """Place a read-only input file at dst as cheaply as the filesystem allows.
+        
+        Tries a hardlink first, then a reflink (FICLONE) across filesystems or where
+        links are refused, and finally a real copy through _fast_copy.
+        """
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+        try:
+            # Imported here so a non-POSIX Python still reaches main()'s "Linux only" message
+            import fcntl
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except (ImportError, OSError):
+            pass
+        self._fast_copy(src, dst)
+    
+    def _stage_installer(self, installer_path, installer_file):
+        """Put the selected installer into the Wine prefix.
+        
+        On the same filesystem (both usually under $HOME) this is just a hardlink,
+        so the later unlink of installer_file only drops the extra name.
+        
+        Returns True if installer_file is a new name the caller may unlink afterwards,
+        False if the selected file already is installer_file (it must then be kept).
+        """
+        installer_file = Path(installer_file)
+        if installer_file.exists():
+            if os.path.samefile(installer_path, installer_file):
                 return False
-            
-            self.log("WebView2 Runtime downloaded", "success")
-            
-            # Step 3: Install WebView2 Runtime using system wine (like Affinity v3)
-            self.log("Installing Microsoft Edge WebView2 Runtime...", "info")
-            self.log("This may take a few minutes...", "info")
-            self.log("Using system Wine for WebView2 installation", "info")
-            env["WINEDEBUG"] = "-all"
-            
-            # Use system wine for WebView2 installer (like Affinity v3)
-            # Use the installer capture method which has better timeout handling
-            success = self._run_installer_and_capture(webview2_file, env, label="WebView2 installer")
-            if not success:
-                self.log("WebView2 installer may have completed despite non-zero exit code", "warning")
-            
-            # Wait a moment for files to be written
-            time.sleep(3)
-            self.log("WebView2 Runtime installation completed", "success")
-            
-            # Step 4: Disable Microsoft Edge Update services
-            self.log("Disabling Microsoft Edge Update services...", "info")
-            disable_edge_update_reg = Path(self.directory) / "disable-edge-update.reg"
-            with open(disable_edge_update_reg, "w") as f:
-                f.write("Windows Registry Editor Version 5.00\n\n")
-                f.write("[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdate]\n")
-                f.write("\"Start\"=dword:00000004\n\n")
-                f.write("[HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\edgeupdatem]\n")
-                f.write("\"Start\"=dword:00000004\n")
-            
-            self.run_command([str(regedit), str(disable_edge_update_reg)], check=False, env=env)
-            disable_edge_update_reg.unlink()
-            self.log("Edge Update services disabled", "success")
-            
-            # Step 5: Set msedgewebview2.exe to Windows 7 compatibility
-            self.log("Setting msedgewebview2.exe to Windows 7 compatibility...", "info")
-            webview2_win7_reg = Path(self.directory) / "webview2-win7-cap.reg"
-            with open(webview2_win7_reg, "w") as f:
-                f.write("Windows Registry Editor Version 5.00\n\n")
-                f.write("[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults]\n\n")
-                f.write("[HKEY_CURRENT_USER\\Software\\Wine\\AppDefaults\\msedgewebview2.exe]\n")
-                f.write("\"Version\"=\"win7\"\n")
-            
-            self.run_command([str(regedit), str(webview2_win7_reg)], check=False, env=env)
-            webview2_win7_reg.unlink()
-            self.log("msedgewebview2.exe Windows 7 compatibility set", "success")
-            
-            # Clean up installer file
-            if webview2_file.exists():
-                webview2_file.unlink()
-                self.log("WebView2 installer file removed", "success")
-            
-            self.log("\n✓ Microsoft Edge WebView2 Runtime installation completed!", "success")
-            self.log("WebView2 Runtime has been installed for Affinity v3.", "info")
-            self.log("Help > View Help should now work in Affinity v3.", "info")
-            return True
-            
-        except Exception as e:
+            installer_file.unlink()
+        self._install_file(installer_path, installer_file)
+        return True
+    
+    def _parallel_copytree(self, src, dst):
+        """Copy a directory tree, creating directories serially and copying files on self._pool.
+
+        Uses plain copyfile (no metadata): shutil.copyfile already does a
+        zero-copy os.sendfile on Linux, so the win here is overlapping the
+        per-file open/create syscalls across workers.
+        """
+        pairs = []
+        for dirpath, dirnames, filenames in os.walk(src):
+            target = os.path.join(dst, os.path.relpath(dirpath, src))
+            os.makedirs(target, exist_ok=True)
+            for name in filenames:
+                pairs.append((os.path.join(dirpath, name), os.path.join(target, name)))
+        
+        futures = [self._pool.submit(shutil.copyfile, s, d) for s, d in pairs]
+        for future in futures:
+            future.result()
+        return len(pairs)
+    
+    def _chmod_tree(self, root, dir_mode=0o755, file_mode=0o644):
+        """Recursively chmod everything below root using per-directory fds (fchmodat)"""
+        if os.chmod not in os.supports_dir_fd or os.scandir not in os.supports_fd:
+            for dirpath, dirs, files in os.walk(root):
+                for d in dirs:
+                    os.chmod(os.path.join(dirpath, d), dir_mode)
+                for f in files:
+                    os.chmod(os.path.join(dirpath, f), file_mode)
+            return
+        
+        def set_mode(entry, mode, dir_fd):
+            # Extracted/checked-out files normally already have the right mode; skipping
+            # the chmod then avoids dirtying every inode (and its hardlinked twin)
+            if entry.stat(follow_symlinks=False).st_mode & 0o7777 != mode:
+                os.chmod(entry.name, mode, dir_fd=dir_fd)
+        
+        def walk(dir_fd):
+            # Names are resolved relative to dir_fd, so the kernel never re-walks the full path
+            with os.scandir(dir_fd) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        set_mode(entry, dir_mode, dir_fd)
+                        sub_fd = os.open(entry.name, os.O_RDONLY | os.O_DIRECTORY, dir_fd=dir_fd)
+                        try:
+                            walk(sub_fd)
+                        finally:
+                            os.close(sub_fd)
+                    elif entry.is_file(follow_symlinks=False):
+                        set_mode(entry, file_mode, dir_fd)
+        
+        root_fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            walk(root_fd)
+        finally:
+            os.close(root_fd)
+    
+    def _sparse_clone_settings(self, clone_dir):
+        """Shallow, blobless, sparse clone of the settings repo limited to Auxiliary/Settings"""
+        if not self.check_command("git"):
+            return False
+        
+        repo_git_url = "https://github.com/seapear/AffinityOnLinux.git"
+        success, _, stderr = self.run_command([
+            "git", "clone", "--depth=1", "--filter=blob:none", "--sparse", "--quiet",
+            repo_git_url, str(clone_dir)
+        ], check=False)
+        if success:
+            success, _, stderr = self.run_command([
+                "git", "-C", str(clone_dir), "sparse-checkout", "set", "Auxiliary/Settings"
+            ], check=False)
+        if not success:
             if not self.check_cancelled():
-                self.log(f"Error installing WebView2 Runtime: {e}", "error")
-            # Try to restore Windows 11 compatibility even if something failed
-            try:
-                self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
-            except:
-                pass
+                self.log(f"Sparse git checkout failed, falling back to archive download: {stderr.strip()[:200]}", "warning")
+            shutil.rmtree(clone_dir, ignore_errors=True)
             return False
+        return True
     
     def _install_affinity_settings_entry(self):
         """Wrapper to install Affinity settings and end the operation when invoked from the button."""
@@ -9861,18 +10671,70 @@ Would you like to continue with {distro_name} anyway?"""
         finally:
             self.end_operation()
 
+    def _discard_tree(self, path):
+        """Rename a directory out of the way and delete it on a daemon thread"""
+        path = Path(path)
+        if ".trash." in path.name:
+            # Already renamed by an earlier call, only the delete is left
+            trash = path
+        else:
+            trash = path.with_name(f"{path.name}.trash.{os.getpid()}.{time.time_ns()}")
+            try:
+                os.rename(path, trash)
+            except FileNotFoundError:
+                return
+            except OSError:
+                shutil.rmtree(path, ignore_errors=True)
+                return
+        threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}, daemon=True).start()
+    
     def _install_affinity_settings_thread(self):
         """Install Affinity v3 (Unified) settings in background thread - downloads repo and copies Settings"""
+        fetch_future = None
         try:
+            # Create temp directory for cloning/downloading
+            temp_dir = self._prefix / ".temp_settings"
+            if temp_dir.exists():
+                self.log("Cleaning up existing temp directory...", "info")
+                try:
+                    self._discard_tree(temp_dir)
+                except Exception as e:
+                    self.log(f"Warning: Could not remove existing temp dir: {e}", "warning")
+            # Trash left behind if a previous run exited before its background delete finished
+            for leftover in temp_dir.parent.glob(f"{temp_dir.name}.trash.*"):
+                self._discard_tree(leftover)
+            temp_dir.mkdir(exist_ok=True)
+            
+            # Fetch only Auxiliary/Settings: sparse git checkout if git is available,
+            # otherwise download the repository tarball and extract it as it streams in
+            self.update_progress_text("Downloading and extracting Settings repository...")
+            self.update_progress(0.1)
+            self.log("Downloading Settings from GitHub repository...", "info")
+            repo_url = "https://github.com/seapear/AffinityOnLinux/archive/refs/heads/main.tar.gz"
+            
+            def fetch_settings():
+                if self._sparse_clone_settings(temp_dir / "AffinityOnLinux-main"):
+                    return "Settings fetched with a sparse git checkout"
+                # Only the Auxiliary/Settings subtree is used; skip writing everything else
+                if self.download_and_extract_tar(repo_url, temp_dir, "Settings repository",
+                                                 member_filter=lambda name: "/Auxiliary/Settings/" in name,
+                                                 contiguous=True):
+                    return "Settings repository downloaded and extracted"
+                return None
+            
+            # The download is independent of the prefix probing below, so let it run meanwhile
+            fetch_future = self._pool.submit(fetch_settings)
+            
             # Determine Windows username
             # Wine typically uses "Public" as the default username, but check for existing users
-            users_dir = Path(self.directory) / "drive_c" / "users"
+            users_dir = self._users_dir
             username = "Public"  # Default Wine username
             
             # Check if users directory exists and has other users
             if users_dir.exists():
                 # Look for existing user directories (excluding Public, Default, etc.)
-                existing_users = [d.name for d in users_dir.iterdir() if d.is_dir() and d.name not in ["Public", "Default", "All Users", "Default User"]]
+                with os.scandir(users_dir) as entries:
+                    existing_users = [e.name for e in entries if e.is_dir() and e.name not in WINE_BUILTIN_USERS]
                 if existing_users:
                     # Use the first existing user, or fall back to Public
                     username = existing_users[0]
@@ -9883,79 +10745,48 @@ Would you like to continue with {distro_name} anyway?"""
                 self.log(f"Creating users directory structure for: {username}", "info")
                 users_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create temp directory for cloning/downloading
-            temp_dir = Path(self.directory) / ".temp_settings"
-            if temp_dir.exists():
-                self.log("Cleaning up existing temp directory...", "info")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception as e:
-                    self.log(f"Warning: Could not remove existing temp dir: {e}", "warning")
-            temp_dir.mkdir(exist_ok=True)
-            
-            # Download the repository as a zip file
-            self.update_progress_text("Downloading Settings from repository...")
-            self.update_progress(0.1)
-            self.log("Downloading Settings from GitHub repository...", "info")
-            repo_zip = temp_dir / "AffinityOnLinux.zip"
-            repo_url = "https://github.com/seapear/AffinityOnLinux/archive/refs/heads/main.zip"
-            
-            if not self.download_file(repo_url, str(repo_zip), "Settings repository"):
-                self.log("Failed to download Settings repository", "error")
-                self.log(f"  URL: {repo_url}", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
-            
-            # Verify the zip file was downloaded
-            if not repo_zip.exists() or repo_zip.stat().st_size == 0:
-                self.log("Downloaded zip file is missing or empty", "error")
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass
-                return
+            # Target directory in Wine prefix
+            # Based on Settings.md: mv $APP/3.0/Settings drive_c/users/$USERNAME/AppData/Roaming/Affinity/
+            # For Affinity v3, this means: Affinity/3.0/Settings -> AppData/Roaming/Affinity/Affinity/3.0/Settings
+            affinity_appdata = users_dir / username / "AppData" / "Roaming" / "Affinity"
             
-            self.log(f"Downloaded zip file size: {repo_zip.stat().st_size / 1024 / 1024:.2f} MB", "info")
+            # Check what version folder Affinity v3 actually uses by looking at existing structure
+            affinity_dir = affinity_appdata / "Affinity"
+            version_folder = None
+            if affinity_dir.exists():
+                existing_versions = [d.name for d in affinity_dir.iterdir() if d.is_dir()]
+                if existing_versions:
+                    # Prefer 3.0 for Affinity v3
+                    if "3.0" in existing_versions:
+                        version_folder = "3.0"
+                    elif "2.0" in existing_versions:
+                        version_folder = "2.0"
+                    else:
+                        # Use the first one found (sorted)
+                        version_folder = sorted(existing_versions)[0]
+                    self.log(f"Found existing Affinity version folder: {version_folder}", "info")
             
-            # Extract the zip file
-            self.update_progress_text("Extracting Settings repository...")
-            self.update_progress(0.3)
-            self.log("Extracting Settings repository...", "info")
             try:
-                if self.check_command("7z"):
-                    success, stdout, stderr = self.run_command([
-                        "7z", "x", str(repo_zip), f"-o{temp_dir}", "-y"
-                    ])
-                    if not success:
-                        self.log(f"7z extraction failed: {stderr}", "error")
-                        raise Exception("7z extraction failed")
-                    self.log("Extraction completed with 7z", "success")
-                elif self.check_command("unzip"):
-                    with zipfile.ZipFile(repo_zip, 'r') as zip_ref:
-                        zip_ref.extractall(temp_dir)
-                    self.log("Extraction completed with unzip", "success")
+                fetch_message = fetch_future.result()
+                if fetch_message:
+                    self.log(fetch_message, "success")
                 else:
-                    self.log("Neither 7z nor unzip available for extraction", "error")
-                    self.log("Please install 7z or unzip to extract the repository", "error")
+                    self.log("Failed to download Settings repository", "error")
+                    self.log(f"  URL: {repo_url}", "error")
                     try:
-                        shutil.rmtree(temp_dir)
+                        self._discard_tree(temp_dir)
                     except Exception:
                         pass
                     return
+                self.update_progress(0.3)
                 
                 # Find the extracted directory (usually AffinityOnLinux-main)
-                extracted_dirs = list(temp_dir.glob("AffinityOnLinux-*"))
-                self.log(f"Found {len(extracted_dirs)} extracted director{'y' if len(extracted_dirs) == 1 else 'ies'}", "info")
-                
-                extracted_dir = extracted_dirs[0] if extracted_dirs else None
+                extracted_dir = next(temp_dir.glob("AffinityOnLinux-*"), None)
                 if not extracted_dir:
                     self.log("Could not find extracted repository directory", "error")
                     self.log(f"Contents of temp_dir: {[d.name for d in temp_dir.iterdir()]}", "error")
                     try:
-                        shutil.rmtree(temp_dir)
+                        self._discard_tree(temp_dir)
                     except Exception:
                         pass
                     return
@@ -9968,7 +10799,7 @@ Would you like to continue with {distro_name} anyway?"""
                     self.log("Auxiliary directory not found in repository", "error")
                     self.log(f"Contents of extracted directory: {[d.name for d in extracted_dir.iterdir()]}", "error")
                     try:
-                        shutil.rmtree(temp_dir)
+                        self._discard_tree(temp_dir)
                     except Exception:
                         pass
                     return
@@ -9978,7 +10809,7 @@ Would you like to continue with {distro_name} anyway?"""
                     self.log("Settings directory not found in Auxiliary", "error")
                     self.log(f"Contents of Auxiliary: {[d.name for d in auxiliary_dir.iterdir()]}", "error")
                     try:
-                        shutil.rmtree(temp_dir)
+                        self._discard_tree(temp_dir)
                     except Exception:
                         pass
                     return
@@ -9999,15 +10830,18 @@ Would you like to continue with {distro_name} anyway?"""
                     settings_dir / "Unified" / "Settings",
                 ]
                 
-                settings_source = None
-                for source_dir in settings_source_dirs:
-                    if source_dir.exists():
-                        files = list(source_dir.iterdir())
-                        if files:
-                            settings_source = source_dir
-                            self.log(f"Found settings at: {source_dir.relative_to(extracted_dir)}", "success")
-                            self.log(f"  Contains {len(files)} file(s)/folder(s)", "info")
-                            break
+                def has_entries(path):
+                    # One opendir per candidate; only need to know it has at least one entry
+                    try:
+                        with os.scandir(path) as entries:
+                            return next(entries, None) is not None
+                    except (FileNotFoundError, NotADirectoryError):
+                        return False
+                
+                # First non-empty candidate wins; later candidates are never touched
+                settings_source = next((d for d in settings_source_dirs if has_entries(d)), None)
+                if settings_source:
+                    self.log(f"Found settings at: {settings_source.relative_to(extracted_dir)}", "success")
                 
                 if not settings_source:
                     self.log("Settings directory not found in repository", "error")
@@ -10021,32 +10855,11 @@ Would you like to continue with {distro_name} anyway?"""
                         self.log(f"Contents of Settings/Affinity: {[d.name for d in affinity_settings.iterdir()]}", "info")
                     
                     try:
-                        shutil.rmtree(temp_dir)
+                        self._discard_tree(temp_dir)
                     except Exception:
                         pass
                     return
                 
-                # Target directory in Wine prefix
-                # Based on Settings.md: mv $APP/3.0/Settings drive_c/users/$USERNAME/AppData/Roaming/Affinity/
-                # For Affinity v3, this means: Affinity/3.0/Settings -> AppData/Roaming/Affinity/Affinity/3.0/Settings
-                affinity_appdata = users_dir / username / "AppData" / "Roaming" / "Affinity"
-                
-                # Check what version folder Affinity v3 actually uses by looking at existing structure
-                affinity_dir = affinity_appdata / "Affinity"
-                version_folder = None
-                if affinity_dir.exists():
-                    existing_versions = [d.name for d in affinity_dir.iterdir() if d.is_dir()]
-                    if existing_versions:
-                        # Prefer 3.0 for Affinity v3
-                        if "3.0" in existing_versions:
-                            version_folder = "3.0"
-                        elif "2.0" in existing_versions:
-                            version_folder = "2.0"
-                        else:
-                            # Use the first one found (sorted)
-                            version_folder = sorted(existing_versions)[0]
-                        self.log(f"Found existing Affinity version folder: {version_folder}", "info")
-                
                 # If no existing version folder, use 3.0 for Affinity v3
                 if not version_folder:
                     # Try to detect from source path
@@ -10079,37 +10892,42 @@ Would you like to continue with {distro_name} anyway?"""
                 self.log(f"  From: {settings_source}", "info")
                 self.log(f"  To: {target_dir}", "info")
                 
-                # Copy with metadata preservation
-                shutil.copytree(settings_source, target_dir, dirs_exist_ok=True)
+                # Hardlink the freshly extracted files (temp_dir lives inside the prefix, so
+                # this is normally the same filesystem); fall back to a real copy otherwise
+                copied_count = 0
+                
+                def link_file(src, dst):
+                    nonlocal copied_count
+                    os.link(src, dst)
+                    copied_count += 1
+                
+                try:
+                    shutil.copytree(settings_source, target_dir, dirs_exist_ok=True, copy_function=link_file)
+                except (OSError, shutil.Error) as e:
+                    self.log(f"Hardlinking settings failed ({e}), copying instead", "info")
+                    shutil.rmtree(target_dir, ignore_errors=True)
+                    copied_count = self._parallel_copytree(settings_source, target_dir)
                 self.update_progress(0.9)
                 self.log(f"Settings copied successfully to: {target_dir}", "success")
+                self.log(f"Copied {copied_count} file(s)", "success")
                 
-                # Verify the copy
-                copied_files = list(target_dir.rglob("*"))
-                source_files = list(settings_source.rglob("*"))
-                self.log(f"Copied {len(copied_files)} file(s)/folder(s) (source had {len(source_files)})", "success")
-                
-                # List some of the copied files for verification
-                xml_files = list(target_dir.rglob("*.xml"))
+                # List some of the copied files for verification (stop after the first 5)
+                xml_files = list(itertools.islice(target_dir.rglob("*.xml"), 5))
                 if xml_files:
-                    self.log(f"Found {len(xml_files)} XML file(s) in settings", "info")
-                    for xml_file in xml_files[:5]:  # Show first 5
+                    self.log("XML files in settings include:", "info")
+                    for xml_file in xml_files:
                         self.log(f"  - {xml_file.relative_to(target_dir)}", "info")
                 
                 # Set permissions (make sure files are readable)
                 try:
-                    for root, dirs, files in os.walk(target_dir):
-                        for d in dirs:
-                            os.chmod(os.path.join(root, d), 0o755)
-                        for f in files:
-                            os.chmod(os.path.join(root, f), 0o644)
+                    self._chmod_tree(target_dir)
                     self.log("File permissions set correctly", "success")
                 except Exception as e:
                     self.log(f"Note: Could not set permissions: {e}", "warning")
                 
                 # Clean up temp files
                 try:
-                    shutil.rmtree(temp_dir)
+                    self._discard_tree(temp_dir)
                     self.log("Temp files cleaned up", "info")
                 except Exception as e:
                     self.log(f"Note: Could not clean up temp files: {e}", "warning")
@@ -10120,30 +10938,30 @@ Would you like to continue with {distro_name} anyway?"""
                 self.log("Settings files have been installed for Affinity v3 (Unified).", "info")
                 
             except Exception as e:
-                import traceback
                 self.log(f"Error installing settings: {e}", "error")
                 self.log(f"Traceback: {traceback.format_exc()}", "error")
             try:
-                shutil.rmtree(temp_dir)
-                repo_zip.unlink(missing_ok=True)
+                self._discard_tree(temp_dir)
             except Exception:
                 pass
         except Exception as e:
-            import traceback
             self.log(f"Error installing settings: {e}", "error")
             self.log(f"Traceback: {traceback.format_exc()}", "error")
+            # The settings fetch may still be writing into temp_dir; stop or finish it first
+            if fetch_future is not None and not fetch_future.cancel():
+                with contextlib.suppress(Exception):
+                    fetch_future.result()
             # Clean up on error
             try:
-                shutil.rmtree(temp_dir)
-                repo_zip.unlink(missing_ok=True)
+                self._discard_tree(temp_dir)
             except:
                 pass
     
     def install_from_file(self):
         """Install from file manager - custom .exe file"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Custom Installer from File Manager", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if Wine is set up
         wine_binary = self.get_wine_path("wine")
@@ -10159,12 +10977,7 @@ Would you like to continue with {distro_name} anyway?"""
         
         # Open file dialog to select .exe
         self.log("Please select the installer .exe file...", "info")
-        installer_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select Installer (.exe)",
-            "",
-            "Executable files (*.exe);;All files (*.*)"
-        )
+        installer_path = self._select_installer_file("Select Installer (.exe)")
         
         if not installer_path:
             self.log("Installation cancelled.", "warning")
@@ -10199,11 +11012,7 @@ Would you like to continue with {distro_name} anyway?"""
         
         # Start operation and installation
         self.start_operation("Custom Installation")
-        threading.Thread(
-            target=self._run_custom_installation_entry,
-            args=(installer_path, app_name),
-            daemon=True
-        ).start()
+        self._submit_operation(self._run_custom_installation_entry, installer_path, app_name)
     
     def _run_custom_installation_entry(self, installer_path, app_name):
         """Wrapper: run custom installation and always end operation."""
@@ -10221,7 +11030,7 @@ Would you like to continue with {distro_name} anyway?"""
             original_filename = Path(installer_path).name
             sanitized_filename = self.sanitize_filename(original_filename)
             installer_file = Path(self.directory) / sanitized_filename
-            shutil.copy2(installer_path, installer_file)
+            self._stage_installer(installer_path, installer_file)
             self.log(f"Installer {original_filename} copied to Wine prefix: {installer_file} (WINEPREFIX={self.directory})", "success")
             
             # Set Windows version
@@ -10229,8 +11038,7 @@ Would you like to continue with {distro_name} anyway?"""
             wine_cfg = self.get_wine_path("winecfg")
             wine = self.get_wine_path("wine")
             
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
             
             # Run installer
@@ -10287,7 +11095,7 @@ Would you like to continue with {distro_name} anyway?"""
                     "Publisher": ("Publisher", "Publisher.exe", "Publisher 2")
                 }
                 name, exe, dir_name = app_names.get(app_name, ("", "", ""))
-                app_path = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / dir_name / exe
+                app_path = self._drive_c / "Program Files" / "Affinity" / dir_name / exe
                 
                 if app_path.exists():
                     self.log(f"Found application at: {app_path}", "success")
@@ -10370,11 +11178,9 @@ Would you like to continue with {distro_name} anyway?"""
         
         desktop_file = desktop_dir / f"{app_name.replace(' ', '')}.desktop"
         
-        wine = self.get_wine_path("wine")
-        
         # Normalize all paths to strings to avoid double slashes
-        wine_str = str(wine)
-        directory_str = str(self.directory).rstrip("/")  # Remove trailing slash if present
+        wine_str = self._wine_str
+        directory_str = self._directory_str
         
         # Normalize path: convert Windows backslashes to forward slashes, remove double slashes
         exe_path_normalized = exe_path.replace("\\", "/").replace("//", "/")
@@ -10422,9 +11228,9 @@ Would you like to continue with {distro_name} anyway?"""
         
         display_name = app_names.get(app_name, app_name)
         
-        self.log(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log(f"Update {display_name}", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if Wine is set up
         wine = self.get_wine_path("wine")
@@ -10436,12 +11242,7 @@ Would you like to continue with {distro_name} anyway?"""
         # Ask for installer file
         self.log(f"Please select the {display_name} installer (.exe)...", "info")
         
-        installer_path, _ = QFileDialog.getOpenFileName(
-            self,
-            f"Select {display_name} Installer",
-            "",
-            "Executable files (*.exe);;All files (*.*)"
-        )
+        installer_path = self._select_installer_file(f"Select {display_name} Installer")
         
         if not installer_path:
             self.log("Update cancelled.", "warning")
@@ -10449,11 +11250,7 @@ Would you like to continue with {distro_name} anyway?"""
         
         # Start operation and update in thread
         self.start_operation(f"Update {display_name}")
-        threading.Thread(
-            target=self._run_update_entry,
-            args=(display_name, installer_path),
-            daemon=True
-        ).start()
+        self._submit_operation(self._run_update_entry, display_name, installer_path)
     
     def _run_update_entry(self, display_name, installer_path):
         """Wrapper: run update and always end operation."""
@@ -10475,14 +11272,13 @@ Would you like to continue with {distro_name} anyway?"""
             original_filename = Path(installer_path).name
             sanitized_filename = self.sanitize_filename(original_filename)
             installer_file = Path(self.directory) / sanitized_filename
-            shutil.copy2(installer_path, installer_file)
+            staged = self._stage_installer(installer_path, installer_file)
             self.log(f"Installer copied to Wine prefix: {installer_file} (WINEPREFIX={self.directory})", "success")
             
             # Set up environment
             self.update_progress_text("Configuring Wine...")
             self.update_progress(0.3)
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             
             # Use regular Wine for all installations (wine-tkg is only for winetricks)
             wine_cfg = self.get_wine_path("winecfg")
@@ -10503,10 +11299,11 @@ Would you like to continue with {distro_name} anyway?"""
             if not success and not self.check_cancelled():
                 self.log("Updater process exited with a non-zero status", "warning")
             
-            # Clean up installer
-            if installer_file.exists():
-                installer_file.unlink()
-                self.log("Installer file removed", "success")
+            # Clean up installer (never the user's own file if they picked the staged copy itself)
+            if staged:
+                with contextlib.suppress(FileNotFoundError):
+                    installer_file.unlink()
+                    self.log("Installer file removed", "success")
             
             # Remove Wine desktop entries created by the installer
             desktop_dir = Path.home() / ".local" / "share" / "applications"
@@ -10517,34 +11314,37 @@ Would you like to continue with {distro_name} anyway?"""
                 display_name = str(display_name) if display_name is not None else ""
             
             # Map display names to possible Wine desktop entry names
-            wine_entry_names = []
-            if display_name and ("Suite" in display_name or display_name == "Affinity Suite"):
-                wine_entry_names = ["Affinity.desktop"]
-            elif display_name and "Photo" in display_name:
-                wine_entry_names = ["Affinity Photo 2.desktop", "Affinity Photo.desktop"]
-            elif display_name and "Designer" in display_name:
-                wine_entry_names = ["Affinity Designer 2.desktop", "Affinity Designer.desktop"]
-            elif display_name and "Publisher" in display_name:
-                wine_entry_names = ["Affinity Publisher 2.desktop", "Affinity Publisher.desktop"]
+            token = next((key for key in DESKTOP_ENTRY_MAP if key in display_name), None)
+            wine_entry_names = DESKTOP_ENTRY_MAP.get(token, [])
+            
+            # List the directory once instead of stat()ing every candidate entry
+            try:
+                with os.scandir(wine_desktop_dir) as it:
+                    existing_entries = {entry.name for entry in it}
+            except OSError:
+                existing_entries = set()
             
             removed_count = 0
             for entry_name in wine_entry_names:
-                wine_entry = wine_desktop_dir / entry_name
-                if wine_entry.exists():
+                if entry_name in existing_entries:
                     try:
-                        wine_entry.unlink()
+                        os.unlink(wine_desktop_dir / entry_name)
+                        existing_entries.discard(entry_name)
                         removed_count += 1
                         self.log(f"Removed Wine desktop entry: {entry_name}", "info")
+                    except FileNotFoundError:
+                        pass
                     except Exception as e:
                         self.log(f"Could not remove {entry_name}: {e}", "error")
             
             # Also check for generic Affinity.desktop if not already checked
             if display_name and "Unified" not in display_name:
-                generic_entry = wine_desktop_dir / "Affinity.desktop"
-                if generic_entry.exists():
+                if "Affinity.desktop" in existing_entries:
                     try:
-                        generic_entry.unlink()
+                        os.unlink(wine_desktop_dir / "Affinity.desktop")
                         self.log("Removed Wine desktop entry: Affinity.desktop", "info")
+                    except FileNotFoundError:
+                        pass
                     except Exception as e:
                         self.log(f"Could not remove Affinity.desktop: {e}", "error")
             
@@ -10552,39 +11352,51 @@ Would you like to continue with {distro_name} anyway?"""
                 self.log(f"Cleaned up {removed_count} Wine desktop entr{'y' if removed_count == 1 else 'ies'}", "success")
             
             # Reinstall WinMetadata to avoid corruption
-            self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            self.log(LOG_RULE_OPEN)
             self.log("Reinstalling WinMetadata to prevent corruption...", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+            self.log(LOG_RULE_CLOSE)
             
             # Kill Wine processes before removing WinMetadata
             self.log("Stopping Wine processes...", "info")
-            self.run_command(["wineserver", "-k"], check=False)
-            time.sleep(2)
+            self._stop_wineserver()
             
-            system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+            system32_dir = self._system32
             winmetadata_dir = system32_dir / "WinMetadata"
             
             # Remove existing WinMetadata folder
             if winmetadata_dir.exists():
                 self.log("Removing existing WinMetadata folder...", "info")
                 try:
-                    shutil.rmtree(winmetadata_dir)
+                    self._fast_rmtree(winmetadata_dir)
                     self.log("Old WinMetadata folder removed", "success")
                 except Exception as e:
                     self.log(f"Warning: Could not fully remove old folder: {e}", "warning")
             
+            is_unified = bool(display_name and ("Unified" in display_name or display_name == "Affinity (Unified)"))
+            
             # Reinstall WinMetadata by downloading and extracting
             self.log("Installing fresh WinMetadata...", "info")
-            self.setup_winmetadata()
+            if is_unified:
+                # system32/WinMetadata and the user's Settings folder are independent downloads,
+                # so fetch WinMetadata in the background while the settings files are reinstalled;
+                # it runs quietly so the settings step owns the progress bar and the log
+                winmetadata_future = self._pool.submit(self._run_deferred, self.setup_winmetadata)
+            else:
+                self.setup_winmetadata()
             
             # For Affinity v3 (Unified), reinstall settings files
-            if display_name and ("Unified" in display_name or display_name == "Affinity (Unified)"):
+            if is_unified:
                 # Reinstall settings files
-                self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log("Reinstalling Affinity v3 settings files...", "info")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 self._install_affinity_settings_thread()
                 
+                # The patch step runs Wine, so WinMetadata has to be in place first
+                _, winmetadata_log = winmetadata_future.result()
+                for message, level in winmetadata_log:
+                    self.log(message, level)
+                
                 # Patch the DLL to fix settings saving (this is the last step)
                 self.update_progress_text("Patching DLL for settings fix...")
                 self.update_progress(0.95)
@@ -10640,6 +11452,7 @@ Would you like to continue with {distro_name} anyway?"""
             if installer_path_obj.parent == installer_dir:
                 self.log(f"Using installer from .AffinityLinux/Installer/: {installer_path_obj.name}", "info")
                 installer_file = installer_path_obj
+                staged = False
             else:
                 # For custom installers, copy to Wine prefix with sanitized filename (remove spaces)
                 self.update_progress_text("Copying installer...")
@@ -10647,7 +11460,7 @@ Would you like to continue with {distro_name} anyway?"""
                 original_filename = installer_path_obj.name
                 sanitized_filename = self.sanitize_filename(original_filename)
                 installer_file = Path(self.directory) / sanitized_filename
-                shutil.copy2(installer_path, installer_file)
+                staged = self._stage_installer(installer_path, installer_file)
                 self.log(f"Installer copied to Wine prefix: {installer_file} (WINEPREFIX={self.directory})", "success")
             
             # Set Windows version
@@ -10663,8 +11476,7 @@ Would you like to continue with {distro_name} anyway?"""
             wine_cfg = self.get_wine_path("winecfg")
             wine = self.get_wine_path("wine")
             
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
             
             # Run installer
@@ -10684,10 +11496,12 @@ Would you like to continue with {distro_name} anyway?"""
             # Clean up installer (only if it was copied to Wine prefix, not if it's in .AffinityLinux/Installer/)
             self.update_progress(0.5)
             if installer_file.parent != installer_dir:
-                # Only remove if it was copied (not the original in Installer folder)
-                if installer_file.exists():
-                    installer_file.unlink()
-                    self.log("Installer file removed", "success")
+                # Only remove if it was copied (not the original in Installer folder,
+                # nor a selected file that already sat at the staged path)
+                if staged:
+                    with contextlib.suppress(FileNotFoundError):
+                        installer_file.unlink()
+                        self.log("Installer file removed", "success")
             else:
                 self.log(f"Installer kept in .AffinityLinux/Installer/: {installer_file.name}", "info")
             
@@ -10770,12 +11584,12 @@ Would you like to continue with {distro_name} anyway?"""
                 }
                 dir_name, exe = app_names.get(app_name, (None, None))
                 if dir_name and exe:
-                    app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / dir_name
+                    app_dir = self._drive_c / "Program Files" / "Affinity" / dir_name
                     exe_path = app_dir / exe
             
             # Handle v3 (Unified) app
             elif app_name == "Add" or app_name == "Affinity (Unified)":
-                app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / "Affinity"
+                app_dir = self._drive_c / "Program Files" / "Affinity" / "Affinity"
                 exe_path = app_dir / "Affinity.exe"
             
             if not app_dir or not exe_path or not exe_path.exists():
@@ -10810,8 +11624,7 @@ Would you like to continue with {distro_name} anyway?"""
     def setup_wintypes_dll_override(self):
         """Set up DLL override for wintypes.dll as Native (Windows)"""
         try:
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             
             # Check if override already exists
             wine = self.get_wine_path("wine")
@@ -10827,10 +11640,11 @@ Would you like to continue with {distro_name} anyway?"""
             else:
                 # Create registry file for wintypes override
                 reg_file = Path(self.directory) / "wintypes_override.reg"
-                with open(reg_file, "w") as f:
-                    f.write("REGEDIT4\n")
-                    f.write("[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n")
-                    f.write('"wintypes"="native"\n')
+                reg_file.write_text(
+                    "REGEDIT4\n"
+                    "[HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides]\n"
+                    '"wintypes"="native"\n'
+                )
                 
                 regedit = self.get_wine_path("regedit")
                 reg_success, _, stderr = self.run_command([str(regedit), str(reg_file)], check=False, env=env, capture=True)
@@ -10846,7 +11660,7 @@ Would you like to continue with {distro_name} anyway?"""
     def copy_wintypes_dll_for_all_apps(self):
         """Download and copy wintypes.dll for all installed Affinity apps (v2 and v3)"""
         try:
-            affinity_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity"
+            affinity_dir = self._drive_c / "Program Files" / "Affinity"
             if not affinity_dir.exists():
                 self.log("Affinity installation directory not found", "warning")
                 return
@@ -10913,10 +11727,9 @@ Would you like to continue with {distro_name} anyway?"""
         self.log("Restoring Windows metadata files...", "info")
         
         # Kill Wine processes
-        self.run_command(["wineserver", "-k"], check=False)
-        time.sleep(2)
+        self._stop_wineserver()
         
-        system32_dir = Path(self.directory) / "drive_c" / "windows" / "system32"
+        system32_dir = self._system32
         system32_dir.mkdir(parents=True, exist_ok=True)
         
         try:
@@ -10924,7 +11737,7 @@ Would you like to continue with {distro_name} anyway?"""
             
             # Remove existing WinMetadata if it exists
             if winmetadata_dest.exists():
-                shutil.rmtree(winmetadata_dest)
+                self._fast_rmtree(winmetadata_dest)
                 self.log("Removed existing WinMetadata folder", "info")
             
             # Download and extract WinMetadata
@@ -10966,8 +11779,7 @@ Would you like to continue with {distro_name} anyway?"""
             if not wine.exists():
                 return "vulkan"  # Default to vulkan if Wine not set up
             
-            env = os.environ.copy()
-            env["WINEPREFIX"] = self.directory
+            env = self._wine_env()
             
             success, stdout, _ = self.run_command(
                 [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
@@ -11000,7 +11812,7 @@ Would you like to continue with {distro_name} anyway?"""
         }
         
         app_dir_name = app_dirs.get(app_name, "Affinity")
-        app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / app_dir_name
+        app_dir = self._drive_c / "Program Files" / "Affinity" / app_dir_name
         
         if not app_dir.exists():
             self.log(f"Application directory not found: {app_dir}", "warning")
@@ -11014,14 +11826,24 @@ Would you like to continue with {distro_name} anyway?"""
             self.log("d3d12 DLLs not found in Wine library, installing...", "info")
             self.install_d3d12_dlls()
         
+        # List both candidate directories once, then pick each DLL from the first that has it
+        def list_files(directory):
+            try:
+                with os.scandir(directory) as it:
+                    return {entry.name: entry.path for entry in it if entry.is_file()}
+            except OSError:
+                return {}
+        
+        vkd3d_entries = list_files(vkd3d_temp)
+        wine_lib_entries = list_files(wine_lib_dir)
+        
         dlls_copied = 0
         for dll in ["d3d12.dll", "d3d12core.dll"]:
-            for source in [vkd3d_temp / dll, wine_lib_dir / dll]:
-                if source.exists():
-                    shutil.copy2(source, app_dir / dll)
-                    self.log(f"Copied {dll} to {app_dir_name}", "success")
-                    dlls_copied += 1
-                    break
+            source = vkd3d_entries.get(dll) or wine_lib_entries.get(dll)
+            if source:
+                self._fast_copy(source, app_dir / dll)
+                self.log(f"Copied {dll} to {app_dir_name}", "success")
+                dlls_copied += 1
         
         # Ensure DLL overrides are set up
         self.setup_d3d12_overrides()
@@ -11077,9 +11899,9 @@ Would you like to continue with {distro_name} anyway?"""
             try:
                 self.update_progress(0.0)
                 self.update_progress_text("Enabling OpenCL support...")
-                self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                self.log(LOG_RULE_OPEN)
                 self.log("Enabling OpenCL Support", "info")
-                self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                self.log(LOG_RULE_CLOSE)
                 
                 # Set OpenCL preference
                 self.enable_opencl = True
@@ -11103,7 +11925,6 @@ Would you like to continue with {distro_name} anyway?"""
                         self.log("Error: OpenCL preference file was not created", "error")
                 except Exception as e:
                     self.log(f"Error: Failed to save OpenCL preference: {e}", "error")
-                    import traceback
                     self.log(f"Traceback: {traceback.format_exc()}", "error")
                 
                 self.update_progress(0.2)
@@ -11186,7 +12007,7 @@ Would you like to continue with {distro_name} anyway?"""
                 }
                 
                 for app_name, app_dir_name in app_dirs.items():
-                    app_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / app_dir_name
+                    app_dir = self._drive_c / "Program Files" / "Affinity" / app_dir_name
                     if app_dir.exists():
                         apps_to_configure.append(app_name)
                 
@@ -11226,7 +12047,6 @@ Would you like to continue with {distro_name} anyway?"""
                 QTimer.singleShot(100, self.check_installation_status)
                 
             except Exception as e:
-                import traceback
                 error_msg = str(e)
                 error_trace = traceback.format_exc()
                 self.log(f"Error enabling OpenCL support: {error_msg}", "error")
@@ -11289,7 +12109,7 @@ Would you like to continue with {distro_name} anyway?"""
             if success and stdout:
                 for line in stdout.split('\n'):
                     if 'dotnet-sdk' in line.lower() and 'installed' in line.lower():
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
                         if match:
                             major = int(match.group(1))
                             if major >= 10:
@@ -11305,7 +12125,7 @@ Would you like to continue with {distro_name} anyway?"""
             if success and stdout:
                 for line in stdout.split('\n'):
                     if 'dotnet-sdk' in line.lower():
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
                         if match:
                             major = int(match.group(1))
                             if major >= 10:
@@ -11321,7 +12141,7 @@ Would you like to continue with {distro_name} anyway?"""
             if success and stdout:
                 for line in stdout.split('\n'):
                     if 'dotnet-sdk' in line.lower() and line.startswith('ii'):
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
                         if match:
                             major = int(match.group(1))
                             if major >= 10:
@@ -11330,8 +12150,55 @@ Would you like to continue with {distro_name} anyway?"""
         
         return False
     
+    def _installed_dotnet_sdk_packages(self):
+        """Read installed dotnet-sdk packages straight from the package database.
+        
+        Returns a list of (package_name, major) tuples, or None when the local
+        database is not readable (caller then falls back to dpkg/pacman).
+        Avoids a fork+exec and the package manager's DB lock.
+        """
+        packages = []
+        if self.distro in ["arch", "cachyos", "endeavouros", "xerolinux"]:
+            # pacman keeps one "<name>-<version>-<rel>" directory per installed package
+            try:
+                with os.scandir("/var/lib/pacman/local") as it:
+                    for entry in it:
+                        if entry.name.startswith("dotnet-sdk") and entry.is_dir():
+                            match = DOTNET_SDK_VERSION_RE.match(entry.name)
+                            if match:
+                                packages.append((entry.name, int(match.group(1))))
+            except OSError:
+                return None
+        elif self.distro in ["pikaos", "pop", "debian"]:
+            # dpkg status is a list of RFC822-style stanzas separated by blank lines
+            try:
+                status = Path("/var/lib/dpkg/status").read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                return None
+            for stanza in status.split("\n\n"):
+                if not stanza.startswith("Package: dotnet-sdk") or "Status: install ok installed" not in stanza:
+                    continue
+                name = stanza.split("\n", 1)[0][len("Package: "):].strip()
+                match = DOTNET_SDK_VERSION_RE.match(name)
+                if match:
+                    packages.append((name, int(match.group(1))))
+        else:
+            return None
+        return packages
+    
     def check_dotnet_sdk(self):
-        """Check if .NET SDK version 8.0 or newer is installed"""
+        """Check if .NET SDK version 8.0 or newer is installed.
+        
+        A positive result is memoized for the lifetime of the process; a miss is
+        re-probed so a check right after install_dotnet_sdk() still sees it.
+        """
+        if self._dotnet_probe:
+            return True
+        self._dotnet_probe = self._probe_dotnet_sdk()
+        return self._dotnet_probe
+    
+    def _probe_dotnet_sdk(self):
+        """Probe PATH, common locations and the package manager for .NET SDK 8.0+"""
         # First, try to run dotnet --version
         success, stdout, _ = self.run_command(
             ["dotnet", "--version"],
@@ -11342,6 +12209,7 @@ Would you like to continue with {distro_name} anyway?"""
             version = stdout.strip()
             if self._is_version_sufficient(version):
                 self.log(f".NET SDK found (version {version}) - using installed version", "success")
+                self._dotnet_path = self.which_command("dotnet") or "dotnet"
                 return True
             else:
                 self.log(f".NET SDK found but version {version} is too old (need 8.0+)", "warning")
@@ -11361,121 +12229,52 @@ Would you like to continue with {distro_name} anyway?"""
             common_paths.insert(1, Path(dotnet_root))
         
         for path in common_paths:
-            path_obj = Path(path)
-            if path_obj.exists() and path_obj.is_file():
-                # Try running it
-                success, stdout, _ = self.run_command(
-                    [str(path), "--version"],
-                    check=False,
-                    capture=True
-                )
-                if success and stdout:
-                    version = stdout.strip()
-                    if self._is_version_sufficient(version):
-                        self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
-                        return True
-        
-        # If dotnet command not found, check if it's installed via package manager
-        # This is useful when dotnet is installed but not in PATH
-        if self.distro in ["fedora", "nobara"]:
-            # Check for any dotnet-sdk package (not just 8.0)
-            success, stdout, _ = self.run_command(
-                ["dnf", "list", "installed", "dotnet-sdk*"],
-                check=False,
-                capture=True
-            )
-            if success and stdout:
-                # Look for any dotnet-sdk package
-                for line in stdout.split('\n'):
-                    if 'dotnet-sdk' in line.lower() and 'installed' in line.lower():
-                        # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
-                        if match:
-                            major = int(match.group(1))
-                            if major >= 8:
-                                self.log(f".NET SDK package found via dnf: {line.split()[0]}", "success")
-                                # Try to find dotnet in common locations
-                                common_paths = [
-                                    "/usr/bin/dotnet",
-                                    "/usr/local/bin/dotnet",
-                                    "/opt/dotnet/dotnet",
-                                    Path.home() / ".dotnet" / "dotnet"
-                                ]
-                                for path in common_paths:
-                                    if Path(path).exists():
-                                        # Try running it
-                                        success, stdout, _ = self.run_command(
-                                            [str(path), "--version"],
-                                            check=False,
-                                            capture=True
-                                        )
-                                        if success and stdout:
-                                            version = stdout.strip()
-                                            if self._is_version_sufficient(version):
-                                                self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
-                                                return True
-                                # Package is installed but dotnet command not accessible
-                                self.log(".NET SDK package is installed but 'dotnet' command not found in PATH", "warning")
-                                self.log("You may need to add /usr/bin to your PATH or restart your terminal", "info")
-                                return True  # Return True anyway since package is installed
-        
-        elif self.distro in ["arch", "cachyos", "endeavouros", "xerolinux"]:
-            # Check for any dotnet-sdk package via pacman
-            # Query all installed packages and filter for dotnet-sdk
-            success, stdout, _ = self.run_command(
-                ["pacman", "-Q"],
-                check=False,
-                capture=True
-            )
-            if success and stdout:
-                # Check all installed packages for dotnet-sdk
-                for line in stdout.split('\n'):
-                    if 'dotnet-sdk' in line.lower():
-                        # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
-                        if match:
-                            major = int(match.group(1))
-                            if major >= 8:
-                                package_name = line.split()[0]
-                                self.log(f".NET SDK package found via pacman: {package_name}", "success")
-                                # Try common paths
-                                common_paths = ["/usr/bin/dotnet", "/usr/local/bin/dotnet"]
-                                for path in common_paths:
-                                    if Path(path).exists():
-                                        success, stdout, _ = self.run_command(
-                                            [path, "--version"],
-                                            check=False,
-                                            capture=True
-                                        )
-                                        if success and stdout:
-                                            version = stdout.strip()
-                                            if self._is_version_sufficient(version):
-                                                self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
-                                                return True
-                                return True  # Package is installed
+            path_obj = Path(path)
+            if path_obj.exists() and path_obj.is_file():
+                # Try running it
+                success, stdout, _ = self.run_command(
+                    [str(path), "--version"],
+                    check=False,
+                    capture=True
+                )
+                if success and stdout:
+                    version = stdout.strip()
+                    if self._is_version_sufficient(version):
+                        self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
+                        self._dotnet_path = str(path)
+                        return True
         
-        elif self.distro in ["pikaos", "pop", "debian"]:
-            # Check for any dotnet-sdk package via dpkg
+        # If dotnet command not found, check if it's installed via package manager
+        # This is useful when dotnet is installed but not in PATH
+        if self.distro in ["fedora", "nobara"]:
+            # Check for any dotnet-sdk package (not just 8.0)
             success, stdout, _ = self.run_command(
-                ["dpkg", "-l", "dotnet-sdk*"],
+                ["dnf", "list", "installed", "dotnet-sdk*"],
                 check=False,
                 capture=True
             )
             if success and stdout:
                 # Look for any dotnet-sdk package
                 for line in stdout.split('\n'):
-                    if 'dotnet-sdk' in line.lower() and line.startswith('ii'):
+                    if 'dotnet-sdk' in line.lower() and 'installed' in line.lower():
                         # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
                         if match:
                             major = int(match.group(1))
                             if major >= 8:
-                                self.log(f".NET SDK package found via dpkg: {line.split()[1]}", "success")
-                                common_paths = ["/usr/bin/dotnet", "/usr/local/bin/dotnet"]
+                                self.log(f".NET SDK package found via dnf: {line.split()[0]}", "success")
+                                # Try to find dotnet in common locations
+                                common_paths = [
+                                    "/usr/bin/dotnet",
+                                    "/usr/local/bin/dotnet",
+                                    "/opt/dotnet/dotnet",
+                                    Path.home() / ".dotnet" / "dotnet"
+                                ]
                                 for path in common_paths:
                                     if Path(path).exists():
+                                        # Try running it
                                         success, stdout, _ = self.run_command(
-                                            [path, "--version"],
+                                            [str(path), "--version"],
                                             check=False,
                                             capture=True
                                         )
@@ -11483,8 +12282,88 @@ Would you like to continue with {distro_name} anyway?"""
                                             version = stdout.strip()
                                             if self._is_version_sufficient(version):
                                                 self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
+                                                self._dotnet_path = str(path)
                                                 return True
-                                return True  # Package is installed
+                                # Package is installed but dotnet command not accessible
+                                self.log(".NET SDK package is installed but 'dotnet' command not found in PATH", "warning")
+                                self.log("You may need to add /usr/bin to your PATH or restart your terminal", "info")
+                                return True  # Return True anyway since package is installed
+        
+        elif self.distro in ["arch", "cachyos", "endeavouros", "xerolinux"]:
+            # Check for any dotnet-sdk package in pacman's local database
+            packages = self._installed_dotnet_sdk_packages()
+            if packages is None:
+                # Database not readable - query all installed packages and filter for dotnet-sdk
+                packages = []
+                success, stdout, _ = self.run_command(
+                    ["pacman", "-Q"],
+                    check=False,
+                    capture=True
+                )
+                if success and stdout:
+                    for line in stdout.split('\n'):
+                        # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
+                        if match:
+                            packages.append((line.split()[0], int(match.group(1))))
+            if packages:
+                for package_name, major in packages:
+                    if major >= 8:
+                        self.log(f".NET SDK package found via pacman: {package_name}", "success")
+                        # Try common paths
+                        common_paths = ["/usr/bin/dotnet", "/usr/local/bin/dotnet"]
+                        for path in common_paths:
+                            if Path(path).exists():
+                                success, stdout, _ = self.run_command(
+                                    [path, "--version"],
+                                    check=False,
+                                    capture=True
+                                )
+                                if success and stdout:
+                                    version = stdout.strip()
+                                    if self._is_version_sufficient(version):
+                                        self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
+                                        self._dotnet_path = str(path)
+                                        return True
+                        return True  # Package is installed
+        
+        elif self.distro in ["pikaos", "pop", "debian"]:
+            # Check for any dotnet-sdk package in /var/lib/dpkg/status
+            packages = self._installed_dotnet_sdk_packages()
+            if packages is None:
+                # Status file not readable - fall back to dpkg -l
+                packages = []
+                success, stdout, _ = self.run_command(
+                    ["dpkg", "-l", "dotnet-sdk*"],
+                    check=False,
+                    capture=True
+                )
+                if success and stdout:
+                    for line in stdout.split('\n'):
+                        if line.startswith('ii'):
+                            # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
+                            match = DOTNET_SDK_VERSION_RE.search(line)
+                            if match:
+                                packages.append((line.split()[1], int(match.group(1))))
+            if packages:
+                for package_name, major in packages:
+                    if major >= 8:
+                        self.log(f".NET SDK package found via dpkg: {package_name}", "success")
+                        common_paths = ["/usr/bin/dotnet", "/usr/local/bin/dotnet"]
+                        for path in common_paths:
+                            if Path(path).exists():
+                                success, stdout, _ = self.run_command(
+                                    [path, "--version"],
+                                    check=False,
+                                    capture=True
+                                )
+                                if success and stdout:
+                                    version = stdout.strip()
+                                    if self._is_version_sufficient(version):
+                                        self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
+                                        self._dotnet_path = str(path)
+                                        return True
+                        return True  # Package is installed
         
         elif self.distro in ["opensuse-tumbleweed", "opensuse-leap"]:
             # Check for any dotnet-sdk package via zypper
@@ -11498,7 +12377,7 @@ Would you like to continue with {distro_name} anyway?"""
                 for line in stdout.split('\n'):
                     if 'dotnet-sdk' in line.lower() and '|' in line:
                         # Extract version from package name (e.g., dotnet-sdk-8.0, dotnet-sdk-9.0)
-                        match = re.search(r'dotnet-sdk-(\d+)\.(\d+)', line)
+                        match = DOTNET_SDK_VERSION_RE.search(line)
                         if match:
                             major = int(match.group(1))
                             if major >= 8:
@@ -11531,6 +12410,7 @@ Would you like to continue with {distro_name} anyway?"""
                                             version = stdout.strip()
                                             if self._is_version_sufficient(version):
                                                 self.log(f".NET SDK found at {path}: {version} - using installed version", "success")
+                                                self._dotnet_path = str(path)
                                                 return True
                                 # Package is installed but dotnet command not accessible
                                 self.log(".NET SDK package is installed but 'dotnet' command not found in PATH", "warning")
@@ -11572,7 +12452,7 @@ Would you like to continue with {distro_name} anyway?"""
                 source_file = source_patch_dir / filename
                 if source_file.exists():
                     try:
-                        shutil.copy2(source_file, dest_file)
+                        self._install_file(source_file, dest_file)
                         files_copied = True
                         if not silent:
                             self.log(f"Copied {filename} to .AffinityLinux/Patch/AffinityPatcherSettings/", "info")
@@ -11655,16 +12535,15 @@ Would you like to continue with {distro_name} anyway?"""
                     try:
                         # Download zip from GitHub
                         zip_url = "https://github.com/ShawnTheBeachy/return-affinity-colors/archive/refs/heads/main.zip"
-                        temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
-                        temp_zip_path = Path(temp_zip.name)
-                        temp_zip.close()
                         
                         if not silent:
                             self.log("Downloading ReturnColors as ZIP from GitHub...", "info")
                         
-                        if self.download_file(zip_url, str(temp_zip_path), "ReturnColors ZIP"):
+                        # Keep the small archive in memory instead of writing and re-reading a temp .zip
+                        zip_spool = self.download_to_spool(zip_url, "ReturnColors ZIP")
+                        if zip_spool is not None:
                             # Extract zip
-                            with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
+                            with zip_spool, zipfile.ZipFile(zip_spool, 'r') as zip_ref:
                                 # Extract to a temp directory first
                                 temp_extract = dest_patch_dir / ".temp_returncolors"
                                 if temp_extract.exists():
@@ -11686,9 +12565,6 @@ Would you like to continue with {distro_name} anyway?"""
                                     except:
                                         pass
                             
-                            # Clean up zip file
-                            temp_zip_path.unlink()
-                            
                             # Verify the structure is correct
                             if returncolors_dest.exists() and (returncolors_dest / "ReturnColors").exists() and (returncolors_dest / "ReturnColors" / "ReturnColors.csproj").exists():
                                 if not silent:
@@ -11738,6 +12614,16 @@ Would you like to continue with {distro_name} anyway?"""
             self.log(f"AffinityPatcher.csproj not found: {csproj_file}", "error")
             return None
         
+        # Reuse this session's build while the project sources are unchanged
+        source_mtimes = tuple(
+            path.stat().st_mtime_ns for path in (csproj_file, patch_dir / "AffinityPatcher.cs") if path.exists()
+        )
+        if self._patcher_build is not None:
+            built_mtimes, built_exe = self._patcher_build
+            if built_mtimes == source_mtimes and built_exe.exists():
+                self.log(f"Using AffinityPatcher already built this session: {built_exe}", "info")
+                return built_exe
+        
         self.log(f"Building AffinityPatcher from: {patch_dir}", "info")
         
         # Build the project - use absolute path and prevent building project references
@@ -11749,7 +12635,7 @@ Would you like to continue with {distro_name} anyway?"""
         # So we explicitly build only the project file and disable project references
         csproj_absolute = csproj_file.resolve()
         success, stdout, stderr = self.run_command(
-            ["dotnet", "build", str(csproj_absolute), "-c", "Release", "-o", str(output_dir.resolve()), 
+            [self._dotnet_path or "dotnet", "build", str(csproj_absolute), "-c", "Release", "-o", str(output_dir.resolve()), 
              "--no-incremental", "-p:BuildProjectReferences=false", "/p:DisableImplicitNuGetFallbackFolder=true"],
             check=False,
             capture=True
@@ -11769,21 +12655,23 @@ Would you like to continue with {distro_name} anyway?"""
             "AffinityPatcher.exe",  # Windows executable (unlikely on Linux)
         ]
         
-        patcher_exe = None
-        for name in possible_names:
-            candidate = output_dir / name
-            if candidate.exists():
-                patcher_exe = candidate
-                break
+        # One directory listing answers both the lookup and the debug output below
+        try:
+            with os.scandir(output_dir) as it:
+                entries = {entry.name: entry.path for entry in it}
+        except OSError:
+            entries = None
         
-        if patcher_exe and patcher_exe.exists():
+        patcher_exe = next((Path(entries[name]) for name in possible_names if entries and name in entries), None)
+        
+        if patcher_exe:
             self.log(f"AffinityPatcher built successfully: {patcher_exe}", "success")
+            self._patcher_build = (source_mtimes, patcher_exe)
             return patcher_exe
         else:
             # List what's actually in the output directory for debugging
-            if output_dir.exists():
-                files = list(output_dir.glob("*"))
-                self.log(f"Files in output directory: {[f.name for f in files]}", "warning")
+            if entries is not None:
+                self.log(f"Files in output directory: {list(entries)}", "warning")
             self.log(f"Built patcher not found at expected location: {output_dir}", "error")
             return None
     
@@ -11803,7 +12691,7 @@ Would you like to continue with {distro_name} anyway?"""
         
         # Run the patcher - use dotnet for DLLs, direct execution for native executables
         if patcher_exe.suffix == ".dll":
-            cmd = ["dotnet", str(patcher_exe), dll_path]
+            cmd = [self._dotnet_path or "dotnet", str(patcher_exe), dll_path]
         else:
             cmd = [str(patcher_exe), dll_path]
         
@@ -11872,7 +12760,7 @@ Would you like to continue with {distro_name} anyway?"""
         # Build the project
         output_dir = returncolors_dir / "bin" / "Release"
         success, stdout, stderr = self.run_command(
-            ["dotnet", "build", str(csproj_file), "-c", "Release", "-o", str(output_dir)],
+            [self._dotnet_path or "dotnet", "build", str(csproj_file), "-c", "Release", "-o", str(output_dir)],
             check=False,
             capture=True
         )
@@ -11924,7 +12812,7 @@ Would you like to continue with {distro_name} anyway?"""
         # Run ReturnColors colorize command
         # The command expects: colorize <directory>
         if returncolors_exe.suffix == ".dll":
-            cmd = ["dotnet", str(returncolors_exe), "colorize", str(affinity_dir)]
+            cmd = [self._dotnet_path or "dotnet", str(returncolors_exe), "colorize", str(affinity_dir)]
         else:
             cmd = [str(returncolors_exe), "colorize", str(affinity_dir)]
         
@@ -11959,46 +12847,53 @@ Would you like to continue with {distro_name} anyway?"""
         if app_name != "Add" and app_name != "Affinity (Unified)":
             return True  # Not applicable, return success
         
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Patching Affinity DLL for settings fix...", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
-        # Ensure patcher files (including ReturnColors) are available
-        self.ensure_patcher_files(silent=True)
+        # Fetching the patcher files (including ReturnColors) and probing for the .NET SDK
+        # are independent, so run them side by side and stat the DLL meanwhile
+        patcher_files_future = self._pool.submit(self.ensure_patcher_files, silent=True)
+        dotnet_future = self._pool.submit(self.check_dotnet_sdk)
+        dll_path = self._drive_c / "Program Files" / "Affinity" / "Affinity" / "Serif.Affinity.dll"
+        dll_exists = dll_path.exists()
         
         # Check if .NET SDK is available, try to install if missing
-        if not self.check_dotnet_sdk():
+        if not dotnet_future.result():
             self.log(".NET SDK not found. Attempting to install...", "info")
             if not self.install_dotnet_sdk():
                 self.log("Failed to install .NET SDK automatically", "warning")
                 self.log("Settings patching will be skipped.", "warning")
                 self.log("You can install .NET SDK manually:", "info")
-                if self.distro in ["arch", "cachyos"]:
-                    self.log("  sudo pacman -S dotnet-sdk-8.0", "info")
-                elif self.distro in ["endeavouros", "xerolinux"]:
-                    self.log("  sudo pacman -S dotnet-sdk-8.0", "info")
-                elif self.distro in ["fedora", "nobara"]:
-                    self.log("  sudo dnf install dotnet-sdk-8.0", "info")
-                elif self.distro in ["pikaos", "pop", "debian"]:
-                    self.log("  sudo apt install dotnet-sdk-8.0", "info")
-                    self.log("  (May require Microsoft's .NET repository)", "warning")
-                elif self.distro in ["opensuse-tumbleweed", "opensuse-leap"]:
-                    self.log("  sudo zypper install dotnet-sdk-8.0", "info")
+                self.log_dotnet_install_hint()
                 return False
             else:
                 self.log(".NET SDK installed successfully", "success")
         
-        # Find the DLL
-        dll_path = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / "Affinity" / "Serif.Affinity.dll"
-        
-        if not dll_path.exists():
+        if not dll_exists:
             self.log(f"Serif.Affinity.dll not found at: {dll_path}", "warning")
             self.log("The DLL may not be installed yet. Patching will be skipped.", "warning")
             return False
         
-        # Run the settings patcher
+        # Run the settings patcher once its sources are in place
+        patcher_files_future.result()
         return self.run_affinity_patcher(str(dll_path))
     
+    def _resolve_icon(self, icon):
+        """Return the absolute path of an icon in ~/.local/share/icons for a desktop entry.
+        
+        The directory is listed once and cached. Missing icons fall back to the
+        Affinity icon, then to a generic theme icon name, so the launcher never has
+        to chase a dangling path.
+        """
+        if self._icon_index is None:
+            try:
+                with os.scandir(Path.home() / ".local" / "share" / "icons") as it:
+                    self._icon_index = {entry.name: entry.path for entry in it if entry.is_file()}
+            except OSError:
+                self._icon_index = {}
+        return self._icon_index.get(icon) or self._icon_index.get("Affinity.svg") or "applications-graphics"
+    
     def create_desktop_entry(self, app_name):
         """Create desktop entry for application"""
         app_names = {
@@ -12017,13 +12912,12 @@ Would you like to continue with {distro_name} anyway?"""
         if app_name == "Add":
             desktop_file = desktop_dir / "Affinity.desktop"
         
-        wine = self.get_wine_path("wine")
-        app_path = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / dir_name / exe
-        icon_path = Path.home() / ".local" / "share" / "icons" / icon
+        app_path = self._drive_c / "Program Files" / "Affinity" / dir_name / exe
+        icon_path = self._resolve_icon(icon)
         
         # Normalize all paths to strings to avoid double slashes
-        wine_str = str(wine)
-        directory_str = str(self.directory).rstrip("/")  # Remove trailing slash if present
+        wine_str = self._wine_str
+        directory_str = self._directory_str
         icon_path_str = str(icon_path)
         app_path_str = str(app_path).replace("\\", "/")  # Ensure forward slashes, no double slashes
         
@@ -12032,74 +12926,79 @@ Would you like to continue with {distro_name} anyway?"""
         # Get DXVK environment variables if AMD GPU is detected
         dxvk_env = self.get_dxvk_env_vars()
         
-        with open(desktop_file, "w") as f:
-            f.write("[Desktop Entry]\n")
-            if app_name == "Add":
-                f.write("Name=Affinity Suite\n")
-                f.write("Comment=A powerful creative suite.\n")
-            else:
-                f.write(f"Name=Affinity {name}\n")
-                f.write(f"Comment=A powerful {name.lower()} software.\n")
-            f.write(f"Icon={icon_path_str}\n")
-            f.write(f"Path={directory_str}\n")
-            # Use Linux path format with proper quoting for spaces
-            # Include GPU environment variables if configured
-            exec_line = f'Exec=env WINEPREFIX={directory_str}'
-            if gpu_env:
-                exec_line += f' {gpu_env}'
-            if dxvk_env:
-                exec_line += f' {dxvk_env}'
-            exec_line += f' {wine_str} "{app_path_str}"'
-            f.write(f'{exec_line}\n')
-            f.write("Terminal=false\n")
-            f.write("Type=Application\n")
-            f.write("Categories=Graphics;\n")
-            f.write("StartupNotify=true\n")
-            if app_name == "Add":
-                f.write("StartupWMClass=affinity.exe\n")
-            else:
-                f.write(f"StartupWMClass={name.lower()}.exe\n")
+        # Use Linux path format with proper quoting for spaces
+        # Include GPU environment variables if configured
+        exec_line = f'Exec=env WINEPREFIX={directory_str}'
+        if gpu_env:
+            exec_line += f' {gpu_env}'
+        if dxvk_env:
+            exec_line += f' {dxvk_env}'
+        exec_line += f' {wine_str} "{app_path_str}"'
+        
+        if app_name == "Add":
+            name_lines = "Name=Affinity Suite\nComment=A powerful creative suite.\n"
+            wm_class = "affinity.exe"
+        else:
+            name_lines = f"Name=Affinity {name}\nComment=A powerful {name.lower()} software.\n"
+            wm_class = f"{name.lower()}.exe"
+        
+        # Build the whole entry once; it is written here and reused for the desktop shortcut
+        desktop_content = (
+            "[Desktop Entry]\n"
+            f"{name_lines}"
+            f"Icon={icon_path_str}\n"
+            f"Path={directory_str}\n"
+            f"{exec_line}\n"
+            "Terminal=false\n"
+            "Type=Application\n"
+            "Categories=Graphics;\n"
+            "StartupNotify=true\n"
+            f"StartupWMClass={wm_class}\n"
+        )
+        desktop_file.write_text(desktop_content)
+        self._desktop_dirty = True
         
         # Remove Wine's default entry
         wine_entry = desktop_dir / "wine" / "Programs" / f"Affinity {name} 2.desktop"
-        if wine_entry.exists():
-            wine_entry.unlink()
+        wine_entry.unlink(missing_ok=True)
         
         if app_name == "Add":
             wine_entry = desktop_dir / "wine" / "Programs" / "Affinity.desktop"
-            if wine_entry.exists():
-                wine_entry.unlink()
+            wine_entry.unlink(missing_ok=True)
         
         # Remove duplicate wine-protocol-affinity.desktop file
         wine_protocol_entry = desktop_dir / "wine-protocol-affinity.desktop"
-        if wine_protocol_entry.exists():
-            try:
-                wine_protocol_entry.unlink()
-                self.log("Removed duplicate wine-protocol-affinity.desktop", "info")
-            except Exception as e:
-                self.log(f"Warning: Could not remove wine-protocol-affinity.desktop: {e}", "warning")
+        try:
+            wine_protocol_entry.unlink()
+            self.log("Removed duplicate wine-protocol-affinity.desktop", "info")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"Warning: Could not remove wine-protocol-affinity.desktop: {e}", "warning")
         
         # Create desktop shortcut
         desktop_shortcut = Path.home() / "Desktop" / desktop_file.name
-        if desktop_shortcut.parent.exists():
-            try:
-                shutil.copy2(desktop_file, desktop_shortcut)
-                self.log("Desktop shortcut created", "success")
-            except PermissionError:
-                self.log(f"Could not create desktop shortcut (permission denied): {desktop_shortcut}", "warning")
-                self.log("Desktop entry is still available in the applications menu", "info")
-            except Exception as e:
-                self.log(f"Could not create desktop shortcut: {e}", "warning")
+        try:
+            desktop_shortcut.write_text(desktop_content)
+            self.log("Desktop shortcut created", "success")
+        except FileNotFoundError:
+            pass  # No ~/Desktop folder, nothing to do
+        except PermissionError:
+            self.log(f"Could not create desktop shortcut (permission denied): {desktop_shortcut}", "warning")
+            self.log("Desktop entry is still available in the applications menu", "info")
+        except Exception as e:
+            self.log(f"Could not create desktop shortcut: {e}", "warning")
         
         self.log(f"Desktop entry created: {desktop_file}", "success")
     
+    @gui_guarded("Download Failed", "download the Affinity installer")
     def _download_affinity_installer_thread(self, save_path_obj: Path):
         """Worker: Download Affinity installer and end operation."""
         download_url = "https://downloads.affinity.studio/Affinity%20x64.exe"
         self.log(f"Downloading from: {download_url}", "info")
         self.log(f"Saving to: {save_path_obj}", "info")
         try:
-            if self.download_file(download_url, str(save_path_obj), "Affinity installer"):
+            if self.download_file(download_url, str(save_path_obj), "Affinity installer", large=True):
                 self.log(f"\n✓ Download completed successfully!", "success")
                 self.log(f"Installer saved to: {save_path_obj}", "success")
                 self.show_message(
@@ -12114,9 +13013,9 @@ Would you like to continue with {distro_name} anyway?"""
 
     def open_winecfg(self):
         """Open Wine Configuration tool using custom Wine"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Opening Wine Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         wine_cfg = self.get_wine_path("winecfg")
         
@@ -12125,25 +13024,36 @@ Would you like to continue with {distro_name} anyway?"""
             self.show_message("Wine Not Found", "Wine is not set up yet. Please run 'Setup Wine Environment' first.", "error")
             return
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         self.log(f"Opening winecfg using: {wine_cfg}", "info")
         self.log("The Wine Configuration window should open now.", "info")
         
-        # Run winecfg in background (non-blocking)
-        threading.Thread(
-            target=lambda: self.run_command([str(wine_cfg)], check=False, capture=False, env=env),
-            daemon=True
-        ).start()
-        
-        self.log("✓ Wine Configuration opened", "success")
+        # Run winecfg detached from the installer (non-blocking)
+        if self._launch_detached([str(wine_cfg)], env):
+            self.log("✓ Wine Configuration opened", "success")
+    
+    def _launch_detached(self, cmd, env):
+        """Start a GUI tool in its own session with output discarded; no thread or pipes kept"""
+        try:
+            subprocess.Popen(
+                cmd,
+                env=env,
+                stdin=self._devnull_fd,
+                stdout=self._devnull_fd,
+                stderr=self._devnull_fd,
+                start_new_session=True
+            )
+            return True
+        except OSError as e:
+            self.log(f"✗ Failed to start {Path(cmd[0]).name}: {e}", "error")
+            return False
     
     def open_winetricks(self):
         """Open Winetricks GUI using custom Wine"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Opening Winetricks", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         wine_cfg = self.get_wine_path("winecfg")
         
@@ -12153,7 +13063,7 @@ Would you like to continue with {distro_name} anyway?"""
             return
         
         # Check if winetricks is available
-        winetricks_path = shutil.which("winetricks")
+        winetricks_path = self.which_command("winetricks")
         if not winetricks_path:
             self.log("Winetricks is not installed. Please install it using your package manager.", "error")
             self.show_message(
@@ -12167,26 +13077,21 @@ Would you like to continue with {distro_name} anyway?"""
             )
             return
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         self.log(f"Opening winetricks using: {winetricks_path}", "info")
         self.log("The Winetricks GUI should open now.", "info")
         
-        # Run winetricks in background (non-blocking)
+        # Run winetricks detached from the installer (non-blocking)
         # Winetricks will open its GUI when run without arguments
-        threading.Thread(
-            target=lambda: self.run_command([winetricks_path], check=False, capture=False, env=env),
-            daemon=True
-        ).start()
-        
-        self.log("✓ Winetricks opened", "success")
+        if self._launch_detached([winetricks_path], env):
+            self.log("✓ Winetricks opened", "success")
     
     def set_windows11_renderer(self):
         """Set Windows 11 and configure renderer (OpenGL or Vulkan)"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Windows 11 + Renderer Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Start operation for renderer configuration
         self.start_operation("Configure Renderer")
@@ -12572,120 +13477,135 @@ Would you like to continue with {distro_name} anyway?"""
         self.log("Setting up wine-tkg for winetricks (if needed)...", "info")
         self.ensure_wine_tkg()  # Don't fail if this doesn't work, it's just a fallback
         
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         
         # Use wine-tkg for winetricks if available (fallback method)
         env = self.get_winetricks_env_with_tkg(env)
         
-        # Set Windows version to 11
-        self.log("Setting Windows version to 11...", "info")
-        success, _, _ = self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env)
-        if success:
-            self.log("✓ Windows version set to 11", "success")
-        else:
-            self.log("⚠ Warning: Failed to set Windows version", "warning")
-        
-        # Set renderer directly via registry (more reliable than winetricks)
-        self.log(f"Configuring {renderer_name} renderer...", "info")
-        wine = self.get_wine_path("wine")
-        
-        # Set renderer directly via registry - this is more reliable than winetricks
-        self.log(f"Setting {renderer_name} renderer via registry...", "info")
-        reg_add_success, reg_add_stdout, reg_add_stderr = self.run_command(
-            [str(wine), "reg", "add", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer", "/t", "REG_SZ", "/d", renderer_value, "/f"],
-            check=False,
-            env=env,
-            capture=True
-        )
-        
-        if reg_add_success:
-            self.log(f"✓ {renderer_name} renderer set via registry", "success")
-        else:
-            # Fallback to winetricks if direct registry setting fails
-            self.log(f"Registry method failed, trying winetricks...", "info")
-            success, stdout, stderr = self.run_command(
-                ["winetricks", "--unattended", "--force", "--no-isolate", "--optout", f"renderer={renderer_value}"],
-                check=False,
-                env=env
-            )
+        # winecfg, reg add and the verifying reg query all attach to one pinned wineserver
+        # instead of each cold-starting their own
+        with self._wineserver_pinned(env, wineserver=str(self.get_wine_path("wineserver"))):
+            # Set Windows version to 11
+            self.log("Setting Windows version to 11...", "info")
+            success, _, _ = self.run_command([str(wine_cfg), "-v", "win11"], check=False, env=env, capture=False)
             if success:
-                self.log(f"✓ {renderer_name} renderer set via winetricks", "success")
+                self.log("✓ Windows version set to 11", "success")
             else:
-                self.log(f"⚠ Warning: Failed to set {renderer_name} renderer via both methods", "warning")
-        
-        # Verify renderer was actually set in registry
-        self.log(f"Verifying {renderer_name} renderer configuration...", "info")
-        renderer_verified = False
-        
-        try:
-            # Check registry for renderer setting
-            renderer_check_success, renderer_check_stdout, _ = self.run_command(
-                [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
+                self.log("⚠ Warning: Failed to set Windows version", "warning")
+            
+            # Set renderer directly via registry (more reliable than winetricks)
+            self.log(f"Configuring {renderer_name} renderer...", "info")
+            wine = self.get_wine_path("wine")
+            
+            # Set renderer directly via registry - this is more reliable than winetricks
+            self.log(f"Setting {renderer_name} renderer via registry...", "info")
+            reg_add_success, reg_add_stdout, reg_add_stderr = self.run_command(
+                [str(wine), "reg", "add", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer", "/t", "REG_SZ", "/d", renderer_value, "/f"],
                 check=False,
                 env=env,
                 capture=True
             )
             
-            if renderer_check_success and renderer_check_stdout:
-                renderer_check_lower = renderer_check_stdout.lower()
-                # Check for the renderer value we set
-                if renderer_value == "vulkan" and "vulkan" in renderer_check_lower:
-                    renderer_verified = True
-                elif renderer_value == "opengl" and "opengl" in renderer_check_lower:
-                    renderer_verified = True
-                elif renderer_value == "gdi" and "gdi" in renderer_check_lower:
-                    renderer_verified = True
-                
-                if renderer_verified:
-                    self.log(f"✓ {renderer_name} renderer verified in registry", "success")
+            if reg_add_success:
+                self.log(f"✓ {renderer_name} renderer set via registry", "success")
+            else:
+                # Fallback to winetricks if direct registry setting fails
+                self.log(f"Registry method failed, trying winetricks...", "info")
+                success, stdout, stderr = self.run_command(
+                    ["winetricks", "--unattended", "--force", "--no-isolate", "--optout", f"renderer={renderer_value}"],
+                    check=False,
+                    env=env
+                )
+                if success:
+                    self.log(f"✓ {renderer_name} renderer set via winetricks", "success")
                 else:
-                    # Show what was actually found
-                    actual_renderer = None
-                    if "renderer" in renderer_check_lower:
-                        # Extract the actual value
-                        match = re.search(r'renderer\s+REG_SZ\s+(\w+)', renderer_check_stdout, re.IGNORECASE)
-                        if match:
-                            actual_renderer = match.group(1)
-                            self.log(f"⚠ Warning: Expected {renderer_name} but found {actual_renderer} in registry", "warning")
-                        else:
-                            self.log(f"⚠ Warning: {renderer_name} renderer may not be set correctly", "warning")
+                    self.log(f"⚠ Warning: Failed to set {renderer_name} renderer via both methods", "warning")
+            
+            # Verify renderer was actually set in registry
+            self.log(f"Verifying {renderer_name} renderer configuration...", "info")
+            renderer_verified = False
+            
+            try:
+                # Check registry for renderer setting
+                renderer_check_success, renderer_check_stdout, _ = self.run_command(
+                    [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
+                    check=False,
+                    env=env,
+                    capture=True
+                )
+            
+                if renderer_check_success and renderer_check_stdout:
+                    renderer_check_lower = renderer_check_stdout.lower()
+                    # Check for the renderer value we set
+                    if renderer_value == "vulkan" and "vulkan" in renderer_check_lower:
+                        renderer_verified = True
+                    elif renderer_value == "opengl" and "opengl" in renderer_check_lower:
+                        renderer_verified = True
+                    elif renderer_value == "gdi" and "gdi" in renderer_check_lower:
+                        renderer_verified = True
+            
+                    if renderer_verified:
+                        self.log(f"✓ {renderer_name} renderer verified in registry", "success")
                     else:
-                        self.log(f"⚠ Warning: Could not verify {renderer_name} renderer in registry", "warning")
-                    
-                    # Retry setting the renderer if verification failed
-                    if not actual_renderer or actual_renderer.lower() != renderer_value.lower():
-                        self.log(f"Retrying to set {renderer_name} renderer via registry...", "info")
-                        retry_success, _, retry_stderr = self.run_command(
-                            [str(wine), "reg", "add", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer", "/t", "REG_SZ", "/d", renderer_value, "/f"],
-                            check=False,
-                            env=env,
-                            capture=True
-                        )
-                        
-                        if retry_success:
-                            # Verify again after retry
-                            verify_success, verify_stdout, _ = self.run_command(
-                                [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
+                        # Show what was actually found
+                        actual_renderer = None
+                        if "renderer" in renderer_check_lower:
+                            # Extract the actual value
+                            match = re.search(r'renderer\s+REG_SZ\s+(\w+)', renderer_check_stdout, re.IGNORECASE)
+                            if match:
+                                actual_renderer = match.group(1)
+                                self.log(f"⚠ Warning: Expected {renderer_name} but found {actual_renderer} in registry", "warning")
+                            else:
+                                self.log(f"⚠ Warning: {renderer_name} renderer may not be set correctly", "warning")
+                        else:
+                            self.log(f"⚠ Warning: Could not verify {renderer_name} renderer in registry", "warning")
+            
+                        # Retry setting the renderer if verification failed
+                        if not actual_renderer or actual_renderer.lower() != renderer_value.lower():
+                            self.log(f"Retrying to set {renderer_name} renderer via registry...", "info")
+                            retry_success, _, retry_stderr = self.run_command(
+                                [str(wine), "reg", "add", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer", "/t", "REG_SZ", "/d", renderer_value, "/f"],
                                 check=False,
                                 env=env,
                                 capture=True
                             )
-                            
-                            if verify_success and renderer_value.lower() in (verify_stdout or "").lower():
-                                self.log(f"✓ {renderer_name} renderer set successfully via registry", "success")
+            
+                            if retry_success:
+                                # Verify again after retry
+                                verify_success, verify_stdout, _ = self.run_command(
+                                    [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Software\\Wine\\Direct3D", "/v", "renderer"],
+                                    check=False,
+                                    env=env,
+                                    capture=True
+                                )
+            
+                                if verify_success and renderer_value.lower() in (verify_stdout or "").lower():
+                                    self.log(f"✓ {renderer_name} renderer set successfully via registry", "success")
+                                else:
+                                    self.log(f"⚠ Warning: Failed to verify {renderer_name} renderer after retry", "warning")
                             else:
-                                self.log(f"⚠ Warning: Failed to verify {renderer_name} renderer after retry", "warning")
-                        else:
-                            self.log(f"⚠ Warning: Failed to set {renderer_name} renderer via registry: {retry_stderr[:100] if retry_stderr else 'Unknown error'}", "warning")
-            else:
-                self.log(f"⚠ Warning: Could not read renderer from registry", "warning")
-        except Exception as e:
-            self.log(f"⚠ Warning: Error verifying renderer: {e}", "warning")
+                                self.log(f"⚠ Warning: Failed to set {renderer_name} renderer via registry: {retry_stderr[:100] if retry_stderr else 'Unknown error'}", "warning")
+                else:
+                    self.log(f"⚠ Warning: Could not read renderer from registry", "warning")
+            except Exception as e:
+                self.log(f"⚠ Warning: Error verifying renderer: {e}", "warning")
         
         self.log("\n✓ Windows 11 and renderer configuration completed", "success")
         self.end_operation()
     
+    def log_dotnet_install_hint(self, version="8.0"):
+        """Log the manual .NET SDK install command for this distro and return it as text"""
+        command, caveat = DOTNET_INSTALL_HINTS.get(self.distro, (None, None))
+        if command is None:
+            self.log(f"  Please install .NET SDK {version} from: https://dotnet.microsoft.com/download", "info")
+            return "Install from: https://dotnet.microsoft.com/download"
+        command += version
+        self.log(f"  {command}", "info")
+        if caveat:
+            self.log(f"  ({caveat})", "warning")
+            return f"{command}\n({caveat})"
+        return command
+    
     def install_dotnet_sdk(self, version="8.0"):
         """Install .NET SDK based on distribution"""
         try:
@@ -12736,9 +13656,9 @@ Would you like to continue with {distro_name} anyway?"""
     
     def apply_return_colors(self):
         """Apply ReturnColors patch to restore colored icons in Affinity v3"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Return Colors (Affinity v3)", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Check if Wine is set up
         wine_binary = self.get_wine_path("wine")
@@ -12753,7 +13673,7 @@ Would you like to continue with {distro_name} anyway?"""
             return
         
         # Check if Affinity v3 is installed
-        affinity_dir = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / "Affinity"
+        affinity_dir = self._drive_c / "Program Files" / "Affinity" / "Affinity"
         dll_path = affinity_dir / "Serif.Affinity.dll"
         
         if not dll_path.exists():
@@ -12822,26 +13742,7 @@ Would you like to continue with {distro_name} anyway?"""
                 self.log("ReturnColors requires .NET SDK 10.0 or newer to build.", "info")
                 self.log("Please install .NET SDK 10.0 manually:", "info")
                 
-                install_instructions = ""
-                if self.distro in ["arch", "cachyos"]:
-                    self.log("  sudo pacman -S dotnet-sdk-10.0", "info")
-                    install_instructions = "sudo pacman -S dotnet-sdk-10.0"
-                elif self.distro in ["endeavouros", "xerolinux"]:
-                    self.log("  sudo pacman -S dotnet-sdk-10.0", "info")
-                    install_instructions = "sudo pacman -S dotnet-sdk-10.0"
-                elif self.distro in ["fedora", "nobara"]:
-                    self.log("  sudo dnf install dotnet-sdk-10.0", "info")
-                    install_instructions = "sudo dnf install dotnet-sdk-10.0"
-                elif self.distro in ["pikaos", "pop", "debian", "ubuntu", "linuxmint", "zorin"]:
-                    self.log("  sudo apt install dotnet-sdk-10.0", "info")
-                    self.log("  (May require Microsoft's .NET repository)", "warning")
-                    install_instructions = "sudo apt install dotnet-sdk-10.0\n(May require Microsoft's .NET repository)"
-                elif self.distro in ["opensuse-tumbleweed", "opensuse-leap"]:
-                    self.log("  sudo zypper install dotnet-sdk-10.0", "info")
-                    install_instructions = "sudo zypper install dotnet-sdk-10.0"
-                else:
-                    self.log("  Please install .NET SDK 10.0 from: https://dotnet.microsoft.com/download", "info")
-                    install_instructions = "Install from: https://dotnet.microsoft.com/download"
+                install_instructions = self.log_dotnet_install_hint("10.0")
                 
                 # Ensure distro is detected before trying alternative method
                 if not self.distro:
@@ -12904,15 +13805,16 @@ Would you like to continue with {distro_name} anyway?"""
     def fix_affinity_settings(self):
         """Fix Affinity v3 settings by patching the DLL"""
         try:
-            self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            self.log(LOG_RULE_OPEN)
             self.log("Fix Affinity v3 Settings", "info")
-            self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+            self.log(LOG_RULE_CLOSE)
             
-            # Ensure patcher files are available
-            self.ensure_patcher_files()
+            # Ensure patcher files are available and probe for the .NET SDK in the background
+            patcher_files_future = self._pool.submit(self.ensure_patcher_files)
+            dotnet_future = self._pool.submit(self.check_dotnet_sdk)
             
             # Check if Affinity v3 is installed
-            dll_path = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / "Affinity" / "Serif.Affinity.dll"
+            dll_path = self._drive_c / "Program Files" / "Affinity" / "Affinity" / "Serif.Affinity.dll"
             
             if not dll_path.exists():
                 self.log("Affinity v3 (Unified) is not installed.", "error")
@@ -12928,24 +13830,16 @@ Would you like to continue with {distro_name} anyway?"""
             
             self.start_operation("Fix Affinity Settings")
             
+            patcher_files_future.result()
+            
             # Check if .NET SDK is installed, if not try to install it
-            if not self.check_dotnet_sdk():
+            if not dotnet_future.result():
                 self.log(".NET SDK not found. Attempting to install...", "info")
                 try:
                     if not self.install_dotnet_sdk():
                         self.log("Failed to install .NET SDK automatically", "error")
                         self.log("Please install .NET SDK manually:", "info")
-                        if self.distro in ["arch", "cachyos"]:
-                            self.log("  sudo pacman -S dotnet-sdk-8.0", "info")
-                        elif self.distro in ["endeavouros", "xerolinux"]:
-                            self.log("  sudo pacman -S dotnet-sdk-8.0", "info")
-                        elif self.distro in ["fedora", "nobara"]:
-                            self.log("  sudo dnf install dotnet-sdk-8.0", "info")
-                        elif self.distro in ["pikaos", "pop", "debian"]:
-                            self.log("  sudo apt install dotnet-sdk-8.0", "info")
-                            self.log("  (May require Microsoft's .NET repository)", "warning")
-                        elif self.distro in ["opensuse-tumbleweed", "opensuse-leap"]:
-                            self.log("  sudo zypper install dotnet-sdk-8.0", "info")
+                        self.log_dotnet_install_hint()
                         self.end_operation()
                         self.show_message(
                             ".NET SDK Required",
@@ -13001,9 +13895,9 @@ Would you like to continue with {distro_name} anyway?"""
     
     def set_dpi_scaling(self):
         """Set DPI scaling for Affinity applications"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("DPI Scaling Configuration", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         wine = self.get_wine_path("wine")
         
@@ -13013,34 +13907,40 @@ Would you like to continue with {distro_name} anyway?"""
             return
         
         # Try to get current DPI value from registry
-        env = os.environ.copy()
-        env["WINEPREFIX"] = self.directory
+        env = self._wine_env()
         current_dpi = 96  # Default value
         
-        # Try to read current DPI from registry
-        try:
-            success, stdout, _ = self.run_command(
-                [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Control Panel\\Desktop", "/v", "LogPixels"],
-                check=False,
-                env=env,
-                capture=True
-            )
-            if success and stdout:
-                # Parse the output to extract DPI value
-                # Output format: "LogPixels    REG_DWORD    0x000000c0 (192)"
-                match = re.search(r'0x[0-9a-fA-F]+|(\d+)', stdout)
-                if match:
-                    # Try to find hex value first
-                    hex_match = re.search(r'0x([0-9a-fA-F]+)', stdout)
+        # Reuse the value from earlier in this session, or read user.reg directly,
+        # before falling back to starting Wine for `reg query`
+        if self._cached_dpi is None:
+            self._cached_dpi = self._read_reg_dword("Control Panel\\Desktop", "LogPixels")
+        
+        if self._cached_dpi is not None:
+            current_dpi = self._cached_dpi
+        else:
+            # Try to read current DPI from registry
+            try:
+                success, stdout, _ = self.run_command(
+                    [str(wine), "reg", "query", "HKEY_CURRENT_USER\\Control Panel\\Desktop", "/v", "LogPixels"],
+                    check=False,
+                    env=env,
+                    capture=True
+                )
+                if success and stdout:
+                    # Parse the output to extract DPI value
+                    # Output format: "LogPixels    REG_DWORD    0x000000c0 (192)"
+                    # Try to find hex value first, then decimal
+                    hex_match = HEX_DWORD_RE.search(stdout)
                     if hex_match:
                         current_dpi = int(hex_match.group(1), 16)
+                        self._cached_dpi = current_dpi
                     else:
-                        # Try decimal
-                        dec_match = re.search(r'\((\d+)\)', stdout)
+                        dec_match = DEC_DWORD_RE.search(stdout)
                         if dec_match:
                             current_dpi = int(dec_match.group(1))
-        except:
-            pass  # Use default if reading fails
+                            self._cached_dpi = current_dpi
+            except:
+                pass  # Use default if reading fails
         
         # Create dialog (without parent to avoid threading issues)
         dialog = QDialog()
@@ -13197,6 +14097,7 @@ Would you like to continue with {distro_name} anyway?"""
         )
         
         if success:
+            self._cached_dpi = selected_dpi
             self.log(f"✓ DPI scaling set to {selected_dpi} ({percentage}%)", "success")
             self.log("Note: You may need to restart Affinity applications for the change to take effect.", "info")
             self.show_message(
@@ -13215,9 +14116,9 @@ Would you like to continue with {distro_name} anyway?"""
     
     def uninstall_affinity_linux(self):
         """Uninstall Affinity Linux by deleting the .AffinityLinux folder"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Uninstall Affinity Linux", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Show warning dialog with Yes/No buttons
         reply = QMessageBox.warning(
@@ -13244,9 +14145,10 @@ Would you like to continue with {distro_name} anyway?"""
         # Stop Wine processes first
         self.log("Stopping Wine processes...", "info")
         try:
-            self.run_command(["wineserver", "-k"], check=False)
-            time.sleep(2)
-            self.log("Wine processes stopped", "success")
+            if self._stop_wineserver():
+                self.log("Wine processes stopped", "success")
+            else:
+                self.log("Wineserver is still shutting down, continuing anyway", "warning")
         except Exception as e:
             self.log(f"Warning: Could not stop all Wine processes: {e}", "warning")
         
@@ -13262,13 +14164,15 @@ Would you like to continue with {distro_name} anyway?"""
         
         removed_count = 0
         for desktop_file in desktop_files:
-            if desktop_file.exists():
-                try:
-                    desktop_file.unlink()
-                    self.log(f"Removed desktop entry: {desktop_file.name}", "info")
-                    removed_count += 1
-                except Exception as e:
-                    self.log(f"Warning: Could not remove {desktop_file.name}: {e}", "warning")
+            # unlink() directly: a missing entry is just ENOENT, no separate exists() stat
+            try:
+                os.unlink(desktop_file)
+                self.log(f"Removed desktop entry: {desktop_file.name}", "info")
+                removed_count += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.log(f"Warning: Could not remove {desktop_file.name}: {e}", "warning")
         
         # Also remove Wine's default entries if they exist
         wine_desktop_dir = desktop_dir / "wine" / "Programs"
@@ -13283,31 +14187,26 @@ Would you like to continue with {distro_name} anyway?"""
         ]
         
         for wine_entry in wine_entries:
-            if wine_entry.exists():
-                try:
-                    wine_entry.unlink()
-                    self.log(f"Removed Wine desktop entry: {wine_entry.name}", "info")
-                    removed_count += 1
-                except Exception as e:
-                    self.log(f"Warning: Could not remove {wine_entry.name}: {e}", "warning")
+            try:
+                os.unlink(wine_entry)
+                self.log(f"Removed Wine desktop entry: {wine_entry.name}", "info")
+                removed_count += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.log(f"Warning: Could not remove {wine_entry.name}: {e}", "warning")
         
         if removed_count > 0:
             self.log(f"Removed {removed_count} desktop entry/entries", "success")
         
         # Delete the .AffinityLinux folder
         affinity_dir = Path(self.directory)
-        if not affinity_dir.exists():
-            self.log("Affinity Linux directory not found. Nothing to uninstall.", "warning")
-            self.show_message(
-                "Nothing to Uninstall",
-                "The .AffinityLinux folder does not exist.\n\nNothing to uninstall.",
-                "info"
-            )
-            return
-        
-        self.log(f"Deleting directory: {affinity_dir}", "info")
         try:
-            shutil.rmtree(affinity_dir)
+            # No separate exists() probe: a missing folder surfaces as FileNotFoundError below
+            self._parallel_rmtree(affinity_dir)
+            self.log(f"Deleted directory: {affinity_dir}", "info")
+            self._webview2_cache = None
+            self._wine_verified = False
             self.log("✓ .AffinityLinux folder deleted successfully", "success")
             self.log("\n✓ Uninstall completed!", "success")
             self.log("All Affinity Linux files have been removed.", "info")
@@ -13323,6 +14222,23 @@ Would you like to continue with {distro_name} anyway?"""
             # Refresh installation status
             QTimer.singleShot(100, self.check_installation_status)
             
+        except FileNotFoundError as e:
+            if os.path.lexists(affinity_dir):
+                # Something inside vanished mid-delete; report it like any other failure
+                self.log(f"✗ Failed to delete directory: {e}", "error")
+                self.show_message(
+                    "Uninstall Failed",
+                    f"Failed to delete the .AffinityLinux folder:\n\n{str(e)}\n\n"
+                    "You may need to manually delete it.",
+                    "error"
+                )
+                return
+            self.log("Affinity Linux directory not found. Nothing to uninstall.", "warning")
+            self.show_message(
+                "Nothing to Uninstall",
+                "The .AffinityLinux folder does not exist.\n\nNothing to uninstall.",
+                "info"
+            )
         except PermissionError:
             self.log("✗ Permission denied. Some files may be in use.", "error")
             self.log("Please close all Affinity applications and try again.", "error")
@@ -13343,52 +14259,65 @@ Would you like to continue with {distro_name} anyway?"""
     
     def launch_affinity_v3(self):
         """Launch Affinity v3 with optimized environment variables"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Launch Affinity v3", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
+        # Checks, registry cleanup and the launch itself run off the GUI thread
+        threading.Thread(target=self._launch_affinity_v3_thread, daemon=True).start()
+    
+    @gui_guarded("Launch Failed", "launch Affinity v3")
+    def _launch_affinity_v3_thread(self):
+        """Worker: verify Affinity v3 and Wine are installed, then launch it"""
         # Check if Affinity is installed
-        affinity_exe = Path(self.directory) / "drive_c" / "Program Files" / "Affinity" / "Affinity" / "Affinity.exe"
-        if not affinity_exe.exists():
+        affinity_exe = self._affinity_v3_exe_str
+        if not os.path.lexists(affinity_exe):
             self.log("✗ Affinity v3 is not installed", "error")
             self.log("Please install Affinity v3 first using 'Update Affinity Applications' → 'Affinity (Unified)'", "info")
             self.show_message(
                 "Affinity Not Found",
                 "Affinity v3 is not installed.\n\nPlease install it first using:\n'Update Affinity Applications' → 'Affinity (Unified)'",
-                QMessageBox.Icon.Warning
+                "warning"
             )
             return
         
-        # Check if Wine is set up
-        wine_bin = self.get_wine_path("wine")
-        if not wine_bin.exists():
-            self.log("✗ Wine is not set up", "error")
-            self.log("Please run 'Setup Wine Environment' first", "info")
-            self.show_message(
-                "Wine Not Found",
-                "Wine is not set up.\n\nPlease run 'Setup Wine Environment' first.",
-                QMessageBox.Icon.Warning
-            )
-            return
+        # Check if Wine is set up and runnable (one access() call on the happy path; the bin
+        # directory exists if the binary does). Skipped after a successful check; a binary that
+        # disappears later surfaces from the spawn instead.
+        wine_bin = self._wine_str
+        if not self._wine_verified:
+            if not os.access(wine_bin, os.X_OK):
+                if os.path.lexists(wine_bin):
+                    self.log(f"✗ Wine binary is not executable: {wine_bin}", "error")
+                    self.log(f"Fix the permissions with: chmod +x {wine_bin}", "info")
+                    self.show_message(
+                        "Wine Not Executable",
+                        f"The Wine binary is not executable:\n{wine_bin}\n\n"
+                        f"Fix it with:\nchmod +x {wine_bin}\n\nor run 'Setup Wine Environment' again.",
+                        "error"
+                    )
+                    return
+                self.log("✗ Wine is not set up", "error")
+                self.log("Please run 'Setup Wine Environment' first", "info")
+                self.show_message(
+                    "Wine Not Found",
+                    "Wine is not set up.\n\nPlease run 'Setup Wine Environment' first.",
+                    "warning"
+                )
+                return
+            self._wine_verified = True
         
         self.log("Setting up environment variables...", "info")
         
-        # Prepare environment variables
-        env = os.environ.copy()
-        
-        # Set PATH to include Wine binaries (only for custom Wine builds)
-        wine_dir = self.get_wine_dir()
-        if wine_dir:
-            wine_dir_str = str(wine_dir)
-            current_path = env.get("PATH", "")
-            env["PATH"] = f"{wine_dir_str}/bin:{current_path}"
-        # For system Wine, it's already in PATH
-        
-        # Set Wine-related environment variables
-        env["WINE"] = str(wine_bin)
-        env["WINEPREFIX"] = self.directory
-        env["WINEDEBUG"] = "-all,fixme-all"
-        env["WINEDLLOVERRIDES"] = "opencl="
+        # Prepare a bytes environment (WINEPREFIX is already set), with the
+        # custom Wine build's bin directory first in PATH
+        wine_bin_b = os.fsencode(wine_bin)
+        env = {
+            **self._wine_environb_base,
+            **AFFINITY_LAUNCH_ENVB,
+            b"WINE": wine_bin_b,
+            b"PATH": os.path.dirname(wine_bin_b) + b":" + os.environb.get(b"PATH", b""),
+        }
         
         # Add GPU selection environment variables if configured
         gpu_env = self.get_gpu_env_vars()
@@ -13397,30 +14326,18 @@ Would you like to continue with {distro_name} anyway?"""
             for env_var in gpu_env.strip().split():
                 if "=" in env_var:
                     key, value = env_var.split("=", 1)
-                    env[key] = value
+                    env[os.fsencode(key)] = os.fsencode(value)
         
         # Check renderer setting - only set DXVK/VKD3D if Vulkan is selected
         renderer = self.get_renderer_setting()
         
         if renderer == "vulkan":
-            # DXVK settings (only for Vulkan renderer)
-            env["DXVK_ASYNC"] = "0"
-            env["DXVK_CONFIG"] = "d3d9.deferSurfaceCreation = True; d3d9.shaderModel = 1"
-            env["DXVK_FRAME_RATE"] = "60"
-            env["DXVK_LOG_LEVEL"] = "none"
-            
-            # VKD3D settings (only for Vulkan renderer)
-            env["VKD3D_DEBUG"] = "none"
-            env["VKD3D_DISABLE_EXTENSIONS"] = "VK_KHR_present_id"
-            env["VKD3D_FEATURE_LEVEL"] = "12_1"
-            env["VKD3D_FRAME_RATE"] = "60"
-            env["VKD3D_SHADER_DEBUG"] = "none"
-            env["VKD3D_SHADER_MODEL"] = "6_5"
+            # DXVK and VKD3D settings (only for Vulkan renderer)
+            env.update(AFFINITY_VULKAN_ENVB)
         else:
             # For OpenGL or GDI, disable DXVK/VKD3D to prevent Vulkan initialization errors
             # Also disable DLL overrides that might force Vulkan
-            env["DXVK_STATE_CACHE"] = "0"
-            env["DXVK_HUD"] = "0"
+            env.update(AFFINITY_NON_VULKAN_ENVB)
             # Don't set VKD3D variables for OpenGL/GDI
             self.log(f"Renderer is set to {renderer.upper()}, DXVK/VKD3D disabled", "info")
             
@@ -13429,12 +14346,10 @@ Would you like to continue with {distro_name} anyway?"""
             if not self.is_opencl_enabled():
                 self.log("Removing d3d12 DLL overrides to prevent Vulkan initialization", "info")
                 try:
-                    wine = self.get_wine_path("wine")
-                    reg_env = os.environ.copy()
-                    reg_env["WINEPREFIX"] = self.directory
+                    reg_env = self._wine_env()
                     # Remove d3d12 and d3d12core overrides
-                    self.run_command([str(wine), "reg", "delete", "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides", "/v", "d3d12", "/f"], check=False, env=reg_env, capture=True)
-                    self.run_command([str(wine), "reg", "delete", "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides", "/v", "d3d12core", "/f"], check=False, env=reg_env, capture=True)
+                    self.run_command([wine_bin, "reg", "delete", "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides", "/v", "d3d12", "/f"], check=False, env=reg_env, capture=True)
+                    self.run_command([wine_bin, "reg", "delete", "HKEY_CURRENT_USER\\Software\\Wine\\DllOverrides", "/v", "d3d12core", "/f"], check=False, env=reg_env, capture=True)
                 except Exception as e:
                     self.log(f"Warning: Could not remove d3d12 DLL overrides: {e}", "warning")
         
@@ -13447,38 +14362,40 @@ Would you like to continue with {distro_name} anyway?"""
         self.log("\nLaunching Affinity v3...", "info")
         
         # Use wine start to launch the application
-        wine_start_cmd = [
-            str(wine_bin),
-            "start",
-            "C:/Program Files/Affinity/Affinity/Affinity.exe"
-        ]
+        # Bytes argv: together with the bytes environment nothing is re-encoded at spawn time
+        wine_start_cmd = [wine_bin_b, *AFFINITY_V3_START_ARGS_B]
         
         try:
-            # Launch in background (non-blocking)
-            process = subprocess.Popen(
+            # Launch in its own session with posix_spawn (vfork-style, no copy of the
+            # Qt process's page tables); stdio goes to the shared /dev/null fd
+            pid = os.posix_spawn(
+                wine_bin_b,
                 wine_start_cmd,
-                env=env,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True
+                env,
+                file_actions=[(os.POSIX_SPAWN_DUP2, self._devnull_fd, fd) for fd in (0, 1, 2)],
+                setsid=True
             )
+            # wine start returns once the application is up; reap it so it doesn't linger as a zombie
+            os.waitpid(pid, 0)
             
             self.log("✓ Affinity v3 launched successfully", "success")
             self.log("The application should open in a moment...", "info")
             
-        except Exception as e:
-            self.log(f"✗ Failed to launch Affinity v3: {e}", "error")
+        except FileNotFoundError:
+            self._wine_verified = False
+            self.log("✗ Wine is not set up", "error")
+            self.log("Please run 'Setup Wine Environment' first", "info")
             self.show_message(
-                "Launch Failed",
-                f"Failed to launch Affinity v3:\n\n{str(e)}",
-                QMessageBox.Icon.Critical
+                "Wine Not Found",
+                "Wine is not set up.\n\nPlease run 'Setup Wine Environment' first.",
+                "warning"
             )
     
     def download_affinity_installer(self):
         """Download the Affinity installer by itself"""
-        self.log("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.log(LOG_RULE_OPEN)
         self.log("Download Affinity Installer", "info")
-        self.log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        self.log(LOG_RULE_CLOSE)
         
         # Ask user where to save the file
         downloads_dir = Path.home() / "Downloads"
@@ -13529,14 +14446,10 @@ def main():
     import time as time_module
     total_start_time = time_module.time()
     
-    if platform.system() != "Linux":
-        app = QApplication(sys.argv)
-        QMessageBox.critical(
-            None,
-            "Unsupported Platform",
-            "This installer is designed for Linux systems only."
-        )
-        return
+    if not IS_LINUX:
+        # Plain stderr message: no need to bring up Qt just to refuse to run
+        print("This installer is designed for Linux systems only.", file=sys.stderr)
+        sys.exit(1)
     
     app_init_start = time_module.time()
     app = QApplication(sys.argv)